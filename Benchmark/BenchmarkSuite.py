@@ -0,0 +1,417 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Model.MatrixHotel import MatrixHotel
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+# Hotel storage backends that can be benchmarked.
+BACKENDS: Dict[str, Type[Hotel]] = {
+    "room": Hotel,
+    "matrix": MatrixHotel
+}
+
+# Rooms per room type: 25 rooms in total (the GUI default) up to 50k rooms.
+FULL_SIZES = [5, 200, 2000, 10000]
+QUICK_SIZES = [5, 200]
+
+# Request rates per step: "default" is the GUI default; "busy" scales with the size of the hotel.
+RATES = ["default", "busy"]
+
+# Simulation length and step size of every benchmarked experiment (the GUI defaults).
+DAYS, HOUR_PER_STEP = 20, 3
+
+
+def request_range(rate: str, rooms_per_type: int) -> Tuple[int, int]:
+    """
+    Returns the (min, max) number of requests per step of a request rate.
+
+    :param rate: "default" for 3-5 requests per step, or "busy" for about one request per 100 rooms.
+    :param rooms_per_type: The number of rooms of each room type.
+    :return: A tuple (min_requests, max_requests).
+    """
+    if rate == "default":
+        return 3, 5
+    total_rooms = rooms_per_type * 5
+    return max(3, total_rooms // 200), max(5, total_rooms // 100)
+
+
+class BenchmarkSuite:
+    """
+    Times the hot paths of the Model and Controller across hotel sizes and request rates.
+    Each benchmark reports the best time per operation over several repeats. The results can be written
+    to a JSON file and compared with a stored baseline to catch slowdowns.
+    """
+
+    # Minimum duration of one repeat of a measurement without setup, in seconds.
+    MIN_REPEAT_SECONDS = 0.05
+
+    def __init__(self, sizes: List[int], hotel_class: Type[Hotel] = Hotel, repeats: int = 5, seed: int = 0) -> None:
+        """
+        Initializes the suite.
+
+        :param sizes: Numbers of rooms per room type to benchmark.
+        :param hotel_class: The Hotel implementation to benchmark.
+        :param repeats: How often each measurement is repeated; the fastest repeat is reported.
+        :param seed: Seed of the experiments and of the sampled arguments.
+        """
+        self.sizes = sizes
+        self.hotel_class = hotel_class
+        self.repeats = repeats
+        self.seed = seed
+        self.results: List[Dict[str, Any]] = []
+        # Arguments of 'measure' for each result key, so that single measurements can be repeated.
+        self.measurements: Dict[str, Tuple[Any, ...]] = {}
+        # Best time of the calibration workload seen so far (see 'calibrate').
+        self.calibration_seconds = float("inf")
+
+    def new_controller(self, rooms_per_type: int, rate: str) -> ExperimentController:
+        """
+        Creates an initialized experiment in large-scale dimensions.
+
+        :param rooms_per_type: The number of rooms of each room type.
+        :param rate: The request rate (see 'request_range').
+        :return: An ExperimentController at the start of the experiment.
+        """
+        controller = ExperimentController()
+        rooms_info = {room_type: rooms_per_type for room_type in list(RoomType)[:5]}
+        controller.initialize_experiment(DAYS, HOUR_PER_STEP, rooms_info, request_range(rate, rooms_per_type),
+                                         hotel_class=self.hotel_class, seed=self.seed)
+        return controller
+
+    def half_booked_controller(self, rooms_per_type: int, rate: str) -> ExperimentController:
+        """
+        Creates an experiment that has been stepped through half of its days, so that the hotel is partly booked.
+
+        :param rooms_per_type: The number of rooms of each room type.
+        :param rate: The request rate (see 'request_range').
+        :return: An ExperimentController in the middle of the experiment.
+        """
+        controller = self.new_controller(rooms_per_type, rate)
+        while controller.current_day < DAYS // 2 and controller.step():
+            pass
+        return controller
+
+    def measure(self, name: str, params: Dict[str, Any], run: Callable[[], int],
+                setup: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Times a benchmark and records its best time per operation.
+
+        :param name: The name of the benchmarked operation.
+        :param params: The parameters of this measurement (e.g. hotel size and request rate).
+        :param run: Runs the operation and returns how many operations it performed.
+                    If 'setup' is given, it is called with setup's return value instead.
+        :param setup: Prepares a fresh state before each repeat; its time is not measured.
+        """
+        self.calibrate()
+        best, ops = float("inf"), 0
+        # Short operations without setup are run several times per repeat, so that every repeat
+        # takes at least MIN_REPEAT_SECONDS and timer resolution and scheduling noise average out.
+        loops = 1
+        if setup is None:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            loops = max(1, int(BenchmarkSuite.MIN_REPEAT_SECONDS / max(elapsed, 1e-9)))
+        for _ in range(self.repeats):
+            if setup is None:
+                start = time.perf_counter()
+                ops = sum(run() for _ in range(loops))
+            else:
+                state = setup()
+                start = time.perf_counter()
+                ops = run(state)
+            best = min(best, time.perf_counter() - start)
+        result = {
+            "name": name,
+            "params": params,
+            "ops": ops,
+            "seconds": best,
+            "seconds_per_op": best / max(ops, 1)
+        }
+        key = result_key(result)
+        previous = next((i for i, other in enumerate(self.results) if result_key(other) == key), None)
+        if previous is None:
+            self.results.append(result)
+        elif result["seconds_per_op"] < self.results[previous]["seconds_per_op"]:
+            # A repeated measurement replaces the earlier one only if it is faster.
+            self.results[previous] = result
+        self.measurements[key] = (name, params, run, setup)
+
+    def remeasure(self, key: str) -> Dict[str, Any]:
+        """
+        Repeats one measurement and keeps the faster of the two results.
+
+        :param key: The result key of the measurement (see 'result_key').
+        :return: The kept result.
+        """
+        self.measure(*self.measurements[key])
+        return next(result for result in self.results if result_key(result) == key)
+
+    def calibrate(self) -> None:
+        """
+        Times a fixed pure-Python workload and keeps the best time in 'calibration_seconds'.
+        It is timed once before every measurement, so the best time reflects the machine at its least busy,
+        like the best repeat of each measurement does. Comparisons with a baseline divide every time by it,
+        so that a machine (or CPU frequency) that is faster or slower overall does not show up as a change.
+        """
+        start = time.perf_counter()
+        table: Dict[int, int] = {}
+        for i in range(100_000):
+            table[i & 1023] = table.get(i & 1023, 0) + (i >> 3)
+        self.calibration_seconds = min(self.calibration_seconds, time.perf_counter() - start)
+
+    def sample_ranges(self, count: int) -> List[Tuple[RoomType, int, int]]:
+        """
+        Samples random (room type, check-in date, check-out date) arguments within the experiment.
+
+        :param count: The number of arguments to sample.
+        :return: A list of argument tuples.
+        """
+        rng = random.Random(self.seed)
+        ranges = []
+        for _ in range(count):
+            check_in_date = rng.randrange(DAYS)
+            ranges.append((rng.choice(list(RoomType)[:5]), check_in_date, min(DAYS, check_in_date + rng.randint(1, 5))))
+        return ranges
+
+    def bench_is_available(self, rooms_per_type: int) -> None:
+        """
+        Times Room.is_available on the rooms of a half-booked hotel.
+        """
+        hotel = self.half_booked_controller(rooms_per_type, "busy").hotel
+        rooms = hotel.rooms[:1000]
+        ranges = [(check_in_date, check_out_date) for _, check_in_date, check_out_date in self.sample_ranges(20)]
+
+        def run() -> int:
+            for check_in_date, check_out_date in ranges:
+                for room in rooms:
+                    room.is_available(check_in_date, check_out_date)
+            return len(ranges) * len(rooms)
+
+        self.measure("Room.is_available", {"rooms": rooms_per_type * 5}, run)
+
+    def bench_check_availability(self, rooms_per_type: int, rate: str) -> None:
+        """
+        Times Hotel.check_availability (without booking) on a half-booked hotel.
+        """
+        hotel = self.half_booked_controller(rooms_per_type, rate).hotel
+        ranges = self.sample_ranges(500)
+
+        def run() -> int:
+            for room_type, check_in_date, check_out_date in ranges:
+                hotel.check_availability(room_type, check_in_date, check_out_date)
+            return len(ranges)
+
+        self.measure("Hotel.check_availability", {"rooms": rooms_per_type * 5, "rate": rate}, run)
+
+    def bench_process_requests(self, rooms_per_type: int, rate: str) -> None:
+        """
+        Times Hotel.process_requests for all requests of an experiment, one call per step, on a fresh hotel.
+        """
+        controller = self.new_controller(rooms_per_type, rate)
+        steps = []
+        while controller.advance_clock():
+            steps.append((controller.current_day, controller.generate_requests(*controller.request_num_per_step)))
+        request_count = sum(len(requests) for _, requests in steps)
+
+        def setup() -> Hotel:
+            return self.new_controller(rooms_per_type, rate).hotel
+
+        def run(hotel: Hotel) -> int:
+            for today, requests in steps:
+                hotel.process_requests(requests, today)
+            return request_count
+
+        self.measure("Hotel.process_requests", {"rooms": rooms_per_type * 5, "rate": rate}, run, setup)
+
+    def bench_get_today_occupancy(self, rooms_per_type: int) -> None:
+        """
+        Times Hotel.get_today_occupancy for every day of a half-booked hotel.
+        """
+        hotel = self.half_booked_controller(rooms_per_type, "busy").hotel
+
+        def run() -> int:
+            for _ in range(50):
+                for today in range(DAYS):
+                    hotel.get_today_occupancy(today)
+            return 50 * DAYS
+
+        self.measure("Hotel.get_today_occupancy", {"rooms": rooms_per_type * 5}, run)
+
+    def bench_step(self, rooms_per_type: int, rate: str) -> None:
+        """
+        Times ExperimentController.step over a whole experiment.
+        """
+        def run(controller: ExperimentController) -> int:
+            steps = 0
+            while controller.step():
+                steps += 1
+            return steps
+
+        self.measure("ExperimentController.step", {"rooms": rooms_per_type * 5, "rate": rate}, run,
+                     lambda: self.new_controller(rooms_per_type, rate))
+
+    def bench_goto_end(self, rooms_per_type: int, rate: str) -> None:
+        """
+        Times ExperimentController.goto_end from the start of an experiment; one operation is one whole run.
+        """
+        def run(controller: ExperimentController) -> int:
+            controller.goto_end()
+            return 1
+
+        self.measure("ExperimentController.goto_end", {"rooms": rooms_per_type * 5, "rate": rate}, run,
+                     lambda: self.new_controller(rooms_per_type, rate))
+
+    def bench_display_reservation_info(self, rooms_per_type: int, rate: str) -> None:
+        """
+        Times ExperimentController.display_reservation_info for the last step of a half-booked experiment.
+        """
+        controller = self.half_booked_controller(rooms_per_type, rate)
+
+        def run() -> int:
+            for _ in range(100):
+                controller.display_reservation_info()
+            return 100
+
+        self.measure("ExperimentController.display_reservation_info", {"rooms": rooms_per_type * 5, "rate": rate}, run)
+
+    def run(self, progress: Optional[TextIO] = None) -> List[Dict[str, Any]]:
+        """
+        Runs every benchmark for every hotel size (and request rate, where it matters).
+
+        :param progress: A stream to report each finished measurement to, or None.
+        :return: The list of results, one dictionary per measurement.
+        """
+        self.results = []
+        for rooms_per_type in self.sizes:
+            self.bench_is_available(rooms_per_type)
+            self.bench_get_today_occupancy(rooms_per_type)
+            for rate in RATES:
+                self.bench_check_availability(rooms_per_type, rate)
+                self.bench_process_requests(rooms_per_type, rate)
+                self.bench_step(rooms_per_type, rate)
+                self.bench_goto_end(rooms_per_type, rate)
+                self.bench_display_reservation_info(rooms_per_type, rate)
+            if progress is not None:
+                for result in self.results:
+                    if result["params"]["rooms"] == rooms_per_type * 5:
+                        print(f"{result_key(result)}: {result['seconds_per_op'] * 1e6:.2f} us/op", file=progress)
+        return self.results
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """
+    Builds the key a result is matched by when comparing with a baseline, e.g. "Hotel.step[rooms=25,rate=busy]".
+
+    :param result: A benchmark result.
+    :return: The result's name followed by its parameters.
+    """
+    params = ",".join(f"{name}={value}" for name, value in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float,
+            speed_ratio: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Compares results with a baseline, matching measurements by name and parameters.
+
+    :param results: The current results.
+    :param baseline: The baseline results.
+    :param tolerance: The allowed relative slowdown, e.g. 0.25 for 25%.
+    :param speed_ratio: The current calibration time divided by the baseline's; current times are divided by it.
+    :return: One dictionary per matched measurement with keys 'key', 'baseline', 'current',
+             'ratio' (calibrated current / baseline time per operation) and 'regression'.
+    """
+    baseline_by_key = {result_key(result): result for result in baseline}
+    comparison = []
+    for result in results:
+        key = result_key(result)
+        if key not in baseline_by_key:
+            continue
+        before, after = baseline_by_key[key]["seconds_per_op"], result["seconds_per_op"]
+        ratio = after / speed_ratio / before if before > 0 else float("inf")
+        comparison.append({
+            "key": key,
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance
+        })
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmark suite, writes its results as JSON and optionally compares them with a baseline.
+
+    :param argv: The argument list to parse; defaults to sys.argv[1:].
+    :return: The process exit code: 1 if a measurement is slower than the baseline beyond the tolerance, else 0.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of the hotel reservation model.")
+    parser.add_argument("--quick", action="store_true", help="only benchmark hotels of up to 1000 rooms")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="room", help="hotel occupancy storage backend")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats per measurement (the fastest is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the benchmarked experiments")
+    parser.add_argument("--output", "-o", default="benchmark_results.json", help="file to write the results to")
+    parser.add_argument("--baseline", help="baseline results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown relative to the baseline before failing (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(QUICK_SIZES if args.quick else FULL_SIZES, BACKENDS[args.backend], args.repeats, args.seed)
+    results = suite.run(progress=sys.stderr)
+    report = {
+        "meta": {
+            "calibration_seconds": suite.calibration_seconds,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "repeats": args.repeats,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline["meta"].get("backend") != args.backend:
+        print(f"warning: the baseline was measured with the {baseline['meta'].get('backend')} backend", file=sys.stderr)
+
+    speed_ratio = suite.calibration_seconds / baseline["meta"]["calibration_seconds"]
+    print(f"calibration: this machine runs at {1 / speed_ratio:.2f}x the baseline speed")
+    comparison = compare(results, baseline["results"], args.tolerance, speed_ratio)
+    if any(row["regression"] for row in comparison):
+        # Measure suspected slowdowns once more, so that a burst of noise on the machine does not fail the run.
+        for row in comparison:
+            if row["regression"]:
+                suite.remeasure(row["key"])
+        comparison = compare(suite.results, baseline["results"], args.tolerance, speed_ratio)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    regressions = 0
+    for row in comparison:
+        marker = "SLOWER" if row["regression"] else "ok"
+        print(f"{marker:6} {row['ratio']:6.2f}x  {row['key']}")
+        regressions += row["regression"]
+    if regressions:
+        print(f"{regressions} measurement(s) slower than the baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
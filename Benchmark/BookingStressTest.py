@@ -0,0 +1,215 @@
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Model.MatrixHotel import MatrixHotel
+from Model.BookingResult import BookingResult
+
+from typing import *
+
+# Hotel storage backends that can be stress-tested.
+BACKENDS: Dict[str, Type[Hotel]] = {
+    "room": Hotel,
+    "matrix": MatrixHotel
+}
+
+
+class BookingStressTest:
+    """
+    Hammers Hotel.reserve_concurrent from many threads at once and then checks the invariants
+    a correct concurrent booking path must keep:
+    - no two successful bookings take the same room for overlapping days;
+    - every room is occupied on exactly the days of its bookings;
+    - the occupancy counters (per day and per type) match the bookings and a full scan of the rooms;
+    - the statistics count every request, success, rejection and cost exactly once.
+    The thread switch interval is shortened while the threads run, so that races show up quickly.
+    With 'unsafe', the threads book without synchronization instead; races then may (but need not)
+    show up as violations in a given run.
+    """
+
+    def __init__(self, hotel_class: Type[Hotel], rooms_per_type: int, days: int, threads: int,
+                 requests_per_thread: int, seed: int, unsafe: bool = False) -> None:
+        """
+        Builds the hotel under test.
+
+        :param hotel_class: The Hotel implementation to test.
+        :param rooms_per_type: The number of rooms of each room type.
+        :param days: The number of days of the hotel.
+        :param threads: The number of booking threads.
+        :param requests_per_thread: The number of requests each thread makes.
+        :param seed: The seed the threads' request streams are derived from.
+        :param unsafe: If True, the threads book through the unsynchronized Hotel.try_reserve instead,
+                       so that the checks may catch the resulting races.
+        """
+        self.hotel = hotel_class({room_type: rooms_per_type for room_type in list(RoomType)[:5]}, days)
+        self.days = days
+        self.threads = threads
+        self.requests_per_thread = requests_per_thread
+        self.seed = seed
+        self.unsafe = unsafe
+        # (room_type, check_in_date, check_out_date, result) of every request, per thread.
+        self.results: List[List[Tuple[RoomType, int, int, BookingResult]]] = [[] for _ in range(threads)]
+
+    def book(self, index: int, start: threading.Barrier) -> None:
+        """
+        Makes one thread's requests, for random types and ranges (a few of them outside the horizon).
+
+        :param index: The index of the thread.
+        :param start: A barrier that lets all threads start booking at the same time.
+        """
+        rng = random.Random(self.seed * 1_000_003 + index)
+        reserve = self.hotel.try_reserve if self.unsafe else self.hotel.reserve_concurrent
+        room_types = list(RoomType)[:5]
+        results = self.results[index]
+        start.wait()
+        for _ in range(self.requests_per_thread):
+            room_type = rng.choice(room_types)
+            check_in_date = rng.randrange(self.days + 1)
+            check_out_date = check_in_date + rng.randint(1, 5)
+            results.append((room_type, check_in_date, check_out_date, reserve(room_type, check_in_date, check_out_date)))
+
+    def run(self) -> float:
+        """
+        Runs all booking threads to completion.
+
+        :return: The wall time of the run, in seconds.
+        """
+        start = threading.Barrier(self.threads)
+        workers = [threading.Thread(target=self.book, args=(index, start)) for index in range(self.threads)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        began = time.perf_counter()
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        return time.perf_counter() - began
+
+    def get_bookings(self) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Collects the successful bookings of a run from the results returned to the threads.
+
+        :return: The (check_in_date, check_out_date) ranges booked in each room, by room ID, sorted.
+        """
+        bookings: DefaultDict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for _, check_in_date, check_out_date, result in (row for results in self.results for row in results):
+            if result.is_booked():
+                bookings[result.room.id].append((check_in_date, min(check_out_date, self.days)))
+        for stays in bookings.values():
+            stays.sort()
+        return bookings
+
+    def count_booked(self) -> int:
+        """
+        Counts the successful bookings of a run from the results returned to the threads.
+
+        :return: The number of requests that got a room.
+        """
+        return sum(result.is_booked() for results in self.results for _, _, _, result in results)
+
+    def find_double_bookings(self) -> List[Tuple[int, int]]:
+        """
+        Finds the rooms that were booked twice for the same day.
+
+        :return: One (room ID, day) pair per overlap between two bookings of a room, at the first day they share.
+        """
+        return [
+            (room_id, check_in_date)
+            for room_id, stays in self.get_bookings().items()
+            for (_, previous_out), (check_in_date, _) in zip(stays, stays[1:])
+            if check_in_date < previous_out
+        ]
+
+    def check(self) -> List[str]:
+        """
+        Checks the invariants after a run.
+
+        :return: A description of every violation found (empty if there is none).
+        """
+        hotel, days = self.hotel, self.days
+        bookings = self.get_bookings()
+
+        # No overlapping bookings in any room.
+        errors = [f"room {room_id} is booked twice on day {day}" for room_id, day in self.find_double_bookings()]
+
+        # Every room is occupied on exactly the days of its bookings, and the counters agree.
+        expected_daily = [0] * days
+        expected_by_type = {room_type: [0] * days for room_type in hotel.occupancy_counter.daily_by_type}
+        for room in hotel.rooms:
+            booked_days = {day for check_in_date, check_out_date in bookings.get(room.id, ()) for day in range(check_in_date, check_out_date)}
+            occupied_days = {day for day in range(days) if room.is_occupied(day)}
+            if booked_days != occupied_days:
+                errors.append(f"room {room.id} is occupied on days {sorted(occupied_days ^ booked_days)} it was (not) booked for")
+            for day in occupied_days:
+                expected_daily[day] += 1
+                expected_by_type[room.type][day] += 1
+        counter = hotel.occupancy_counter
+        if counter.daily != expected_daily:
+            errors.append("the daily occupancy counters do not match the rooms")
+        if counter.daily_by_type != expected_by_type:
+            errors.append("the per-type occupancy counters do not match the rooms")
+        for day in range(days):
+            if hotel.get_current_occupancy(day) != hotel.scan_current_occupancy(day):
+                errors.append(f"the occupancy of day {day} does not match a full scan")
+                break
+
+        # The statistics saw every request exactly once (the unsafe path does not record statistics).
+        if not self.unsafe:
+            statistics = hotel.statistics
+            requests = self.threads * self.requests_per_thread
+            successes = self.count_booked()
+            profit = sum(result.cost for results in self.results for _, _, _, result in results if result.is_booked())
+            if statistics.total_requests != requests:
+                errors.append(f"statistics counted {statistics.total_requests} requests instead of {requests}")
+            if statistics.succesed_requests != successes:
+                errors.append(f"statistics counted {statistics.succesed_requests} successes instead of {successes}")
+            if statistics.profit != profit:
+                errors.append(f"statistics counted a profit of {statistics.profit} instead of {profit}")
+            if sum(statistics.rejections_by_type.values()) != requests - successes:
+                errors.append("statistics counted a wrong number of rejections")
+        return errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the stress test and reports the invariant violations found.
+
+    :param argv: The argument list to parse; defaults to sys.argv[1:].
+    :return: The process exit code: 1 if an invariant was violated, else 0.
+    """
+    parser = argparse.ArgumentParser(description="Stress-test the thread-safe booking path of the hotel.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="room", help="hotel occupancy storage backend")
+    parser.add_argument("--rooms-per-type", type=int, default=20, help="number of rooms of each room type")
+    parser.add_argument("--days", type=int, default=30, help="number of days of the hotel")
+    parser.add_argument("--threads", type=int, default=16, help="number of booking threads")
+    parser.add_argument("--requests", type=int, default=2000, help="number of requests per thread")
+    parser.add_argument("--rounds", type=int, default=3, help="number of independent runs with different seeds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first round")
+    parser.add_argument("--unsafe", action="store_true",
+                        help="book without synchronization; the checks may then detect races")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for round_index in range(args.rounds):
+        test = BookingStressTest(BACKENDS[args.backend], args.rooms_per_type, args.days, args.threads,
+                                 args.requests, args.seed + round_index, args.unsafe)
+        seconds = test.run()
+        errors = test.check()
+        print(f"round {round_index}: {args.threads * args.requests} requests in {seconds:.2f} s, "
+              f"{test.count_booked()} booked, {len(errors)} violation(s)")
+        for error in errors[:10]:
+            print(f"  {error}")
+        failed += bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+# The experiment the branches of the current 'BranchRunner.run' call are forked from, in each worker process.
+warm_start: Optional[ExperimentController] = None
+
+
+def load_warm_start(path: str) -> None:
+    """
+    Loads the warm experiment of a worker process from a checkpoint file.
+    Used as the process initializer where worker processes cannot be forked from the parent.
+
+    :param path: The path of the checkpoint file.
+    """
+    global warm_start
+    warm_start = ExperimentController(log_requests=False)
+    warm_start.load_checkpoint(path)
+
+
+def run_branch(request_num_per_step: Optional[Tuple[int, int]], seed: Optional[int]) -> Dict[str, float]:
+    """
+    Forks one branch from the warm experiment, runs it to the end and returns its final statistics.
+    Defined at module level so that it can be sent to worker processes.
+
+    :param request_num_per_step: The branch's (min_requests, max_requests) per step; None keeps the warm experiment's.
+    :param seed: The seed of the branch's random generator; None continues the warm experiment's random stream.
+    :return: The final statistics as returned by ExperimentController.display_statistics().
+    """
+    branch = warm_start.fork(request_num_per_step, seed)
+    while branch.step():
+        pass
+    return branch.display_statistics()
+
+
+class BranchRunner:
+    """
+    Runs several what-if branches of one warm experiment (e.g. different demand profiles from day 10 onward)
+    across a process pool. Where the platform can fork processes, the workers inherit the warm experiment from
+    the parent process without copying it (the operating system shares the memory pages until they are written);
+    elsewhere the experiment is handed to the workers through a checkpoint file.
+    """
+
+    def __init__(self, controller: ExperimentController, workers: Optional[int] = None) -> None:
+        """
+        Stores the warm experiment the branches start from.
+
+        :param controller: The ExperimentController to branch from; it is not modified.
+        :param workers: Number of worker processes; None uses one per CPU core.
+        """
+        self.controller = controller
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, branches: List[Tuple[Optional[Tuple[int, int]], Optional[int]]]) -> List[Dict[str, float]]:
+        """
+        Runs every branch to the end and returns their final statistics, in the order of 'branches'.
+
+        :param branches: One (request_num_per_step, seed) pair per branch, as taken by ExperimentController.fork.
+        :return: The final statistics of each branch.
+        """
+        global warm_start
+        request_nums = [request_num for request_num, _ in branches]
+        seeds = [seed for _, seed in branches]
+
+        if self.workers == 1 or len(branches) < 2:
+            # Avoid the process pool overhead when only one worker is requested.
+            warm_start = self.controller
+            try:
+                return [run_branch(request_num, seed) for request_num, seed in branches]
+            finally:
+                warm_start = None
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers see the module global set here.
+            warm_start = self.controller
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("fork")) as executor:
+                    return list(executor.map(run_branch, request_nums, seeds))
+            finally:
+                warm_start = None
+
+        file, path = tempfile.mkstemp(suffix=".chk")
+        os.close(file)
+        try:
+            self.controller.save_checkpoint(path)
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=load_warm_start, initargs=(path,)) as executor:
+                return list(executor.map(run_branch, request_nums, seeds))
+        finally:
+            os.remove(path)
@@ -0,0 +1,230 @@
+import heapq
+
+from Model.RequestBatch import RequestBatch
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+
+class EventSimulator:
+    """
+    A discrete-event engine for an initialized ExperimentController.
+    Instead of advancing the clock one fixed step at a time, it keeps a priority queue of arrival,
+    check-in and check-out events and jumps straight from one event to the next.
+    Requests are drawn from the controller's random stream in the same order as 'step' draws them,
+    and occupancy is still sampled at every step time, so the final statistics are identical to
+    calling 'step' until it returns False. Between arrivals the occupancy only changes at check-ins
+    and check-outs, so the samples of the steps without requests are taken from the number of guests
+    in the house, which the check-in and check-out events maintain, and are recorded in bulk without
+    querying the hotel. The request counts of such steps are drawn in bulk up to the next step with
+    requests (see ExperimentController.sample_arrival_gap), and the steps are not added to the request
+    flow log. The controller's step count and last request batch end up as 'step' leaves them.
+    """
+
+    # Event kinds; at equal times, check-outs are handled before check-ins and check-ins before arrivals.
+    CHECK_OUT, CHECK_IN, ARRIVAL = 0, 1, 2
+
+    def __init__(self, controller: ExperimentController) -> None:
+        """
+        Prepares the event queue for a controller whose experiment has already been initialized.
+
+        :param controller: The ExperimentController to simulate; its clock, RNG and hotel are used and updated.
+        """
+        self.controller = controller
+        self.hotel = controller.hotel
+        self.hour_per_step = controller.hour_per_step
+        # Simulation time (in hours since the start of day 0) at which the experiment ends.
+        self.end_time = controller.days * ExperimentController.ONE_DAY
+
+        # Priority queue of (time, kind, sequence number, payload) tuples.
+        self.events: List[Tuple[int, int, int, Any]] = []
+        self.sequence = 0
+
+        # Time of the next step whose occupancy sample has not been recorded yet.
+        self.next_sample_time = self.current_time() + self.hour_per_step
+        # Time of the last step for which the request count has been drawn.
+        self.last_drawn_time = self.current_time()
+        # Number of rooms occupied at the current event time, maintained by check-in and check-out events;
+        # it is the occupancy sampled at the steps without requests.
+        self.guests_in_house = 0
+        # The batch of a step without requests, left as the controller's last batch after such steps.
+        self.empty_batch = RequestBatch([], [], [])
+        # Rooms checking in and out on each day with a pending event; all stays starting (or ending)
+        # on the same day share one event.
+        self.pending_check_ins: Dict[int, int] = {}
+        self.pending_check_outs: Dict[int, int] = {}
+
+    def current_time(self) -> int:
+        """
+        Returns the controller's clock in hours since the start of day 0.
+
+        :return: The current simulation time.
+        """
+        return self.controller.current_day * ExperimentController.ONE_DAY + self.controller.current_hour
+
+    def schedule(self, time: int, kind: int, payload: Any = None) -> None:
+        """
+        Adds an event to the priority queue.
+
+        :param time: The simulation time of the event, in hours.
+        :param kind: The kind of event (CHECK_OUT, CHECK_IN or ARRIVAL).
+        :param payload: Data attached to the event.
+        """
+        heapq.heappush(self.events, (time, kind, self.sequence, payload))
+        self.sequence += 1
+
+    def schedule_next_arrival(self) -> None:
+        """
+        Draws the gap to the next step with requests, i.e. the request counts of the following steps up to
+        the first one above 0, and schedules an arrival event for that step.
+        When the controller replays a trace, the arrival is scheduled at the trace's next step instead.
+        """
+        time = self.last_drawn_time + self.hour_per_step
+        trace_reader = self.controller.trace_reader
+        if trace_reader is not None:
+            # When replaying a trace, the next arrival is simply the next step stored in it.
+            if trace_reader.next_time is not None:
+                day, hour = trace_reader.next_time
+                arrival_time = day * ExperimentController.ONE_DAY + hour
+                if arrival_time < self.end_time:
+                    self.schedule(arrival_time, EventSimulator.ARRIVAL, 0)
+                    self.last_drawn_time = arrival_time
+                    return
+            # No arrivals are left; move on to the first step time at or after the end.
+            self.last_drawn_time = time + max(0, -(-(self.end_time - time) // self.hour_per_step)) * self.hour_per_step
+            return
+
+        # Number of step times from 'time' up to the end.
+        steps = max(0, -(-(self.end_time - time) // self.hour_per_step))
+        gap, req_num = self.controller.sample_arrival_gap(steps)
+        time += gap * self.hour_per_step
+        if req_num > 0:
+            self.schedule(time, EventSimulator.ARRIVAL, req_num)
+        self.last_drawn_time = time
+
+    def record_samples_before(self, time: int) -> None:
+        """
+        Records the steps without requests earlier than 'time' that have not been recorded yet.
+        Every event before 'time' has been handled, and check-ins and check-outs happen at midnight,
+        so each day's samples share one occupancy value, 'guests_in_house', and are recorded in a single call.
+        The steps are counted, but not added to the request flow log.
+        In debug mode the occupancy is cross-checked against the hotel's occupancy counters.
+
+        :param time: Steps at times strictly before this time are recorded.
+        :raises RuntimeError: In debug mode, if the occupancy derived from the events differs from the hotel's.
+        """
+        controller, statistics, one_day = self.controller, self.hotel.statistics, ExperimentController.ONE_DAY
+        end = min(time, self.end_time)
+        while self.next_sample_time < end:
+            day = self.next_sample_time // one_day
+            # Number of pending step times on this day that fall before 'end'.
+            day_end = min(end, (day + 1) * one_day)
+            repeat = (day_end - self.next_sample_time + self.hour_per_step - 1) // self.hour_per_step
+            if self.hotel.debug and self.guests_in_house != self.hotel.get_current_occupancy(day):
+                raise RuntimeError(f"Event occupancy mismatch on day {day}: counted {self.guests_in_house}, "
+                                   f"hotel has {self.hotel.get_current_occupancy(day)}")
+            statistics.record_occupancy(self.guests_in_house, repeat)
+
+            self.next_sample_time += repeat * self.hour_per_step
+            controller.step_count += repeat
+            controller.request_batch = self.empty_batch
+            # Leave the clock at the last recorded step.
+            controller.current_day, controller.current_hour = divmod(self.next_sample_time - self.hour_per_step, one_day)
+
+    def handle_arrival(self, time: int, req_num: int) -> None:
+        """
+        Handles the arrival of a step's requests: draws them, books them, updates the statistics
+        and schedules check-in and check-out events for the successful bookings.
+
+        :param time: The step time of the arrival.
+        :param req_num: The number of requests arriving at this step (unused when replaying a trace).
+        """
+        controller = self.controller
+        controller.current_day, controller.current_hour = divmod(time, ExperimentController.ONE_DAY)
+
+        if controller.trace_reader is not None:
+            batch = controller.trace_reader.read_step(controller.current_day, controller.current_hour)
+        else:
+            batch = RequestBatch(*controller.sample_requests(req_num))
+        if controller.trace_writer is not None:
+            controller.trace_writer.write_step(controller.current_day, controller.current_hour, batch)
+        controller.request_batch = self.hotel.process_batch(batch, controller.current_day)
+        controller.step_count += 1
+        controller.log_step(batch)
+        self.next_sample_time = time + self.hour_per_step
+
+        for room_id, check_in_date, check_out_date in zip(batch.room_ids, batch.check_in_dates, batch.check_out_dates):
+            if room_id >= 0:
+                self.add_day_event(check_in_date, EventSimulator.CHECK_IN, self.pending_check_ins)
+                self.add_day_event(check_out_date, EventSimulator.CHECK_OUT, self.pending_check_outs)
+
+        # The next step's counts are drawn only after this step's requests, as 'step' does.
+        self.schedule_next_arrival()
+
+    def add_day_event(self, day: int, kind: int, pending: Dict[int, int], rooms: int = 1) -> None:
+        """
+        Adds rooms to the check-in or check-out event of a day, scheduling the event if the day has none yet.
+
+        :param day: The day of the check-in or check-out.
+        :param kind: CHECK_IN or CHECK_OUT.
+        :param pending: The pending room counts per day for this kind of event.
+        :param rooms: The number of rooms checking in or out.
+        """
+        if day not in pending:
+            pending[day] = 0
+            self.schedule(day * ExperimentController.ONE_DAY, kind, day)
+        pending[day] += rooms
+
+    def schedule_booked_stays(self) -> None:
+        """
+        Seeds the guest count and the check-in and check-out events with the stays booked before the simulation
+        started (e.g. by earlier calls to 'step'). The individual stays are not known, but the changes
+        of the daily occupancy counts from one day to the next are all that the events need.
+        """
+        daily = self.hotel.occupancy_counter.daily
+        first_day = self.controller.current_day
+        if first_day >= len(daily):
+            return
+        self.guests_in_house = daily[first_day]
+        for day in range(first_day + 1, len(daily)):
+            change = daily[day] - daily[day - 1]
+            if change > 0:
+                self.add_day_event(day, EventSimulator.CHECK_IN, self.pending_check_ins, change)
+            elif change < 0:
+                self.add_day_event(day, EventSimulator.CHECK_OUT, self.pending_check_outs, -change)
+
+    def run(self) -> None:
+        """
+        Runs the simulation to the end by processing events in time order.
+        Afterwards the controller's clock, step count and last request batch are where 'step' leaves them
+        once it has returned False; the request flow log holds the steps with requests.
+        If every step has requests (generated requests with a minimum count above 0), there are no stretches
+        without requests to skip, so the steps are simply run one by one with 'step'.
+        """
+        controller = self.controller
+        if controller.trace_reader is None and controller.request_num_per_step[0] > 0:
+            while controller.step():
+                pass
+            return
+
+        self.schedule_booked_stays()
+        self.schedule_next_arrival()
+
+        while self.events:
+            time, kind, _, payload = heapq.heappop(self.events)
+            # Every step before this event is complete, so its occupancy sample can be recorded.
+            self.record_samples_before(time)
+
+            if kind == EventSimulator.ARRIVAL:
+                self.handle_arrival(time, payload)
+            elif kind == EventSimulator.CHECK_IN:
+                self.guests_in_house += self.pending_check_ins.pop(payload)
+            else:
+                self.guests_in_house -= self.pending_check_outs.pop(payload)
+
+        # Record the samples of the trailing steps without requests.
+        self.record_samples_before(self.end_time)
+
+        # Leave the clock at the first step time on the final day, as 'step' does when it returns False.
+        final_time = self.last_drawn_time
+        self.controller.current_day, self.controller.current_hour = divmod(final_time, ExperimentController.ONE_DAY)
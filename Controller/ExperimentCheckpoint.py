@@ -0,0 +1,159 @@
+import json
+import os
+import struct
+import sys
+from array import array
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Model.MatrixHotel import MatrixHotel
+from Model.RequestBatch import RequestBatch
+from Model.MetricsTimeSeries import MetricsTimeSeries
+
+from typing import *
+
+
+class ExperimentCheckpoint:
+    """
+    Saves the full state of a running experiment to a compact binary file and restores it, so that a long run
+    can be resumed after an interruption with exactly the results it would have had without one.
+
+    File layout (all integers little-endian):
+    - a file header: magic b"HRCHKPT1", format version and the length of the JSON header;
+    - a JSON header with the experiment parameters, the clock, the statistics accumulators,
+      and the offset and length of every binary section;
+    - the binary sections, back to back: the random generator's state (uint32 words), the occupancy of all rooms
+      and the occupancy counters (see Hotel.export_occupancy), the last step's requests and results
+      (see RequestBatch.to_bytes) and, if recorded, the time series columns (see MetricsTimeSeries.to_bytes).
+    The rooms themselves are not stored: they follow from the room counts, so restoring rebuilds the hotel
+    and only copies the occupancy bits into it.
+
+    Traces being recorded or replayed and the request flow log are not part of a checkpoint.
+    """
+
+    MAGIC = b"HRCHKPT1"
+    VERSION = 1
+    # magic, version, JSON header length
+    FILE_HEADER = struct.Struct("<8sII")
+
+    # Hotel implementations that can be checkpointed, by class name.
+    HOTEL_CLASSES: Dict[str, Type[Hotel]] = {
+        "Hotel": Hotel,
+        "MatrixHotel": MatrixHotel
+    }
+
+    @staticmethod
+    def save(controller: Any, path: str) -> None:
+        """
+        Writes the state of an initialized experiment to a checkpoint file.
+        The file is written under a temporary name and then renamed, so an interrupted save
+        never leaves a truncated checkpoint behind.
+
+        :param controller: The ExperimentController to save.
+        :param path: The path of the checkpoint file.
+        :raises ValueError: If the hotel is not one of HOTEL_CLASSES.
+        """
+        hotel = controller.hotel
+        hotel_class = type(hotel).__name__
+        if ExperimentCheckpoint.HOTEL_CLASSES.get(hotel_class) is not type(hotel):
+            raise ValueError(f"hotels of class {hotel_class} cannot be checkpointed")
+
+        version, internal_state, gauss_next = controller.rng.getstate()
+        rng_words = array("I", internal_state)
+        if sys.byteorder == "big":
+            rng_words.byteswap()
+        time_series = hotel.statistics.time_series
+        sections = {
+            "rng_state": rng_words.tobytes(),
+            "occupancy": hotel.export_occupancy(),
+            "request_batch": controller.request_batch.to_bytes()
+        }
+        if time_series is not None:
+            sections["time_series"] = time_series.to_bytes()
+
+        layout = {}
+        offset = 0
+        for name, data in sections.items():
+            layout[name] = [offset, len(data)]
+            offset += len(data)
+        header = json.dumps({
+            "hotel_class": hotel_class,
+            "days": controller.days,
+            "hour_per_step": controller.hour_per_step,
+            "request_num_per_step": list(controller.request_num_per_step),
+            # Room counts as [name, count] pairs, in the order the hotel created its rooms.
+            "rooms_info": [[room_type.name, numbers] for room_type, numbers in hotel.get_room_info().items()],
+            "debug": hotel.debug,
+            "current_day": controller.current_day,
+            "current_hour": controller.current_hour,
+            "step_count": controller.step_count,
+            "rng_version": version,
+            "rng_gauss_next": gauss_next,
+            "statistics": hotel.statistics.get_state(),
+            "time_series_length": len(time_series) if time_series is not None else None,
+            "sections": layout
+        }).encode("utf-8")
+
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(ExperimentCheckpoint.FILE_HEADER.pack(ExperimentCheckpoint.MAGIC, ExperimentCheckpoint.VERSION,
+                                                             len(header)))
+            file.write(header)
+            for data in sections.values():
+                file.write(data)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def restore(controller: Any, path: str) -> None:
+        """
+        Replaces the experiment of a controller by the one saved in a checkpoint file.
+        Stepping the controller afterwards continues exactly where the saved experiment left off.
+
+        :param controller: The ExperimentController to restore into.
+        :param path: The path of the checkpoint file.
+        :raises ValueError: If the file is not a checkpoint or has an unsupported version.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < ExperimentCheckpoint.FILE_HEADER.size:
+            raise ValueError(f"{path} is not an experiment checkpoint")
+        magic, version, header_length = ExperimentCheckpoint.FILE_HEADER.unpack_from(data)
+        if magic != ExperimentCheckpoint.MAGIC:
+            raise ValueError(f"{path} is not an experiment checkpoint")
+        if version != ExperimentCheckpoint.VERSION:
+            raise ValueError(f"unsupported checkpoint version {version}")
+        start = ExperimentCheckpoint.FILE_HEADER.size
+        header = json.loads(data[start:start + header_length].decode("utf-8"))
+        start += header_length
+
+        def section(name: str) -> bytes:
+            offset, length = header["sections"][name]
+            return data[start + offset:start + offset + length]
+
+        # Rebuild an empty hotel with the saved parameters, then copy the saved state into it.
+        controller.initialize_experiment(
+            header["days"], header["hour_per_step"],
+            {RoomType[name]: numbers for name, numbers in header["rooms_info"]},
+            tuple(header["request_num_per_step"]),
+            hotel_class=ExperimentCheckpoint.HOTEL_CLASSES[header["hotel_class"]], debug=header["debug"]
+        )
+        hotel = controller.hotel
+        hotel.import_occupancy(section("occupancy"))
+        hotel.statistics.set_state(header["statistics"])
+        if header["time_series_length"] is not None:
+            hotel.statistics.time_series = MetricsTimeSeries.from_bytes(section("time_series"),
+                                                                        header["time_series_length"])
+
+        rng_words = array("I")
+        rng_words.frombytes(section("rng_state"))
+        if sys.byteorder == "big":
+            rng_words.byteswap()
+        controller.rng.setstate((header["rng_version"], tuple(rng_words), header["rng_gauss_next"]))
+
+        controller.current_day = header["current_day"]
+        controller.current_hour = header["current_hour"]
+        controller.step_count = header["step_count"]
+        controller.request_batch = RequestBatch.from_bytes(section("request_batch"))
+        if controller.step_count:
+            # Show the last step's requests again in the request flow.
+            controller.log_step(controller.request_batch)
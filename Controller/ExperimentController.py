@@ -1,8 +1,18 @@
+import itertools
 import random
+import sys
+from array import array
 from Model.RoomType import RoomType
 from Model.Hotel import Hotel
 from Model.Request import Request
+from Model.RequestBatch import RequestBatch
+from Model.Room import Room
 from Model.Statistics import Statistics
+from Model.MetricsTimeSeries import MetricsTimeSeries
+from Controller.TraceWriter import TraceWriter
+from Controller.TraceReader import TraceReader
+from Controller.RequestFlowLog import RequestFlowLog
+from Controller.ExperimentCheckpoint import ExperimentCheckpoint
 
 from typing import *
 T = TypeVar("T")
@@ -21,11 +31,23 @@ class ExperimentController:
     MIN_ROOM_NUM, MAX_ROOM_NUM = 4, 6
     MIN_DURATION_DAY, MAX_DURATION_DAY = 1, 5
     ONE_DAY = 24
-    def __init__(self) -> None:
+    # Relaxed parameter ranges of the large-scale mode (tens of thousands of rooms, multi-year horizons).
+    LARGE_MIN_DAYS, LARGE_MAX_DAYS = 1, 3650
+    LARGE_MIN_STEPS, LARGE_MAX_STEPS = 1, 24
+    LARGE_MIN_REQ, LARGE_MAX_REQ = 0, 100_000
+    LARGE_MIN_ROOM_NUM, LARGE_MAX_ROOM_NUM = 0, 100_000
+    # Number of requests the fast-forward of 'goto_end' samples and books as one batch.
+    FAST_FORWARD_REQUESTS = 1 << 16
+    # Number of request counts 'sample_arrival_gap' draws one by one before it draws them in blocks.
+    ARRIVAL_GAP_DRAWS = 8
+    def __init__(self, log_requests: bool = True) -> None:
         """
         Initializes an ExperimentController instance with default values.
         The simulation parameters (e.g., days, hours per step, room info) are set to None.
         They must be initialized later using the 'initialize_experiment' method.
+
+        :param log_requests: If True, every processed step is added to 'flow_log' for display. Runs without
+                             a view (headless, replications, sweeps, branches) pass False to skip that work.
         """
         # Simulation parameters (to be set during experiment initialization)
         self.days = None                      # Total simulation duration in days
@@ -33,15 +55,28 @@ class ExperimentController:
         self.request_num_per_step = None      # Tuple (min_requests, max_requests) per simulation step
 
         self.hotel = None                     # Hotel instance to process room requests
+        self.request_batch = RequestBatch([], [], [])  # Requests and results of the last simulation step
 
         self.current_hour = 0                 # Current simulation hour
         self.current_day = 0                  # Current simulation day
+        self.step_count = 0                   # Number of simulation steps processed so far
+        self.flow_log = RequestFlowLog()      # Requests and results of the processed steps, for display
+        self.log_requests = log_requests      # Whether processed steps are added to 'flow_log'
+
+        # Random number generator owned by this experiment; reseeded by 'initialize_experiment'.
+        self.rng = random.Random()
+        # Optional trace the generated requests are recorded to, and trace the requests are replayed from
+        # instead of being generated.
+        self.trace_writer: Optional[TraceWriter] = None
+        self.trace_reader: Optional[TraceReader] = None
 
         # List of possible room types for random request generation.
         # Assumes that the first five elements of RoomType are valid types and exclude NOT_A_ROOM.
         self.RoomTypes = list(RoomType)[:5]
 
-    def initialize_experiment(self, days: int, steps: int, rooms_info: Dict[RoomType, int], request_num_per_step: Tuple[int, int]) -> None:
+    def initialize_experiment(self, days: int, steps: int, rooms_info: Dict[RoomType, int], request_num_per_step: Tuple[int, int],
+                              hotel_class: Type[Hotel] = Hotel, debug: bool = False, seed: Optional[int] = None,
+                              record_time_series: bool = False) -> None:
         """
         Initializes the simulation parameters and creates instances for Hotel and Statistics.
 
@@ -49,14 +84,25 @@ class ExperimentController:
         :param steps: Number of hours that pass in one simulation step.
         :param rooms_info: A dictionary mapping each RoomType to the number of rooms in the hotel.
         :param request_num_per_step: A tuple (min_requests, max_requests) specifying the range of requests generated per step.
+        :param hotel_class: The Hotel implementation used as the occupancy storage backend (e.g., Hotel or MatrixHotel).
+        :param debug: If True, the hotel cross-checks its occupancy counters against a full scan on every query.
+        :param seed: Seed for the experiment's random number generator; None seeds it from system entropy.
+        :param record_time_series: If True, the hotel's statistics record one row of metrics per step.
         """
         # Set simulation parameters
         self.days = days                      # Total simulation duration in days
         self.hour_per_step = steps            # Number of hours per simulation step
         self.request_num_per_step = request_num_per_step
+        # Seed the experiment's own random number generator so that runs are reproducible.
+        self.rng = random.Random(seed)
+        self.step_count = 0
+        self.flow_log.clear()
 
         # Create Hotel instance based on room information and simulation duration
-        self.hotel = Hotel(rooms_info, days)
+        self.hotel = hotel_class(rooms_info, days, debug)
+        if record_time_series:
+            # Preallocate one row per step of the experiment.
+            self.hotel.statistics.time_series = MetricsTimeSeries(days * ExperimentController.ONE_DAY // steps)
 
     def generate_request(self) -> Request:
         """
@@ -69,12 +115,12 @@ class ExperimentController:
         :return: A Request object representing the generated room request.
         """
         # Randomly choose a valid room type from the available types.
-        desired_room_type = random.choice(self.RoomTypes)
+        desired_room_type = self.rng.choice(self.RoomTypes)
         # Determine a random duration of stay between 1 and 5 days.
-        duration_day = random.randint(ExperimentController.MIN_DURATION_DAY, ExperimentController.MAX_DURATION_DAY)
+        duration_day = self.rng.randint(ExperimentController.MIN_DURATION_DAY, ExperimentController.MAX_DURATION_DAY)
 
         # Randomly select a check-in date starting from the current day up to the end of simulation.
-        check_in_date = self.current_day + random.randint(0, self.days - self.current_day)
+        check_in_date = self.current_day + self.rng.randint(0, self.days - self.current_day)
         # Calculate the check-out date based on the duration of stay.
         check_out_date = check_in_date + duration_day
         # Clamp the check-out date to the simulation limit if it exceeds the total days.
@@ -85,38 +131,237 @@ class ExperimentController:
         if check_in_date < self.days and check_out_date <= self.days:
             return Request(desired_room_type, check_in_date, check_out_date)
         
-        # Otherwise, return a dummy request indicating an out-of-range request.
-        return Request(RoomType.NOT_A_ROOM, -1, -1)
+        # Otherwise, return the shared dummy request indicating an out-of-range request.
+        return Request.DUMMY
+
+    def random_words(self, count: int) -> array:
+        """
+        Draws a block of random 64-bit words from the experiment's generator in a single call.
+        The words are read as little-endian on every platform, so a seed yields the same words everywhere.
+
+        :param count: The number of words to draw.
+        :return: An array of 'count' unsigned 64-bit integers.
+        """
+        words = array("Q")
+        words.frombytes(self.rng.randbytes(8 * count))
+        if sys.byteorder == "big":
+            words.byteswap()
+        return words
+
+    def sample_request_num(self, min_request_num: int, max_request_num: int) -> int:
+        """
+        Draws the number of requests of one simulation step, uniformly between min_request_num and max_request_num.
+
+        :param min_request_num: Minimum number of requests to generate in one step.
+        :param max_request_num: Maximum number of requests to generate in one step.
+        :return: The number of requests.
+        """
+        # Map a 64-bit word onto the range by a multiply-shift instead of a modulo.
+        # getrandbits(64) yields the same word as random_words(1) without building an array.
+        return min_request_num + ((self.rng.getrandbits(64) * (max_request_num - min_request_num + 1)) >> 64)
+
+    def sample_arrival_gap(self, steps: int) -> Tuple[int, int]:
+        """
+        Draws the request counts of up to 'steps' following steps, in step order, until one of them has requests,
+        with exactly the same random values as calling 'sample_request_num' for each of them.
+        Only the first few counts are drawn one by one. The rest are drawn in blocks of words, in which the first
+        word that maps to a count above 0 (a word at or above a threshold) is found by a scan in C; the generator is
+        then rewound and advanced by exactly the words used. A long stretch of steps without requests thus costs
+        a few block draws instead of one draw per step.
+
+        :param steps: The maximum number of steps to draw counts for.
+        :return: A tuple (gap, req_num): the number of steps without requests before the first step with requests,
+                 and that step's request count; (steps, 0) if none of the steps has requests.
+        """
+        min_request_num, max_request_num = self.request_num_per_step
+        for gap in range(min(steps, ExperimentController.ARRIVAL_GAP_DRAWS)):
+            req_num = self.sample_request_num(min_request_num, max_request_num)
+            if req_num > 0:
+                return gap, req_num
+
+        # Only counts from a range starting at 0 can be 0, and a word maps to a count above 0
+        # (see 'sample_request_num') exactly when word * span >= 2 ** 64.
+        span = max_request_num - min_request_num + 1
+        threshold = -(-(1 << 64) // span)
+        gap = min(steps, ExperimentController.ARRIVAL_GAP_DRAWS)
+        block = ExperimentController.ARRIVAL_GAP_DRAWS
+        while gap < steps:
+            block = min(2 * block, steps - gap)
+            state = self.rng.getstate()
+            words = self.random_words(block)
+            index = next(itertools.compress(itertools.count(), map(threshold.__le__, words)), None)
+            if index is not None:
+                self.rng.setstate(state)
+                self.rng.randbytes(8 * (index + 1))
+                return gap + index, (words[index] * span) >> 64
+            gap += block
+        return steps, 0
+
+    def sample_requests(self, req_num: int) -> Tuple[List[RoomType], List[int], List[int]]:
+        """
+        Samples room types, check-in dates and check-out dates for a whole step of requests at once.
+        All random values come from one block of 3 * req_num words, one column per field.
+        The same clamping and NOT_A_ROOM fallback rules as 'generate_request' apply:
+        check-out dates are clamped to the simulation length, and requests that would check in
+        after the last day become dummy requests (NOT_A_ROOM, -1, -1).
+
+        :param req_num: The number of requests to sample.
+        :return: A tuple of three lists (room types, check-in dates, check-out dates).
+        """
+        words = self.random_words(3 * req_num)
+        return self.map_request_words(words[:req_num], words[req_num:2 * req_num], words[2 * req_num:],
+                                      itertools.repeat(self.current_day, req_num))
+
+    def map_request_words(self, type_words: array, duration_words: array, check_in_words: array,
+                          current_days: Iterable[int]) -> Tuple[List[RoomType], List[int], List[int]]:
+        """
+        Maps columns of random words onto the fields of requests, as described in 'sample_requests'.
+
+        :param type_words: One word per request for its room type.
+        :param duration_words: One word per request for its duration.
+        :param check_in_words: One word per request for its check-in date.
+        :param current_days: The current day of the step each request is sampled in.
+        :return: A tuple of three lists (room types, check-in dates, check-out dates).
+        """
+        days = self.days
+        room_types, type_count = self.RoomTypes, len(self.RoomTypes)
+        min_duration = ExperimentController.MIN_DURATION_DAY
+        duration_span = ExperimentController.MAX_DURATION_DAY - min_duration + 1
+
+        # Map each column of words onto its range by a multiply-shift; check-ins fall between the current day
+        # and the end of the simulation.
+        types = [room_types[(word * type_count) >> 64] for word in type_words]
+        durations = [min_duration + ((word * duration_span) >> 64) for word in duration_words]
+        check_ins = [current_day + ((word * (days - current_day + 1)) >> 64)
+                     for word, current_day in zip(check_in_words, current_days)]
+        # Clamp the check-out dates to the simulation limit.
+        check_outs = [min(check_in + duration, days) for check_in, duration in zip(check_ins, durations)]
+
+        # Replace requests that fall outside the simulation period by dummy requests.
+        for i, check_in in enumerate(check_ins):
+            if check_in >= days:
+                types[i], check_ins[i], check_outs[i] = RoomType.NOT_A_ROOM, -1, -1
+
+        return types, check_ins, check_outs
 
     def generate_requests(self, min_request_num: int, max_request_num: int) -> List[Request]:
         """
         Generates a random list of room requests.
-        The number of requests is randomly chosen between min_request_num and max_request_num.
+        The number of requests is randomly chosen between min_request_num and max_request_num,
+        and the requests themselves are sampled in bulk by 'sample_requests'.
 
         :param min_request_num: Minimum number of requests to generate in one step.
         :param max_request_num: Maximum number of requests to generate in one step.
         :return: A list of randomly generated Request objects.
         """
         # Determine the number of requests to generate for this simulation step.
-        req_num = random.randint(min_request_num, max_request_num)
-        requests = []
+        req_num = self.sample_request_num(min_request_num, max_request_num)
 
-        # Generate each request and add it to the list.
-        for _ in range(req_num):
-            requests.append(self.generate_request())
+        # Sample all requests of the step at once and wrap them into Request objects.
+        return [Request(*fields) for fields in zip(*self.sample_requests(req_num))]
 
-        return requests
+    def generate_request_batch(self, min_request_num: int, max_request_num: int) -> RequestBatch:
+        """
+        Generates the random room requests of one simulation step as a columnar RequestBatch.
+        Draws exactly the same random values as 'generate_requests'.
 
-    def step(self) -> bool:
+        :param min_request_num: Minimum number of requests to generate in one step.
+        :param max_request_num: Maximum number of requests to generate in one step.
+        :return: A RequestBatch holding the generated requests.
         """
-        Advances the simulation by one time step.
+        req_num = self.sample_request_num(min_request_num, max_request_num)
+        return RequestBatch(*self.sample_requests(req_num))
+
+    def record_trace(self, trace_writer: TraceWriter) -> None:
+        """
+        Records the requests of every following step into a trace.
+
+        :param trace_writer: The TraceWriter to record to.
+        """
+        self.trace_writer = trace_writer
+
+    def replay_trace(self, trace_reader: TraceReader) -> None:
+        """
+        Takes the requests of every following step from a recorded trace instead of generating them.
+
+        :param trace_reader: The TraceReader to replay from.
+        :raises ValueError: If the trace was recorded for a different number of days or hours per step.
+        """
+        trace_reader.check_experiment(self.days, self.hour_per_step)
+        self.trace_reader = trace_reader
+
+    def fork(self, request_num_per_step: Optional[Tuple[int, int]] = None, seed: Optional[int] = None,
+             log_requests: bool = False) -> "ExperimentController":
+        """
+        Creates a branch of the experiment for a what-if run: the branch starts at the current step with the same
+        occupancy, statistics and random generator state, and then evolves independently of this experiment.
+        The hotel is forked copy-on-write (see Hotel.fork), so forking is cheap even for large hotels.
+        Traces and the request flow log are not carried over.
+
+        :param request_num_per_step: The branch's (min_requests, max_requests) per step; None keeps the current range.
+        :param seed: If given, the branch's random generator is reseeded with it; otherwise the branch continues
+                     this experiment's random stream, so an unchanged branch reproduces this experiment.
+        :param log_requests: If True, the branch logs its own steps to its (initially empty) request flow log.
+        :return: The new ExperimentController.
+        """
+        branch = ExperimentController(log_requests)
+        branch.days = self.days
+        branch.hour_per_step = self.hour_per_step
+        branch.request_num_per_step = request_num_per_step if request_num_per_step is not None else self.request_num_per_step
+        branch.hotel = self.hotel.fork()
+        # The last step's batch is never modified once processed, so it can be shared.
+        branch.request_batch = self.request_batch
+        branch.current_hour = self.current_hour
+        branch.current_day = self.current_day
+        branch.step_count = self.step_count
+        if seed is not None:
+            branch.rng = random.Random(seed)
+        else:
+            branch.rng.setstate(self.rng.getstate())
+        return branch
+
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Saves the full state of the experiment to a checkpoint file (see ExperimentCheckpoint).
+
+        :param path: The path of the checkpoint file.
+        """
+        ExperimentCheckpoint.save(self, path)
+
+    def load_checkpoint(self, path: str) -> None:
+        """
+        Replaces the current experiment by the one saved in a checkpoint file, ready to continue stepping.
+
+        :param path: The path of the checkpoint file.
+        """
+        ExperimentCheckpoint.restore(self, path)
+
+    def next_request_batch(self) -> RequestBatch:
+        """
+        Returns the requests of the current step: replayed from the trace if one is being replayed,
+        otherwise generated randomly. The requests are recorded if a trace is being recorded.
+
+        :return: A RequestBatch holding the step's requests.
+        """
+        if self.trace_reader is not None:
+            batch = self.trace_reader.read_step(self.current_day, self.current_hour)
+        else:
+            batch = self.generate_request_batch(*self.request_num_per_step)
+        if self.trace_writer is not None:
+            self.trace_writer.write_step(self.current_day, self.current_hour, batch)
+        return batch
+
+    def advance_clock(self) -> bool:
+        """
+        Moves the simulation clock forward by one step.
         It increments the current time by the specified hours per step.
         If 24 hours are reached, the simulation day is incremented.
-        Then, random room requests are generated, processed by the hotel,
-        and simulation statistics are updated.
 
         :return: False if the simulation has reached the final day; otherwise, True.
         """
+        # Once the clock has run out, it stays where it stopped.
+        if self.current_day >= self.days:
+            return False
         # Increment the current hour by the simulation step interval.
         self.current_hour += self.hour_per_step
         # If the current hour is 24 or more, advance to the next day and adjust the hour.
@@ -125,16 +370,66 @@ class ExperimentController:
             self.current_hour -= ExperimentController.ONE_DAY
 
         # If the simulation has reached the final day, stop the simulation.
-        if self.current_day == self.days:
+        return self.current_day < self.days
+
+    def step(self) -> bool:
+        """
+        Advances the simulation by one time step.
+        It increments the current time by the specified hours per step.
+        If 24 hours are reached, the simulation day is incremented.
+        Then, random room requests are generated, processed by the hotel,
+        and simulation statistics are updated.
+
+        :return: False if the simulation has reached the final day; otherwise, True.
+        """
+        # Advance the clock; stop the simulation once it has reached the final day.
+        if not self.advance_clock():
             return False
 
-        # Generate room requests for the current simulation step.
-        self.requests = self.generate_requests(*self.request_num_per_step)
+        # Generate (or replay) room requests for the current simulation step as one columnar batch.
+        self.request_batch = self.next_request_batch()
         # Process the generated requests using the Hotel instance; pass the current day for context.
-        self.request_results = self.hotel.process_requests(self.requests, self.current_day)
+        self.hotel.process_batch(self.request_batch, self.current_day)
+        self.step_count += 1
+        self.log_step(self.request_batch)
 
         return True
 
+    def log_step(self, batch: RequestBatch) -> None:
+        """
+        Adds a processed step to the request flow log, under a header with the current day and time.
+        Does nothing if the experiment was created with log_requests=False.
+
+        :param batch: The step's processed RequestBatch.
+        """
+        if not self.log_requests:
+            return
+        day, hour = self.get_time_info()
+        self.flow_log.append(f"=== Day {day} {hour} ===", batch)
+
+    @property
+    def requests(self) -> List[Request]:
+        """
+        Returns the requests of the last simulation step as Request objects.
+
+        :return: A list of Request objects.
+        """
+        return self.request_batch.to_requests()
+
+    @property
+    def request_results(self) -> List[Tuple[int, Room]]:
+        """
+        Returns the results of the last simulation step as (cost, Room) tuples,
+        with the shared dummy Room (Room.DUMMY) for requests that could not be booked.
+
+        :return: A list of tuples (cost, Room).
+        """
+        batch = self.request_batch
+        return [
+            (cost, self.hotel.get_room(room_id)) if room_id >= 0 else Hotel.REJECTED
+            for room_id, cost in zip(batch.room_ids, batch.costs)
+        ]
+
     def display_statistics(self) -> str:
         """
         Retrieves a formatted string representation of the simulation statistics.
@@ -145,30 +440,22 @@ class ExperimentController:
 
     def display_reservation_info(self) -> str:
         """
-        Builds a string describing each room request along with its reservation result.
+        Builds a string describing each room request of the last step along with its reservation result.
         For each valid request, it includes the desired room type, reservation status,
         check-in/check-out dates, and cost information. If a discount is applied, it notes that.
+        The lines are formatted by RequestFlowLog.format_request and joined once, so the cost is linear
+        in the number of requests.
 
         :return: A formatted string with reservation details for each request.
         """
-        display = ""
-        # Loop through each request and its corresponding result.
-        for request, (cost, request_result) in zip(self.requests, self.request_results):
-            if request.is_request():
-                # Get the room type's friendly name and the time info (check-in and check-out dates).
-                room_type, (checkIn, checkOut) = request.get_room_name(), request.get_time_info()
-                if request_result.is_room():
-                    # Append information about the successful reservation.
-                    display += (
-                        f"+/ Id : {request_result.get_id()} / Wanted : {room_type} / "
-                        f"Reserved : {request_result.get_type_name()} / In {checkIn} / Out {checkOut} / Cost {cost}"
-                    )
-                    # If the reserved room type is different from the requested type, note a discount.
-                    display += "/ Discounted(70%)\n" if request.get_type() != request_result.get_type() else "\n"
-                else:
-                    # Append information about the failed reservation.
-                    display += f"-/ Wanted : {room_type} / In : {checkIn} / Out : {checkOut}\n"
-        return display
+        batch = self.request_batch
+        # Format each valid request of the last step's batch from its result columns.
+        return "".join(
+            RequestFlowLog.format_request(*fields) + "\n"
+            for fields in zip(batch.room_types, batch.check_in_dates, batch.check_out_dates,
+                              batch.room_ids, batch.costs, batch.reserved_types)
+            if fields[0] != RoomType.NOT_A_ROOM
+        )
 
     def display_today_occupancy(self) -> str:
         """
@@ -190,6 +477,37 @@ class ExperimentController:
                 display[room_type] = f"{occupancy[room_type]}/{room_numbers_each_type[room_type]}"
         return display
 
+    def get_progress(self) -> float:
+        """
+        Returns the fraction of the experiment's time that has passed.
+
+        :return: A value between 0.0 (start) and 1.0 (end).
+        """
+        elapsed = self.current_day * ExperimentController.ONE_DAY + self.current_hour
+        return min(1.0, elapsed / (self.days * ExperimentController.ONE_DAY))
+
+    def snapshot(self, finished: bool = False, error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Collects everything the observation window shows about the current state of the experiment,
+        so that it can be handed from a worker thread to the GUI thread.
+        The request flow is not part of the snapshot; it is read from 'flow_log', which is safe to read
+        while a worker thread appends to it.
+
+        :param finished: True if the experiment has reached its end.
+        :param error: A description of the error that stopped the run, if any.
+        :return: A dictionary with keys 'step_count', 'time' (as returned by get_time_info), 'statistics',
+                 'today_occupancy', 'progress', 'finished' and 'error'.
+        """
+        return {
+            "step_count": self.step_count,
+            "time": self.get_time_info(),
+            "statistics": self.display_statistics(),
+            "today_occupancy": self.display_today_occupancy(),
+            "progress": self.get_progress(),
+            "finished": finished,
+            "error": error
+        }
+
     def get_time_info(self) -> Tuple[str, str]:
         """
         Returns the current simulation time.
@@ -208,28 +526,94 @@ class ExperimentController:
 
     def goto_end(self) -> None:
         """
-        Advances the simulation to its end state by processing a batch of room requests that simulate
-        all remaining steps of the experiment. It calculates the remaining number of simulation steps based on
-        the current day and hour, generates a batch of requests for those remaining steps, processes them,
-        updates the occupancy, and sets the simulation time to the final day at 23:00 hours.
-        """
-        # Calculate the number of steps per day.
-        steps_per_day = ExperimentController.ONE_DAY // self.hour_per_step
-        # Calculate the total number of simulation steps.
-        total_steps = self.days * steps_per_day
-        # Calculate the number of steps that have been completed so far.
-        completed_steps = self.current_day * steps_per_day + (self.current_hour // self.hour_per_step)
-        # Determine the remaining number of steps.
-        remaining_steps = total_steps - completed_steps
-        # Calculate the minimum and maximum number of requests for the remaining steps.
-        remaining_min_requests = remaining_steps * self.request_num_per_step[0]
-        remaining_max_requests = remaining_steps * self.request_num_per_step[1]
-
-        # Generate a batch of requests covering the remaining simulation period.
-        self.requests = self.generate_requests(remaining_min_requests, remaining_max_requests)
-        # Process these requests using the Hotel instance, providing the current day.
-        self.request_results = self.hotel.process_requests(self.requests, self.current_day)
-
-        # Set simulation time to the final day at 23:00.
+        Advances the simulation to its end state by fast-forwarding through all remaining steps.
+        Every step draws, books and records exactly the same requests as 'step' would, so the final statistics
+        are identical to calling 'step' until it returns False. But instead of one RequestBatch, one statistics update
+        and one request flow log entry per step, the requests of many steps are sampled into one batch ('sample_steps'),
+        booked and added to the statistics by Hotel.process_steps, and runs of equal occupancy samples are recorded
+        in one call. Only the last step runs as a normal 'step', so its requests are kept for display and are the only
+        ones added to the request flow log. The simulation time is then set to the final day at 23:00.
+        When a trace is replayed or recorded, or the statistics record a time series, which all need every step
+        on its own, the steps before the last one are run one by one instead (still without logging).
+        """
+        remaining = self.count_remaining_steps()
+        if remaining == 0:
+            self.end_clock()
+            return
+
+        hotel = self.hotel
+        if self.trace_reader is None and self.trace_writer is None and hotel.statistics.time_series is None:
+            left = remaining - 1
+            while left:
+                batch, step_ends, days = self.sample_steps(left)
+                hotel.process_steps(batch, step_ends, days)
+                self.step_count += len(step_ends)
+                left -= len(step_ends)
+        else:
+            for _ in range(remaining - 1):
+                self.advance_clock()
+                hotel.process_batch(self.next_request_batch(), self.current_day)
+                self.step_count += 1
+
+        self.step()
+        self.end_clock()
+
+    def count_remaining_steps(self) -> int:
+        """
+        Counts the steps left until the simulation reaches its final day, i.e. how many more times 'step' returns True.
+
+        :return: The number of remaining steps.
+        """
+        hours_left = self.days * ExperimentController.ONE_DAY - 1 - (self.current_day * ExperimentController.ONE_DAY + self.current_hour)
+        return max(hours_left // self.hour_per_step, 0)
+
+    def sample_steps(self, steps: int) -> Tuple[RequestBatch, List[int], List[int]]:
+        """
+        Advances the clock by up to 'steps' steps and samples the requests of all of them into one RequestBatch,
+        drawing exactly the same random values as 'next_request_batch' would step by step. At most
+        FAST_FORWARD_REQUESTS requests are sampled at once, so memory does not grow with the number of steps.
+
+        The random words of all steps are drawn in one block that is large enough for the most requests the steps
+        can have, and are then split into the steps' request counts and request columns in the order the step-by-step
+        draws would use them. Afterwards the generator is rewound and advanced by exactly the words used, which leaves
+        it in the same state as step-by-step sampling (the generator yields the same stream of words however
+        it is split into calls).
+
+        :param steps: The maximum number of steps to sample.
+        :return: A tuple (batch, step_ends, days) as taken by Hotel.process_steps.
+        """
+        min_request_num, max_request_num = self.request_num_per_step
+        count_span = max_request_num - min_request_num + 1
+        steps = min(steps, max(ExperimentController.FAST_FORWARD_REQUESTS // max(max_request_num, 1), 1))
+
+        state = self.rng.getstate()
+        # Each step uses one word for its request count and three per request.
+        words = self.random_words(steps * (1 + 3 * max_request_num))
+        used = 0
+        type_words, duration_words, check_in_words = array("Q"), array("Q"), array("Q")
+        request_days: List[int] = []
+        step_ends: List[int] = []
+        days: List[int] = []
+
+        for _ in range(steps):
+            self.advance_clock()
+            req_num = min_request_num + ((words[used] * count_span) >> 64)
+            start = used + 1
+            used = start + 3 * req_num
+            type_words += words[start:start + req_num]
+            duration_words += words[start + req_num:start + 2 * req_num]
+            check_in_words += words[start + 2 * req_num:used]
+            request_days += [self.current_day] * req_num
+            step_ends.append(len(request_days))
+            days.append(self.current_day)
+
+        self.rng.setstate(state)
+        self.rng.randbytes(8 * used)
+        return RequestBatch(*self.map_request_words(type_words, duration_words, check_in_words, request_days)), step_ends, days
+
+    def end_clock(self) -> None:
+        """
+        Sets the simulation time to the final day at 23:00, where a finished experiment is displayed.
+        """
         self.current_day = self.days - 1
         self.current_hour = ExperimentController.ONE_DAY - 1
@@ -0,0 +1,290 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Model.MatrixHotel import MatrixHotel
+from Controller.ExperimentController import ExperimentController
+from Controller.ReplicationEngine import ReplicationEngine
+from Controller.EventSimulator import EventSimulator
+from Controller.TraceWriter import TraceWriter
+from Controller.TraceReader import TraceReader
+from Controller.PhaseProfiler import PhaseProfiler
+
+from typing import *
+
+# Hotel storage backends selectable from the command line.
+BACKENDS: Dict[str, Type[Hotel]] = {
+    "room": Hotel,
+    "matrix": MatrixHotel
+}
+
+# Command-line option names for the room count of each room type, in the order shown by InitWindow.
+ROOM_OPTIONS: Dict[RoomType, str] = {
+    RoomType.SINGLE: "single",
+    RoomType.SIMPLE_DOUBLE: "double",
+    RoomType.DOUBLE_WITH_SOFA: "double_sofa",
+    RoomType.HALF_LUX: "half_lux",
+    RoomType.LUX: "lux"
+}
+
+
+def check_valid_parameters(days: int, steps: int, rooms: Dict[RoomType, int], request_num: Tuple[int, int],
+                           large_scale: bool = False) -> Optional[str]:
+    """
+    Validates the experiment parameters against the same ranges InitWindow enforces,
+    or against the relaxed ranges of the large-scale mode.
+
+    :param days: Total days for the experiment.
+    :param steps: Hours per simulation step.
+    :param rooms: Dictionary mapping each room type to its count.
+    :param request_num: A tuple (min_request, max_request) of requests generated per step.
+    :param large_scale: If True, the large-scale ranges of ExperimentController apply.
+    :return: None if all parameters are valid; otherwise, a message describing the first invalid one.
+    """
+    ec = ExperimentController
+    if large_scale:
+        min_days, max_days, min_steps, max_steps = ec.LARGE_MIN_DAYS, ec.LARGE_MAX_DAYS, ec.LARGE_MIN_STEPS, ec.LARGE_MAX_STEPS
+        min_reqs, max_reqs, min_rooms, max_rooms = ec.LARGE_MIN_REQ, ec.LARGE_MAX_REQ, ec.LARGE_MIN_ROOM_NUM, ec.LARGE_MAX_ROOM_NUM
+    else:
+        min_days, max_days, min_steps, max_steps = ec.MIN_DAYS, ec.MAX_DAYS, ec.MIN_STEPS, ec.MAX_STEPS
+        min_reqs, max_reqs, min_rooms, max_rooms = ec.MIN_REQ, ec.MAX_REQ, ec.MIN_ROOM_NUM, ec.MAX_ROOM_NUM
+
+    if not min_days <= days <= max_days:
+        return f"days must be between {min_days} and {max_days}"
+    if not min_steps <= steps <= max_steps:
+        return f"hours per step must be between {min_steps} and {max_steps}"
+    min_req, max_req = request_num
+    # The GUI requires min < max; the large-scale mode also accepts a fixed number of requests per step.
+    if not (min_reqs <= min_req <= max_req <= max_reqs and (large_scale or min_req < max_req)):
+        return f"request range must satisfy {min_reqs} <= min {'<=' if large_scale else '<'} max <= {max_reqs}"
+    for room_type, numbers in rooms.items():
+        if not min_rooms <= numbers <= max_rooms:
+            return f"{ROOM_OPTIONS[room_type]} rooms must be between {min_rooms} and {max_rooms}"
+    if sum(rooms.values()) == 0:
+        return "the hotel must have at least one room"
+    return None
+
+
+def measure_hotel_build(rooms: Dict[RoomType, int], days: int, hotel_class: Type[Hotel] = Hotel) -> Dict[str, float]:
+    """
+    Measures how long Hotel.__init__ takes and how much memory it allocates at peak.
+    The time is taken from a build without tracing, because tracemalloc slows allocation down.
+
+    :param rooms: Dictionary mapping each room type to its count.
+    :param days: Total days for the experiment.
+    :param hotel_class: The Hotel implementation to build.
+    :return: A dictionary with keys 'rooms', 'build_seconds', 'peak_bytes' and 'bytes_per_room'.
+    """
+    start = time.perf_counter()
+    hotel = hotel_class(rooms, days)
+    build_seconds = time.perf_counter() - start
+    room_count = hotel.get_room_numbers()
+    del hotel
+
+    tracemalloc.start()
+    hotel = hotel_class(rooms, days)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rooms": room_count,
+        "build_seconds": build_seconds,
+        "peak_bytes": peak_bytes,
+        "bytes_per_room": peak_bytes / max(room_count, 1)
+    }
+
+
+def run_headless(days: int, steps: int, rooms: Dict[RoomType, int], request_num: Tuple[int, int],
+                 hotel_class: Type[Hotel] = Hotel, debug: bool = False, seed: Optional[int] = None,
+                 engine: str = "step", time_series_path: Optional[str] = None,
+                 estimators: bool = False, record_trace_path: Optional[str] = None,
+                 replay_trace_path: Optional[str] = None, profile: bool = False,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 0,
+                 resume_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs a whole experiment without a GUI, either by calling ExperimentController.step() until the simulation ends
+    or with the event-driven EventSimulator. Both engines give identical statistics for the same seed.
+
+    :param days: Total days for the experiment.
+    :param steps: Hours per simulation step.
+    :param rooms: Dictionary mapping each room type to its count.
+    :param request_num: A tuple (min_request, max_request) of requests generated per step.
+    :param hotel_class: The Hotel implementation used as the occupancy storage backend.
+    :param debug: If True, the hotel cross-checks its occupancy counters against a full scan on every query.
+    :param seed: Seed for the experiment's random number generator; None seeds it from system entropy.
+    :param engine: "step" for fixed-step simulation or "event" for the discrete-event engine.
+    :param time_series_path: If given, the per-step metrics are recorded and written to this file
+                             (CSV, .npz or raw binary, chosen by the extension).
+    :param estimators: If True, the streaming estimators of Statistics are added under the key 'estimators'.
+    :param record_trace_path: If given, the generated requests are recorded to this trace file.
+    :param replay_trace_path: If given, the requests are replayed from this trace file instead of being generated.
+    :param profile: If True, the wall time and call count of each phase are added under the key 'profile'.
+    :param checkpoint_path: If given, the experiment state is saved to this checkpoint file every 'checkpoint_every'
+                            steps and at the end (step engine only).
+    :param checkpoint_every: The number of steps between two checkpoints; 0 only saves at the end.
+    :param resume_path: If given, the experiment is resumed from this checkpoint file; its saved parameters
+                        replace the experiment parameters above.
+    :return: The final statistics as returned by ExperimentController.display_statistics().
+    """
+    controller = ExperimentController(log_requests=False)
+    if resume_path is not None:
+        controller.load_checkpoint(resume_path)
+    else:
+        controller.initialize_experiment(days, steps, rooms, request_num, hotel_class=hotel_class, debug=debug,
+                                         seed=seed, record_time_series=time_series_path is not None)
+    if record_trace_path is not None:
+        controller.record_trace(TraceWriter(record_trace_path, days, steps, ExperimentController.ONE_DAY))
+    if replay_trace_path is not None:
+        controller.replay_trace(TraceReader(replay_trace_path))
+    profiler = PhaseProfiler(controller).attach() if profile else None
+
+    try:
+        if engine == "event":
+            EventSimulator(controller).run()
+        else:
+            # Advance the simulation until step() reports that the final day has been reached.
+            while controller.step():
+                if checkpoint_path is not None and checkpoint_every and controller.step_count % checkpoint_every == 0:
+                    controller.save_checkpoint(checkpoint_path)
+            if checkpoint_path is not None:
+                controller.save_checkpoint(checkpoint_path)
+    finally:
+        for trace in (controller.trace_writer, controller.trace_reader):
+            if trace is not None:
+                trace.close()
+        if profiler is not None:
+            profiler.detach()
+
+    if time_series_path is not None and controller.hotel.statistics.time_series is not None:
+        controller.hotel.statistics.time_series.save(time_series_path)
+    statistics = controller.display_statistics()
+    if estimators:
+        statistics["estimators"] = controller.hotel.statistics.display_estimators()
+    if profiler is not None:
+        statistics["profile"] = profiler.report()
+    return statistics
+
+
+def format_statistics(statistics: Dict[str, Any], as_json: bool = False) -> str:
+    """
+    Formats the final statistics (or a replication summary) either as JSON or as one "name: value" line per statistic.
+
+    :param statistics: The statistics dictionary returned by display_statistics() or ReplicationEngine.summarize().
+    :param as_json: If True, the statistics are formatted as a JSON object.
+    :return: The formatted statistics.
+    """
+    if as_json:
+        return json.dumps(statistics, indent=2)
+    return "\n".join(f"{name}: {value}" for name, value in statistics.items())
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses and validates the command-line arguments of the headless runner.
+    The options mirror the fields of InitWindow and use the same default values.
+
+    :param argv: The argument list to parse; defaults to sys.argv[1:].
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Run the hotel reservation experiment without a GUI.")
+    parser.add_argument("--days", type=int, default=20,
+                        help=f"experiment duration in days ({ExperimentController.MIN_DAYS}-{ExperimentController.MAX_DAYS})")
+    parser.add_argument("--hours-per-step", type=int, default=3,
+                        help=f"hours per step ({ExperimentController.MIN_STEPS}-{ExperimentController.MAX_STEPS})")
+    parser.add_argument("--min-requests", type=int, default=3, help="minimum number of requests per step")
+    parser.add_argument("--max-requests", type=int, default=5, help="maximum number of requests per step")
+    for option in ROOM_OPTIONS.values():
+        parser.add_argument(f"--{option.replace('_', '-')}", dest=option, type=int, default=5,
+                            help=f"number of {option.replace('_', ' ')} rooms "
+                                 f"({ExperimentController.MIN_ROOM_NUM}-{ExperimentController.MAX_ROOM_NUM})")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="room", help="hotel occupancy storage backend")
+    parser.add_argument("--engine", choices=["step", "event"], default="step",
+                        help="fixed-step simulation or the discrete-event engine")
+    parser.add_argument("--large-scale", action="store_true",
+                        help="lift the GUI limits (up to tens of thousands of rooms and multi-year horizons)")
+    parser.add_argument("--build-report", action="store_true",
+                        help="also report the build time and peak memory of the hotel")
+    parser.add_argument("--debug", action="store_true", help="cross-check occupancy counters against full scans")
+    parser.add_argument("--seed", type=int, help="random seed (the master seed when running replications)")
+    parser.add_argument("--replications", type=int, default=1,
+                        help="number of independently seeded runs to summarize (mean, variance, confidence interval)")
+    parser.add_argument("--workers", type=int, help="worker processes for replications (default: one per CPU core)")
+    parser.add_argument("--estimators", action="store_true",
+                        help="also report occupancy variance, stay length and booking value percentiles, "
+                             "and per-room-type revenue, upgrades and rejections")
+    parser.add_argument("--profile", action="store_true",
+                        help="also report the wall time and call count of each simulation phase")
+    parser.add_argument("--record-trace", help="record the generated requests to this binary trace file")
+    parser.add_argument("--replay-trace", help="replay the requests of a recorded trace instead of generating them")
+    parser.add_argument("--time-series",
+                        help="record per-step metrics to this file (.csv, .npz, or raw binary with a .json header)")
+    parser.add_argument("--checkpoint", help="save the experiment state to this checkpoint file at the end of the run")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="also save the checkpoint every N steps, so that an interrupted run can be resumed")
+    parser.add_argument("--resume",
+                        help="resume the experiment saved in this checkpoint file (its parameters replace the options above)")
+    parser.add_argument("--json", action="store_true", help="write the statistics as JSON")
+    parser.add_argument("--output", "-o", help="write the statistics to this file instead of standard output")
+
+    args = parser.parse_args(argv)
+    args.rooms = {room_type: getattr(args, option) for room_type, option in ROOM_OPTIONS.items()}
+    args.request_num = (args.min_requests, args.max_requests)
+
+    error = check_valid_parameters(args.days, args.hours_per_step, args.rooms, args.request_num, args.large_scale)
+    if error is None and args.replications < 1:
+        error = "replications must be at least 1"
+    if error is None and (args.time_series or args.estimators or args.profile or args.record_trace or args.replay_trace) \
+            and args.replications > 1:
+        error = "--time-series, --estimators, --profile and traces apply to a single run and cannot be combined with replications"
+    if error is None and (args.checkpoint or args.resume) and (args.replications > 1 or args.engine != "step"):
+        error = "--checkpoint and --resume require a single run of the step engine"
+    if error is None and args.resume and (args.record_trace or args.replay_trace):
+        error = "traces cannot be combined with --resume"
+    if error is None and args.checkpoint_every < 0:
+        error = "--checkpoint-every must not be negative"
+    if error is not None:
+        parser.error(error)
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Entry point of the headless runner: runs one experiment (or a set of replications)
+    and prints or writes its final statistics.
+
+    :param argv: The argument list to parse; defaults to sys.argv[1:].
+    :return: The process exit code.
+    """
+    args = parse_arguments(argv)
+    if args.replications > 1:
+        engine = ReplicationEngine(args.days, args.hours_per_step, args.rooms, args.request_num,
+                                   hotel_class=BACKENDS[args.backend], workers=args.workers)
+        master_seed = args.seed if args.seed is not None else random.randrange(2 ** 64)
+        statistics = engine.run(args.replications, master_seed)
+    else:
+        statistics = run_headless(args.days, args.hours_per_step, args.rooms, args.request_num,
+                                  hotel_class=BACKENDS[args.backend], debug=args.debug, seed=args.seed,
+                                  engine=args.engine, time_series_path=args.time_series,
+                                  estimators=args.estimators, record_trace_path=args.record_trace,
+                                  replay_trace_path=args.replay_trace, profile=args.profile,
+                                  checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                                  resume_path=args.resume)
+    if args.build_report:
+        statistics["hotel_build"] = measure_hotel_build(args.rooms, args.days, BACKENDS[args.backend])
+    output = format_statistics(statistics, as_json=args.json)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import time
+
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+
+class PhaseProfiler:
+    """
+    Records wall time and call counts of the phases of an experiment: request generation, the availability
+    search and check-in of Hotel.process_requests / process_batch, the statistics update, and reporting.
+    While attached, the profiler replaces the instrumented methods of the controller, its hotel and the hotel's
+    statistics by timed wrappers on those instances; detaching removes the wrappers again. The experiment code
+    itself has no instrumentation points, so a controller without an attached profiler runs at full speed.
+
+    Phases nest (e.g. the statistics update runs inside a step), so every phase reports both its total time
+    and its self time, which excludes the time spent in nested phases. The self times add up to the total
+    time spent in instrumented code.
+
+    Usage:
+        with PhaseProfiler(controller) as profiler:
+            while controller.step():
+                pass
+        print(profiler.format_report())
+    """
+
+    # (owner attribute path, method name, phase name) of every instrumented method.
+    # The owner path is resolved from the controller; an empty path is the controller itself.
+    INSTRUMENTED: List[Tuple[str, str, str]] = [
+        ("", "step", "step"),
+        ("", "goto_end", "goto_end"),
+        ("", "next_request_batch", "request_generation"),
+        ("", "sample_steps", "request_generation"),
+        # Self time of the booking loop: checking in the rooms found by the availability search.
+        ("hotel", "book_batch", "check_in"),
+        ("hotel", "check_availability", "availability_search"),
+        ("hotel.statistics", "update", "statistics_update"),
+        ("hotel.statistics", "update_steps", "statistics_update"),
+        ("", "display_reservation_info", "display_reservation_info"),
+        ("", "display_today_occupancy", "display_today_occupancy")
+    ]
+
+    def __init__(self, controller: ExperimentController) -> None:
+        """
+        Creates a profiler for an initialized experiment. Call 'attach' (or use it as a context manager) to start.
+
+        :param controller: The ExperimentController whose experiment has already been initialized.
+        """
+        self.controller = controller
+        # Per phase: [call count, total seconds, self seconds].
+        self.phases: Dict[str, List[float]] = {}
+        # Time spent in nested phases of each active phase, innermost last.
+        self.child_seconds: List[float] = []
+        # (owner, method name) of every installed wrapper.
+        self.wrapped: List[Tuple[Any, str]] = []
+
+    def attach(self) -> "PhaseProfiler":
+        """
+        Installs the timed wrappers on the controller, its hotel and the hotel's statistics.
+
+        :return: The profiler itself.
+        """
+        for path, name, phase in PhaseProfiler.INSTRUMENTED:
+            owner = self.controller
+            for attribute in filter(None, path.split(".")):
+                owner = getattr(owner, attribute)
+            setattr(owner, name, self.timed(getattr(owner, name), phase))
+            self.wrapped.append((owner, name))
+        return self
+
+    def detach(self) -> None:
+        """
+        Removes the timed wrappers, restoring the original methods. The recorded numbers are kept.
+        """
+        for owner, name in reversed(self.wrapped):
+            delattr(owner, name)
+        self.wrapped = []
+
+    def timed(self, method: Callable[..., Any], phase: str) -> Callable[..., Any]:
+        """
+        Builds a wrapper that times each call of a bound method as one call of a phase.
+
+        :param method: The bound method to time.
+        :param phase: The name of the phase the calls are recorded under.
+        :return: The wrapper.
+        """
+        stats = self.phases.setdefault(phase, [0, 0.0, 0.0])
+        child_seconds = self.child_seconds
+        perf_counter = time.perf_counter
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            child_seconds.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] += elapsed - child_seconds.pop()
+                if child_seconds:
+                    # Charge this call to the enclosing phase as nested time.
+                    child_seconds[-1] += elapsed
+
+        return wrapper
+
+    def reset(self) -> None:
+        """
+        Clears the recorded numbers.
+        """
+        for stats in self.phases.values():
+            stats[:] = [0, 0.0, 0.0]
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the recorded numbers of every phase that was called.
+
+        :return: A dictionary mapping each phase to a dictionary with keys 'calls', 'seconds' (total time),
+                 'self_seconds' (time outside nested phases) and 'mean_seconds' (total time per call).
+        """
+        return {
+            phase: {
+                "calls": calls,
+                "seconds": seconds,
+                "self_seconds": self_seconds,
+                "mean_seconds": seconds / calls
+            }
+            for phase, (calls, seconds, self_seconds) in self.phases.items() if calls
+        }
+
+    def format_report(self) -> str:
+        """
+        Formats the report as a table sorted by self time, with each phase's share of the instrumented time.
+
+        :return: The formatted table.
+        """
+        report = self.report()
+        total = sum(stats["self_seconds"] for stats in report.values()) or 1.0
+        lines = [f"{'phase':<26}{'calls':>10}{'total s':>12}{'self s':>12}{'self %':>8}"]
+        for phase, stats in sorted(report.items(), key=lambda item: -item[1]["self_seconds"]):
+            lines.append(
+                f"{phase:<26}{stats['calls']:>10}{stats['seconds']:>12.4f}{stats['self_seconds']:>12.4f}"
+                f"{stats['self_seconds'] / total * 100:>7.1f}%"
+            )
+        return "\n".join(lines)
+
+    def __enter__(self) -> "PhaseProfiler":
+        return self.attach()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.detach()
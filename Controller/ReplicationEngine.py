@@ -0,0 +1,131 @@
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+
+def run_replicate(days: int, steps: int, rooms_info: Dict[RoomType, int], request_num_per_step: Tuple[int, int],
+                  hotel_class: Type[Hotel], seed: int) -> Dict[str, float]:
+    """
+    Runs one complete, independently seeded experiment and returns its final statistics.
+    Defined at module level so that it can be sent to worker processes.
+
+    :param days: Total number of days for the simulation.
+    :param steps: Number of hours that pass in one simulation step.
+    :param rooms_info: A dictionary mapping each RoomType to the number of rooms in the hotel.
+    :param request_num_per_step: A tuple (min_requests, max_requests) of requests generated per step.
+    :param hotel_class: The Hotel implementation used as the occupancy storage backend.
+    :param seed: Seed for the experiment's random number generator.
+    :return: The final statistics as returned by ExperimentController.display_statistics().
+    """
+    controller = ExperimentController(log_requests=False)
+    controller.initialize_experiment(days, steps, rooms_info, request_num_per_step, hotel_class=hotel_class, seed=seed)
+    while controller.step():
+        pass
+    return controller.display_statistics()
+
+
+class ReplicationEngine:
+    """
+    Runs many independently seeded replications of the same experiment across a process pool
+    and merges their final statistics into a mean, variance and confidence interval per metric.
+    """
+
+    def __init__(self, days: int, steps: int, rooms_info: Dict[RoomType, int], request_num_per_step: Tuple[int, int],
+                 hotel_class: Type[Hotel] = Hotel, workers: Optional[int] = None) -> None:
+        """
+        Stores the experiment configuration shared by all replications.
+
+        :param days: Total number of days for the simulation.
+        :param steps: Number of hours that pass in one simulation step.
+        :param rooms_info: A dictionary mapping each RoomType to the number of rooms in the hotel.
+        :param request_num_per_step: A tuple (min_requests, max_requests) of requests generated per step.
+        :param hotel_class: The Hotel implementation used as the occupancy storage backend.
+        :param workers: Number of worker processes; None uses one per CPU core.
+        """
+        self.days = days
+        self.steps = steps
+        self.rooms_info = rooms_info
+        self.request_num_per_step = request_num_per_step
+        self.hotel_class = hotel_class
+        self.workers = workers or os.cpu_count() or 1
+
+        # Final statistics of each replication from the last call to 'run', in seed order.
+        self.samples: List[Dict[str, float]] = []
+
+    @staticmethod
+    def derive_seeds(master_seed: int, replications: int) -> List[int]:
+        """
+        Derives one independent seed per replication from a master seed.
+        The same master seed always yields the same seeds, which makes a whole set of replications reproducible.
+
+        :param master_seed: The seed the replication seeds are derived from.
+        :param replications: The number of seeds to derive.
+        :return: A list of 64-bit seeds.
+        """
+        seed_generator = random.Random(master_seed)
+        return [seed_generator.getrandbits(64) for _ in range(replications)]
+
+    def run(self, replications: int, master_seed: int, confidence: float = 0.95) -> Dict[str, Dict[str, float]]:
+        """
+        Runs the replications in worker processes and summarizes their final statistics.
+        Results are collected in seed order, so the summary does not depend on how the work was scheduled.
+
+        :param replications: The number of independent experiments to run.
+        :param master_seed: The seed the replication seeds are derived from.
+        :param confidence: The confidence level of the reported intervals.
+        :return: The summary returned by 'summarize'.
+        """
+        seeds = ReplicationEngine.derive_seeds(master_seed, replications)
+        config = (self.days, self.steps, self.rooms_info, self.request_num_per_step, self.hotel_class)
+
+        if self.workers == 1:
+            # Avoid the process pool overhead when only one worker is requested.
+            self.samples = [run_replicate(*config, seed) for seed in seeds]
+        else:
+            # Hand each worker a few large chunks so that scheduling overhead stays small.
+            chunksize = max(1, math.ceil(replications / (self.workers * 4)))
+            columns = [[value] * replications for value in config]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self.samples = list(executor.map(run_replicate, *columns, seeds, chunksize=chunksize))
+
+        return ReplicationEngine.summarize(self.samples, confidence)
+
+    @staticmethod
+    def summarize(samples: List[Dict[str, float]], confidence: float = 0.95) -> Dict[str, Dict[str, float]]:
+        """
+        Merges the final statistics of several replications.
+        For every metric of Statistics.display_statistics() it reports the mean, the sample variance
+        and a normal-approximation confidence interval of the mean.
+
+        :param samples: The final statistics of each replication.
+        :param confidence: The confidence level of the reported intervals.
+        :return: A dictionary mapping each metric to a dictionary with keys 'mean', 'variance',
+                 'ci_low' and 'ci_high'.
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        if not samples:
+            return summary
+
+        # Two-sided critical value of the standard normal distribution for the requested confidence.
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        for metric in samples[0]:
+            values = [sample[metric] for sample in samples]
+            mean = statistics.fmean(values)
+            variance = statistics.variance(values, mean) if len(values) > 1 else 0.0
+            half_width = z * math.sqrt(variance / len(values))
+            summary[metric] = {
+                "mean": mean,
+                "variance": variance,
+                "ci_low": mean - half_width,
+                "ci_high": mean + half_width
+            }
+        return summary
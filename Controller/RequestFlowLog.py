@@ -0,0 +1,142 @@
+import threading
+from array import array
+from bisect import bisect_right
+
+from Model.RoomType import RoomType
+from Model.Request import Request
+from Model.Room import Room
+from Model.RequestBatch import RequestBatch
+
+from typing import *
+
+
+class RequestFlowLog:
+    """
+    The request flow of an experiment, kept as structured records and formatted only when shown.
+    Each step adds one block: a header row followed by one row per request (dummy NOT_A_ROOM requests
+    are not shown). A block only references the step's processed RequestBatch, so appending a step
+    builds no strings, and any row can be looked up in O(log steps) for a view that renders only
+    the rows currently visible.
+
+    Rows are numbered from the start of the experiment. Once the log holds more than 'max_rows' rows,
+    the oldest steps are dropped, so the first row number ('first_row') grows over time.
+    The log may be appended to by a worker thread while the GUI thread reads from it.
+    """
+
+    def __init__(self, max_rows: int = 100_000) -> None:
+        """
+        Initializes an empty log.
+
+        :param max_rows: The number of rows to keep; older steps are dropped beyond it.
+        """
+        self.max_rows = max_rows
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Removes all rows and restarts the row numbering.
+        """
+        with self.lock:
+            # Per step: its header text, its batch, and the batch indices of the shown requests.
+            self.blocks: List[Tuple[str, RequestBatch, array]] = []
+            # Row number of each block's header row.
+            self.block_starts: List[int] = []
+            # Row numbers of the first kept row and one past the last row.
+            self.first_row = 0
+            self.end_row = 0
+
+    def append(self, header: str, batch: RequestBatch) -> None:
+        """
+        Adds the requests of a processed step.
+
+        :param header: The text of the step's header row, e.g. its day and time.
+        :param batch: The step's RequestBatch, with its result columns filled in.
+        """
+        shown = array("q", [i for i, room_type in enumerate(batch.room_types) if room_type != RoomType.NOT_A_ROOM])
+        with self.lock:
+            self.blocks.append((header, batch, shown))
+            self.block_starts.append(self.end_row)
+            self.end_row += 1 + len(shown)
+
+            # Drop the oldest steps while the remaining ones still hold at least max_rows rows.
+            dropped = 0
+            while len(self.blocks) - dropped > 1 and self.end_row - self.block_starts[dropped + 1] >= self.max_rows:
+                dropped += 1
+            if dropped:
+                del self.blocks[:dropped]
+                del self.block_starts[:dropped]
+                self.first_row = self.block_starts[0]
+
+    def get_records(self, first: int, count: int) -> List[Dict[str, Any]]:
+        """
+        Returns the structured records of up to 'count' rows starting at row 'first'.
+        A header row is {'header': text}; a request row has the keys 'room_type', 'check_in_date',
+        'check_out_date', 'room_id' (-1 if not booked), 'cost' and 'reserved_type'.
+
+        :param first: The row number of the first row (clamped to the kept rows).
+        :param count: The maximum number of rows.
+        :return: The records, in row order.
+        """
+        records: List[Dict[str, Any]] = []
+        with self.lock:
+            row = max(first, self.first_row)
+            end = min(row + max(count, 0), self.end_row)
+            block = bisect_right(self.block_starts, row) - 1
+            while row < end:
+                header, batch, shown = self.blocks[block]
+                offset = row - self.block_starts[block]
+                if offset == 0:
+                    records.append({"header": header})
+                    offset, row = 1, row + 1
+                for i in shown[offset - 1:offset - 1 + end - row]:
+                    records.append({
+                        "room_type": batch.room_types[i],
+                        "check_in_date": batch.check_in_dates[i],
+                        "check_out_date": batch.check_out_dates[i],
+                        "room_id": batch.room_ids[i],
+                        "cost": batch.costs[i],
+                        "reserved_type": batch.reserved_types[i]
+                    })
+                    row += 1
+                block += 1
+        return records
+
+    def get_lines(self, first: int, count: int) -> List[str]:
+        """
+        Returns the formatted text of up to 'count' rows starting at row 'first'.
+
+        :param first: The row number of the first row (clamped to the kept rows).
+        :param count: The maximum number of rows.
+        :return: One line (without newline) per row.
+        """
+        return [
+            record["header"] if "header" in record else RequestFlowLog.format_request(
+                record["room_type"], record["check_in_date"], record["check_out_date"],
+                record["room_id"], record["cost"], record["reserved_type"])
+            for record in self.get_records(first, count)
+        ]
+
+    @staticmethod
+    def format_request(room_type: RoomType, check_in_date: int, check_out_date: int,
+                       room_id: int, cost: int, reserved_type: RoomType) -> str:
+        """
+        Formats one request and its result as a line of the request flow.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index.
+        :param check_out_date: The check-out day index.
+        :param room_id: The ID of the booked room, or -1 if no room was booked.
+        :param cost: The cost of the booking.
+        :param reserved_type: The RoomType of the booked room.
+        :return: The line, without a trailing newline.
+        """
+        room_name = Request.names_to_display[room_type]
+        if room_id < 0:
+            return f"-/ Wanted : {room_name} / In : {check_in_date} / Out : {check_out_date}"
+        line = (
+            f"+/ Id : {room_id} / Wanted : {room_name} / "
+            f"Reserved : {Room.names_to_display[reserved_type]} / In {check_in_date} / Out {check_out_date} / Cost {cost}"
+        )
+        # If the reserved room type is different from the requested type, note a discount.
+        return line + "/ Discounted(70%)" if room_type != reserved_type else line
@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+
+from Controller.ExperimentController import ExperimentController
+
+from typing import *
+
+
+class SimulationWorker(threading.Thread):
+    """
+    Drives an ExperimentController step by step in a background thread, so that a GUI stays responsive
+    during long runs. Progress is posted as snapshots (see ExperimentController.snapshot) to a queue.
+    A snapshot is taken at most once per frame interval: steps that finish in between are folded into
+    the next snapshot instead of each being posted. The final snapshot of a run is always posted,
+    also when a step raises an error; the error is then described in the snapshot's 'error' field.
+
+    In fast-forward mode the remaining steps are run by one call to ExperimentController.goto_end instead;
+    such a run cannot be paused or cancelled and only posts its final snapshot.
+
+    While the worker is running, the controller must only be accessed through the posted snapshots.
+    """
+
+    def __init__(self, controller: ExperimentController, snapshots: "queue.Queue[Dict[str, Any]]",
+                 frame_interval: float = 1 / 30, step_delay: float = 0.0, fast_forward: bool = False) -> None:
+        """
+        Prepares the worker; call 'start' to begin running.
+
+        :param controller: The ExperimentController whose experiment has already been initialized.
+        :param snapshots: The queue the snapshots are posted to.
+        :param frame_interval: The minimum time between two posted snapshots, in seconds.
+        :param step_delay: The time to wait after each step, in seconds (0 runs as fast as possible).
+        :param fast_forward: If True, run the experiment to its end with ExperimentController.goto_end.
+        """
+        super().__init__(daemon=True)
+        self.controller = controller
+        self.snapshots = snapshots
+        self.frame_interval = frame_interval
+        self.step_delay = step_delay
+        self.fast_forward = fast_forward
+
+        # Set while the worker may run; cleared to pause it.
+        self.resumed = threading.Event()
+        self.resumed.set()
+        # Set to stop the worker after the current step.
+        self.cancelled = threading.Event()
+
+    def pause(self) -> None:
+        """
+        Pauses the worker after the current step.
+        """
+        self.resumed.clear()
+
+    def resume(self) -> None:
+        """
+        Resumes a paused worker.
+        """
+        self.resumed.set()
+
+    def is_paused(self) -> bool:
+        """
+        Determines whether the worker is paused.
+
+        :return: True if the worker is paused; otherwise, False.
+        """
+        return not self.resumed.is_set()
+
+    def cancel(self) -> None:
+        """
+        Stops the worker after the current step, leaving the experiment where it is.
+        The last state is posted as a snapshot.
+        """
+        self.cancelled.set()
+        # Wake a paused worker up so that it can stop.
+        self.resumed.set()
+
+    def run(self) -> None:
+        """
+        Steps the experiment until it ends, the worker is cancelled or a step raises an error,
+        posting snapshots along the way.
+        """
+        controller = self.controller
+        finished = False
+        error = None
+        try:
+            if self.fast_forward:
+                controller.goto_end()
+                finished = True
+            else:
+                finished = self.run_steps()
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}"
+        finally:
+            self.snapshots.put(self.final_snapshot(finished, error))
+
+    def run_steps(self) -> bool:
+        """
+        Steps the experiment until it ends or the worker is cancelled, posting a snapshot at most once per frame interval.
+
+        :return: True if the experiment has reached its end; False if the worker was cancelled.
+        """
+        controller = self.controller
+        last_post = time.perf_counter()
+        while not self.cancelled.is_set():
+            self.resumed.wait()
+            if self.cancelled.is_set():
+                break
+            if not controller.step():
+                return True
+            now = time.perf_counter()
+            if now - last_post >= self.frame_interval:
+                self.snapshots.put(controller.snapshot())
+                last_post = now
+            if self.step_delay:
+                # Sleep on the cancel event, so that cancelling does not wait for the delay to pass.
+                self.cancelled.wait(self.step_delay)
+        return False
+
+    def final_snapshot(self, finished: bool, error: Optional[str]) -> Dict[str, Any]:
+        """
+        Takes the last snapshot of a run. If the experiment cannot even be described after an error,
+        the snapshot only holds the keys 'finished' and 'error'.
+
+        :param finished: True if the experiment has reached its end.
+        :param error: A description of the error that stopped the run, if any.
+        :return: The snapshot.
+        """
+        try:
+            return self.controller.snapshot(finished=finished, error=error)
+        except Exception as exception:
+            return {"finished": finished, "error": error or f"{type(exception).__name__}: {exception}"}
@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Controller.ReplicationEngine import run_replicate
+
+from typing import *
+
+# A sweep configuration in its JSON form, e.g.
+# {"days": 20, "hour_per_step": 3, "rooms_info": {"SINGLE": 5, ...}, "request_num_per_step": [3, 5]}
+Config = Dict[str, Any]
+
+
+class SweepRunner:
+    """
+    Runs a parameter sweep over experiment configurations and seeds across worker processes.
+    Every (configuration, seed) cell is stored in an on-disk cache keyed by a hash of the configuration,
+    the seed and the hotel backend, so re-running an overlapping sweep only computes the cells that are missing.
+    """
+
+    # Version of the simulation results, hashed into every cache key. Increase it whenever a change makes
+    # the results of a (configuration, seed) cell differ from before (e.g. a different random stream or
+    # different booking rules), so that results cached by older code are never returned.
+    RESULTS_VERSION = 1
+
+    def __init__(self, cache_dir: str, hotel_class: Type[Hotel] = Hotel, workers: Optional[int] = None) -> None:
+        """
+        Initializes the sweep runner and creates the cache directory if needed.
+
+        :param cache_dir: Directory holding one JSON result file per computed cell.
+        :param hotel_class: The Hotel implementation used as the occupancy storage backend.
+        :param workers: Number of worker processes; None uses one per CPU core.
+        """
+        self.cache_dir = cache_dir
+        self.hotel_class = hotel_class
+        self.workers = workers or os.cpu_count() or 1
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def expand_grid(days: List[int], hour_per_step: List[int], rooms_info: List[Dict[str, int]],
+                    request_num_per_step: List[Tuple[int, int]]) -> List[Config]:
+        """
+        Expands lists of parameter values into every combination of them.
+
+        :param days: Values for the total number of simulation days.
+        :param hour_per_step: Values for the number of hours per simulation step.
+        :param rooms_info: Room mixes, each mapping a RoomType name (e.g. "SINGLE") to a room count.
+        :param request_num_per_step: (min_requests, max_requests) ranges.
+        :return: A list of configurations, one per combination.
+        """
+        return [
+            {"days": d, "hour_per_step": h, "rooms_info": dict(r), "request_num_per_step": list(n)}
+            for d, h, r, n in itertools.product(days, hour_per_step, rooms_info, request_num_per_step)
+        ]
+
+    @staticmethod
+    def cache_key(config: Config, seed: int, backend: str = Hotel.__name__) -> str:
+        """
+        Computes the cache key of one sweep cell from its configuration, its seed, the hotel backend
+        and RESULTS_VERSION. The configuration is serialized canonically, so equal configurations always share a key.
+        The room mix keeps its order, because the order of room types decides room IDs and the upgrade order.
+
+        :param config: The experiment configuration.
+        :param seed: The seed of the run.
+        :param backend: The class name of the Hotel implementation the cell is run with.
+        :return: A hexadecimal SHA-256 digest.
+        """
+        canonical_config = dict(config, rooms_info=list(config["rooms_info"].items()))
+        canonical = json.dumps({"config": canonical_config, "seed": seed, "backend": backend,
+                                "version": SweepRunner.RESULTS_VERSION}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def cache_path(self, key: str) -> str:
+        """
+        Returns the path of the cache file for a key.
+
+        :param key: The cache key of a sweep cell.
+        :return: The path of the JSON result file.
+        """
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads a cached cell result.
+
+        :param key: The cache key of a sweep cell.
+        :return: The stored record, or None if the cell has not been computed yet.
+        """
+        try:
+            with open(self.cache_path(key), encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def store(self, key: str, record: Dict[str, Any]) -> None:
+        """
+        Writes a cell result to the cache. The file is written under a temporary name and then renamed,
+        so an interrupted sweep never leaves a partially written result behind.
+
+        :param key: The cache key of the sweep cell.
+        :param record: The record to store.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(record, file)
+        os.replace(temp_path, self.cache_path(key))
+
+    def run(self, configs: List[Config], seeds: List[int]) -> List[Dict[str, Any]]:
+        """
+        Runs every (configuration, seed) cell that is not cached yet and returns the records of all cells.
+        Each result is stored as soon as its worker finishes, so an interrupted sweep keeps its progress.
+
+        :param configs: The configurations to sweep.
+        :param seeds: The seeds to run for every configuration.
+        :return: One record per cell, in configuration-then-seed order, with keys 'config', 'seed',
+                 'statistics' and 'cached' (True if the result came from the cache).
+        """
+        backend = self.hotel_class.__name__
+        cells = [(config, seed, SweepRunner.cache_key(config, seed, backend)) for config in configs for seed in seeds]
+        records: Dict[str, Dict[str, Any]] = {}
+        missing: Dict[str, Tuple[Config, int]] = {}
+
+        # Take every cell already in the cache; the rest (each distinct cell once) have to be computed.
+        for config, seed, key in cells:
+            record = self.load(key)
+            if record is None:
+                missing[key] = (config, seed)
+            else:
+                records[key] = dict(record, cached=True)
+
+        if missing:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = {
+                    executor.submit(run_replicate, *SweepRunner.to_arguments(config), self.hotel_class, seed): (config, seed, key)
+                    for key, (config, seed) in missing.items()
+                }
+                for future in as_completed(futures):
+                    config, seed, key = futures[future]
+                    record = {"config": config, "seed": seed, "statistics": future.result()}
+                    self.store(key, record)
+                    records[key] = dict(record, cached=False)
+
+        return [records[key] for _, _, key in cells]
+
+    @staticmethod
+    def to_arguments(config: Config) -> Tuple[int, int, Dict[RoomType, int], Tuple[int, int]]:
+        """
+        Converts a JSON configuration into the arguments of ExperimentController.initialize_experiment.
+
+        :param config: The experiment configuration.
+        :return: A tuple (days, steps, rooms_info, request_num_per_step).
+        """
+        rooms_info = {RoomType[name]: numbers for name, numbers in config["rooms_info"].items()}
+        return config["days"], config["hour_per_step"], rooms_info, tuple(config["request_num_per_step"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs a sweep described by a JSON specification file and prints the records of all cells as JSON.
+    The specification either lists its configurations explicitly under "configurations", or gives
+    lists of values under "days", "hour_per_step", "rooms_info" and "request_num_per_step" to expand as a grid.
+    Seeds are given under "seeds".
+
+    :param argv: The argument list to parse; defaults to sys.argv[1:].
+    :return: The process exit code.
+    """
+    parser = argparse.ArgumentParser(description="Run a cached parameter sweep of the hotel reservation experiment.")
+    parser.add_argument("spec", help="JSON sweep specification")
+    parser.add_argument("--cache-dir", default=".sweep_cache", help="directory of the result cache")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU core)")
+    args = parser.parse_args(argv)
+
+    with open(args.spec, encoding="utf-8") as file:
+        spec = json.load(file)
+    if "configurations" in spec:
+        configs = spec["configurations"]
+    else:
+        configs = SweepRunner.expand_grid(spec["days"], spec["hour_per_step"], spec["rooms_info"], spec["request_num_per_step"])
+
+    runner = SweepRunner(args.cache_dir, workers=args.workers)
+    records = runner.run(configs, spec.get("seeds", [0]))
+    print(json.dumps(records, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
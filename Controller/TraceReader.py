@@ -0,0 +1,121 @@
+import mmap
+import sys
+from array import array
+
+from Model.RoomType import RoomType
+from Model.RequestBatch import RequestBatch
+from Controller.TraceWriter import TraceWriter
+
+from typing import *
+
+
+class TraceReader:
+    """
+    Replays a request trace written by TraceWriter through a memory map.
+    Each step's requests are copied straight from the mapped file into a RequestBatch,
+    so replaying a workload skips random number generation and per-request parsing.
+    """
+
+    # RoomType of each stored type byte.
+    ROOM_TYPES: Dict[int, RoomType] = {room_type.value: room_type for room_type in RoomType}
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens and maps a trace file and reads its header.
+
+        :param path: The path of the trace file.
+        :raises ValueError: If the file is not a request trace of a supported version.
+        """
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped.
+            self.file.close()
+            raise ValueError(f"{path} is not a request trace")
+
+        header = TraceWriter.FILE_HEADER
+        if len(self.map) < header.size:
+            self.close()
+            raise ValueError(f"{path} is not a request trace")
+        magic, version, self.days, self.hour_per_step, _ = header.unpack_from(self.map, 0)
+        if magic != TraceWriter.MAGIC or version != TraceWriter.VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a request trace of version {TraceWriter.VERSION}")
+
+        # Offset of the next unread block.
+        self.offset = header.size
+        # (day, hour) of the next unread block, or None at the end of the trace.
+        self.next_time: Optional[Tuple[int, int]] = None
+        self.peek()
+
+    def peek(self) -> None:
+        """
+        Reads the day and hour of the next unread block into 'next_time'.
+        """
+        if self.offset + TraceWriter.BLOCK_HEADER.size <= len(self.map):
+            _, day, hour, _ = TraceWriter.BLOCK_HEADER.unpack_from(self.map, self.offset)
+            self.next_time = (day, hour)
+        else:
+            self.next_time = None
+
+    def check_experiment(self, days: int, hour_per_step: int) -> None:
+        """
+        Checks that the trace was recorded for an experiment with the same length and step size.
+
+        :param days: Total number of days of the replaying experiment.
+        :param hour_per_step: Number of hours per step of the replaying experiment.
+        :raises ValueError: If the trace was recorded with different parameters.
+        """
+        if (days, hour_per_step) != (self.days, self.hour_per_step):
+            raise ValueError(
+                f"the trace was recorded for {self.days} days with {self.hour_per_step} hours per step, "
+                f"not {days} days with {hour_per_step} hours per step"
+            )
+
+    def read_step(self, day: int, hour: int) -> RequestBatch:
+        """
+        Returns the requests of the step at the given day and hour.
+
+        :param day: The simulation day of the step.
+        :param hour: The simulation hour of the step.
+        :return: The step's requests, or an empty batch if the trace has none at that time.
+        :raises ValueError: If the trace has requests at an earlier time that were never read.
+        """
+        if self.next_time != (day, hour):
+            if self.next_time is not None and self.next_time < (day, hour):
+                raise ValueError(f"the trace has unread requests at day {self.next_time[0]}, hour {self.next_time[1]}")
+            return RequestBatch([], [], [])
+
+        mapped, offset = self.map, self.offset
+        _, _, _, count = TraceWriter.BLOCK_HEADER.unpack_from(mapped, offset)
+        offset += TraceWriter.BLOCK_HEADER.size
+        room_types = TraceReader.ROOM_TYPES
+        types = [room_types[value] for value in mapped[offset:offset + count]]
+        offset += count + (-count % 4)
+
+        check_ins, check_outs = array("i"), array("i")
+        check_ins.frombytes(mapped[offset:offset + 4 * count])
+        offset += 4 * count
+        check_outs.frombytes(mapped[offset:offset + 4 * count])
+        offset += 4 * count
+        if sys.byteorder == "big":
+            check_ins.byteswap()
+            check_outs.byteswap()
+
+        self.offset = offset
+        self.peek()
+        return RequestBatch(types, check_ins, check_outs)
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the trace file.
+        """
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,82 @@
+import struct
+import sys
+from array import array
+
+from Model.RequestBatch import RequestBatch
+
+from typing import *
+
+
+class TraceWriter:
+    """
+    Records the requests generated at each simulation step into a compact binary trace file,
+    which TraceReader can replay later to run different hotels on exactly the same workload.
+
+    File layout (all integers little-endian):
+    - a file header: magic b"HRTRACE1", format version, days and hours per step of the experiment;
+    - one block per step that generated requests: a block header (step, day, hour, request count),
+      then the columns of the step's requests: one byte per room type (RoomType value), padded to
+      4 bytes, followed by the int32 check-in dates and the int32 check-out dates.
+    Steps without requests are not stored, since their day and hour are implied by the other steps.
+    """
+
+    MAGIC = b"HRTRACE1"
+    VERSION = 1
+    # magic, version, days, hours per step, reserved
+    FILE_HEADER = struct.Struct("<8sIIII")
+    # step, day, hour, request count
+    BLOCK_HEADER = struct.Struct("<IIII")
+
+    def __init__(self, path: str, days: int, hour_per_step: int, one_day: int) -> None:
+        """
+        Creates the trace file and writes its header.
+
+        :param path: The path of the trace file.
+        :param days: Total number of days of the recorded experiment.
+        :param hour_per_step: Number of hours per step of the recorded experiment.
+        :param one_day: Length of a simulation day in hours (ExperimentController.ONE_DAY), used to number the steps.
+        """
+        self.hour_per_step = hour_per_step
+        self.one_day = one_day
+        self.file = open(path, "wb")
+        self.file.write(TraceWriter.FILE_HEADER.pack(TraceWriter.MAGIC, TraceWriter.VERSION, days, hour_per_step, 0))
+        # Number of recorded requests.
+        self.request_count = 0
+
+    def write_step(self, day: int, hour: int, batch: RequestBatch) -> None:
+        """
+        Appends the requests of one step to the trace.
+
+        :param day: The simulation day of the step.
+        :param hour: The simulation hour of the step.
+        :param batch: The requests generated at the step.
+        """
+        count = len(batch)
+        if count == 0:
+            return
+        # Index of the step: the hours since the start of day 0 divided by the step length.
+        step = (day * self.one_day + hour) // self.hour_per_step
+        types = bytes(room_type.value for room_type in batch.room_types)
+        check_ins, check_outs = array("i", batch.check_in_dates), array("i", batch.check_out_dates)
+        if sys.byteorder == "big":
+            check_ins.byteswap()
+            check_outs.byteswap()
+
+        write = self.file.write
+        write(TraceWriter.BLOCK_HEADER.pack(step, day, hour, count))
+        write(types + bytes(-count % 4))
+        write(check_ins.tobytes())
+        write(check_outs.tobytes())
+        self.request_count += count
+
+    def close(self) -> None:
+        """
+        Flushes and closes the trace file.
+        """
+        self.file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,40 @@
+from Model.Room import Room
+from Model.RejectionReason import RejectionReason
+from typing import NamedTuple, Optional, Dict
+
+class BookingResult(NamedTuple):
+    """
+    The outcome of a single room request: the cost and the booked Room, or the reason the request was rejected.
+    Rejected results are shared, immutable instances (one per RejectionReason, see 'rejected'),
+    so a rejection allocates nothing.
+    """
+    # The cost of the stay, or -1 if the request was rejected.
+    cost: int
+    # The booked Room, or the shared dummy Room (Room.DUMMY) if the request was rejected.
+    room: Room
+    # Why the request was rejected, or None if a room was booked.
+    reason: Optional[RejectionReason] = None
+
+    def is_booked(self) -> bool:
+        """
+        Determines whether a room was booked.
+
+        :return: True if a room was booked; otherwise, False.
+        """
+        return self.reason is None
+
+    @staticmethod
+    def rejected(reason: RejectionReason) -> "BookingResult":
+        """
+        Returns the shared result of a request rejected for the given reason.
+
+        :param reason: The RejectionReason.
+        :return: The shared BookingResult (cost -1, Room.DUMMY, reason).
+        """
+        return REJECTED_RESULTS[reason]
+
+
+# One shared rejected result per reason.
+REJECTED_RESULTS: Dict[RejectionReason, BookingResult] = {
+    reason: BookingResult(-1, Room.DUMMY, reason) for reason in RejectionReason
+}
@@ -1,102 +1,518 @@
 from Model.Room import Room
 from Model.Request import Request
+from Model.RequestBatch import RequestBatch
+from Model.BookingResult import BookingResult
+from Model.RejectionReason import RejectionReason
 from Model.RoomType import RoomType
 from Model.Statistics import Statistics
+from Model.OccupancyCounter import OccupancyCounter
 
+import copy
+import threading
 from collections import defaultdict
-from typing import Dict, List, Tuple, DefaultDict
+from typing import Dict, List, Tuple, DefaultDict, Iterable, Optional, ClassVar, Set, Self
 
 class Hotel:
     """
     Represents a hotel that manages a collection of Room objects and processes room requests.
     """
 
-    def __init__(self, rooms_info: Dict[RoomType, int], days: int) -> None:
+    # The shared (cost, Room) result of a request that could not be booked, so that a rejection allocates nothing.
+    REJECTED: ClassVar[Tuple[int, Room]] = (-1, Room.DUMMY)
+
+    def __init__(self, rooms_info: Dict[RoomType, int], days: int, debug: bool = False) -> None:
         """
         Initializes the Hotel with room configuration and the total number of days for tracking occupancy.
 
         :param rooms_info: A dictionary mapping each RoomType to the count of rooms of that type.
         :param days: The total number of days for which occupancy data is maintained.
+        :param debug: If True, occupancy counters are cross-checked against a full scan on every query.
         """
         self.rooms: List[Room] = []          # List to store Room objects.
         self.rooms_info: Dict[RoomType, int] = rooms_info
+        self.days: int = days
+        self.debug: bool = debug
+        # Per-day and per-(day, RoomType) occupancy counts, updated by Room.check_in.
+        self.occupancy_counter: OccupancyCounter = OccupancyCounter(
+            days, [room_type for room_type, numbers in rooms_info.items() if numbers > 0],
+            {room_type: numbers for room_type, numbers in rooms_info.items() if numbers > 0}
+        )
+        # Index of Room objects grouped by RoomType, in the same order as they appear in self.rooms.
+        self.rooms_by_type: Dict[RoomType, List[Room]] = {}
+        # Position in self.rooms of the first room of each RoomType.
+        self.type_offsets: Dict[RoomType, int] = {}
         
         c = 0
         # Create Room objects for each room type based on the provided counts.
         # 'c' is used as the starting ID for each room; after processing one type,
         # it is incremented by the number of rooms created plus one to leave a gap between IDs.
         for room_type, numbers in rooms_info.items():
+            rooms_of_type = self.rooms_by_type.setdefault(room_type, [])
+            self.type_offsets[room_type] = len(self.rooms)
             for i in range(c, c + numbers):
-                self.rooms.append(Room(i, room_type, days))
+                room = self.create_room(i, room_type, days)
+                self.rooms.append(room)
+                rooms_of_type.append(room)
             c = c + numbers + 1  # Update the room ID counter with an extra gap.
 
+        # For each room type, the higher room types that may serve as an upgrade,
+        # listed in the order their rooms appear in self.rooms.
+        self.upgrade_order: Dict[RoomType, List[RoomType]] = {
+            room_type: [other for other in self.rooms_by_type if room_type < other]
+            for room_type in RoomType
+        }
+        # For each room type, the types that can serve a request for it (the type itself, then its upgrades),
+        # restricted to the types that have rooms.
+        self.candidate_types: Dict[RoomType, List[RoomType]] = {
+            room_type: [other for other in [room_type] + self.upgrade_order[room_type] if self.rooms_by_type.get(other)]
+            for room_type in RoomType
+        }
+
+        # Index of Room objects by their ID, used to resolve the room IDs stored in a RequestBatch.
+        self.rooms_by_id: Dict[int, Room] = {room.id: room for room in self.rooms}
+
         # Initialize the Statistics instance with the total number of rooms.
         self.statistics: Statistics = Statistics(len(self.rooms))
 
+        # One lock per RoomType, held by 'reserve_concurrent' while it searches and checks in rooms of that type.
+        self.type_locks: Dict[RoomType, threading.Lock] = {room_type: threading.Lock() for room_type in self.rooms_by_type}
+        # Guards the room lists and the ID index while a shared room is replaced by a private copy.
+        self.room_index_lock = threading.Lock()
+
+        # Copy-on-write state set up by 'fork'. While copy_on_write is True, the Room objects may be shared
+        # with other hotels, so a room is copied before its first check-in; owned_room_ids holds the IDs of
+        # the rooms this hotel has already copied, and owns_room_index tells whether the room lists and
+        # the ID index are this hotel's own or still shared.
+        self.copy_on_write: bool = False
+        self.owned_room_ids: Set[int] = set()
+        self.owns_room_index: bool = True
+
+    def create_room(self, id: int, room_type: RoomType, days: int) -> Room:
+        """
+        Creates a single Room object for the hotel. Subclasses may override this to change
+        how the occupancy schedule of each room is stored.
+
+        :param id: The unique identifier for the room.
+        :param room_type: The RoomType of the room.
+        :param days: The total number of days to track occupancy for the room.
+        :return: The newly created Room.
+        """
+        return Room(id, room_type, days, self.occupancy_counter)
+
     def process_request(self, req: Request) -> Tuple[int, Room]:
         """
         Processes a single room request.
         It attempts to find an available room of the requested type and date range.
-        If found, the room is checked in for the given period; otherwise, a dummy room is returned.
+        If found, the room is checked in for the given period; otherwise, the shared dummy room is returned.
 
         :param req: A Request object containing the room type, check-in date, and check-out date.
         :return: A tuple (cost, Room) where cost is the cost for the stay if successful,
-                 and Room is either the assigned room or a dummy Room (with NOT_A_ROOM type) if no room is available.
+                 and Room is either the assigned room or the shared dummy Room.DUMMY if no room is available.
+        """
+        return self.reserve(*req.get_request_info())
+
+    def reserve(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> Tuple[int, Room]:
+        """
+        Books a room for the given room type and date range without wrapping the request into a Request object.
+        Behaves exactly like process_request.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: A tuple (cost, Room) as returned by process_request.
         """
-        room_type, check_in_date, check_out_date = req.get_request_info()
         cost, room = self.check_availability(room_type, check_in_date, check_out_date)
         
         if cost > -1:
             # If a valid room is found, check the room in and return the cost and the room.
+            if self.copy_on_write and room.id not in self.owned_room_ids:
+                room = self.copy_room(room)
             return (cost, room.check_in(check_in_date, check_out_date))
         else:
-            # Otherwise, return a dummy room indicating no available room was found.
-            return (-1, Room(-1, RoomType.NOT_A_ROOM, -1))
+            # Otherwise, return the shared dummy room indicating no available room was found.
+            return Hotel.REJECTED
+
+    def try_reserve(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> BookingResult:
+        """
+        Books a room like reserve, but reports the outcome as a BookingResult,
+        which tells why a request was rejected. Rejected results are shared instances.
+        Requests outside the simulated days are rejected without searching for a room.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: The BookingResult of the request.
+        """
+        if not self.is_within_horizon(room_type, check_in_date, check_out_date):
+            return BookingResult.rejected(RejectionReason.OUT_OF_HORIZON)
+        cost, room = self.reserve(room_type, check_in_date, check_out_date)
+        if cost > -1:
+            return BookingResult(cost, room)
+        return BookingResult.rejected(self.get_rejection_reason(room_type, check_in_date, check_out_date))
+
+    def reserve_concurrent(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> BookingResult:
+        """
+        Books a room like try_reserve and records the result in the statistics, safely for concurrent callers.
+        Requests for different room types proceed in parallel: each room type is searched and checked in
+        under its own lock, so no two bookings can take the same room for overlapping days.
+
+        An upgrade only locks the higher type it books. Releasing the requested type's lock before trying
+        the upgrades is safe because occupancy only grows: a type with no free room for the range never gets
+        one later, so the result is the same as if all types had been searched atomically. Each call holds
+        at most one type lock at a time, so callers cannot deadlock.
+
+        The other booking methods (reserve, process_request, process_batch, ...) are not thread-safe
+        and must not run concurrently with this one.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: The BookingResult of the request.
+        """
+        result = None
+        if self.is_within_horizon(room_type, check_in_date, check_out_date):
+            mask = Room.range_mask(check_in_date, min(check_out_date, self.days))
+            full_days = self.occupancy_counter.full_days_by_type
+            for candidate_type in [room_type] + self.upgrade_order[room_type]:
+                if not self.rooms_by_type.get(candidate_type):
+                    continue
+                with self.type_locks[candidate_type]:
+                    if full_days.get(candidate_type, 0) & mask:
+                        continue
+                    # Read the room list under the lock, since a copy-on-write may have replaced it.
+                    room = self.find_free_room(self.rooms_by_type[candidate_type], check_in_date, check_out_date)
+                    if room is None:
+                        continue
+                    if self.copy_on_write and room.id not in self.owned_room_ids:
+                        room = self.copy_room(room)
+                    room.check_in(check_in_date, check_out_date)
+                cost = room.get_price(check_in_date, check_out_date)
+                if candidate_type != room_type:
+                    # Apply a 30% discount if the room is upgraded, as check_availability does.
+                    cost = int(cost * 0.7)
+                result = BookingResult(cost, room)
+                break
+        if result is None:
+            result = BookingResult.rejected(self.get_rejection_reason(room_type, check_in_date, check_out_date))
+
+        self.statistics.record_result(room_type, check_in_date, check_out_date, result.cost, result.room.type)
+        return result
+
+    def get_rejection_reason(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> RejectionReason:
+        """
+        Determines why a request that could not be booked was rejected.
+        The reason depends only on the request, so it is only worked out for rejected requests.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: The RejectionReason of the request.
+        """
+        if not self.is_within_horizon(room_type, check_in_date, check_out_date):
+            return RejectionReason.OUT_OF_HORIZON
+        if self.upgrade_order[room_type]:
+            return RejectionReason.NO_UPGRADE
+        return RejectionReason.NO_EXACT_MATCH
+
+    def is_within_horizon(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> bool:
+        """
+        Determines whether a request is a real request for a non-empty stay within the simulated days.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: True if the request can be booked at all; False for dummy and out-of-range requests.
+        """
+        return room_type != RoomType.NOT_A_ROOM and 0 <= check_in_date < check_out_date <= self.days
+
+    def get_booking_result(self, batch: RequestBatch, index: int) -> BookingResult:
+        """
+        Returns the outcome of one request of a processed batch as a BookingResult.
+
+        :param batch: The processed RequestBatch.
+        :param index: The position of the request in the batch.
+        :return: The BookingResult of the request.
+        """
+        room_id = batch.room_ids[index]
+        if room_id >= 0:
+            return BookingResult(batch.costs[index], self.rooms_by_id[room_id])
+        return BookingResult.rejected(self.get_rejection_reason(
+            batch.room_types[index], batch.check_in_dates[index], batch.check_out_dates[index]
+        ))
         
     def process_requests(self, requests: List[Request], today: int) -> List[Tuple[int, Room]]:
         """
-        Processes a list of room requests by applying the process_request method to each request.
+        Processes a list of room requests, with the same result as applying the process_request method to each request,
+        and updates the statistics.
 
         :param requests: A list of Request objects.
         :param today: The current day index for occupancy context.
         :return: A list of tuples (cost, Room) corresponding to the processed requests.
         """
-        process_results: List[Tuple[int, Room]] = []
-        for request in requests:
-            process_results.append(self.process_request(request))
+        # Book the requests as a batch, so the statistics see the requested types and dates as well.
+        batch = self.process_batch(RequestBatch.from_requests(requests), today)
+        return [
+            (cost, self.rooms_by_id[room_id]) if room_id >= 0 else Hotel.REJECTED
+            for room_id, cost in zip(batch.room_ids, batch.costs)
+        ]
+        
+    def book_batch(self, batch: RequestBatch, start: int = 0, stop: Optional[int] = None) -> RequestBatch:
+        """
+        Books a room for every request of a batch, in order, and fills in the batch's room ID and cost columns.
+        Behaves exactly like calling process_request for each request, but allocates no per-request objects
+        for successful bookings, and rejects a request without a room search if every type that could serve it
+        is fully booked on some day of its range (the common case once the hotel fills up). Statistics are not updated.
+
+        :param batch: The RequestBatch to process.
+        :param start: The position of the first request to book.
+        :param stop: The position after the last request to book; None books up to the end of the batch.
+        :return: The same batch, with its result columns filled in.
+        """
+        room_ids, costs, reserved_types = batch.room_ids, batch.costs, batch.reserved_types
+        if start == 0 and stop is None:
+            rows = batch.rows()
+        else:
+            rows = zip(batch.room_types[start:stop], batch.check_in_dates[start:stop], batch.check_out_dates[start:stop])
+        days, candidate_types = self.days, self.candidate_types
+        full_days = self.occupancy_counter.full_days_by_type
+        for i, (room_type, check_in_date, check_out_date) in enumerate(rows, start):
+            # Room.range_mask of the range, inlined.
+            stay_end = check_out_date if check_out_date < days else days
+            mask = ((1 << (stay_end - check_in_date)) - 1) << check_in_date if stay_end > check_in_date else 0
+            for candidate_type in candidate_types[room_type]:
+                if not full_days[candidate_type] & mask:
+                    break
+            else:
+                # Every candidate type is full on some day of the range, so check_availability would reject it.
+                continue
+            cost, room = self.check_availability(room_type, check_in_date, check_out_date)
+            if cost > -1:
+                if self.copy_on_write and room.id not in self.owned_room_ids:
+                    room = self.copy_room(room)
+                room.check_in(check_in_date, check_out_date)
+                room_ids[i] = room.id
+                costs[i] = cost
+                reserved_types[i] = room.type
+        return batch
+
+    def process_batch(self, batch: RequestBatch, today: int) -> RequestBatch:
+        """
+        Processes a batch of room requests and updates the statistics, like process_requests does for a list.
+
+        :param batch: The RequestBatch to process.
+        :param today: The current day index for occupancy context.
+        :return: The same batch, with its result columns filled in.
+        """
+        self.book_batch(batch)
 
-        # Update statistics using the processed requests and the current occupancy.
+        # Update statistics using the processed batch and the current occupancy.
         self.statistics.update(
-            request_results=process_results, 
+            request_results=batch,
             current_occupancy=self.get_current_occupancy(today)
         )
-        return process_results
-        
+        return batch
+
+    def process_steps(self, batch: RequestBatch, step_ends: List[int], days: List[int]) -> RequestBatch:
+        """
+        Processes the requests of several consecutive simulation steps, stored one step after another in one batch,
+        with the same bookings and statistics as calling process_batch on each step's requests in turn.
+        Step i holds the requests from step_ends[i - 1] (0 for the first step) up to step_ends[i], and its occupancy
+        is sampled on days[i] once they are booked. The results of all steps are then added to the statistics at once.
+
+        :param batch: The RequestBatch holding the requests of all steps.
+        :param step_ends: The position after the last request of each step.
+        :param days: The current day index of each step.
+        :return: The same batch, with its result columns filled in.
+        """
+        occupancies = []
+        start = 0
+        for stop, today in zip(step_ends, days):
+            self.book_batch(batch, start, stop)
+            occupancies.append(self.get_current_occupancy(today))
+            start = stop
+
+        self.statistics.update_steps(batch, occupancies)
+        return batch
+
+    def fork(self) -> Self:
+        """
+        Creates a branch of the hotel that starts from its current occupancy and statistics and then evolves
+        independently. The branch shares the Room objects with this hotel: a room is only copied when either
+        hotel checks it in for the first time after the fork, so forking costs O(room types x days)
+        for the occupancy counters, not O(rooms). Both hotels copy shared rooms from then on.
+
+        :return: The new Hotel.
+        """
+        branch = copy.copy(self)
+        branch.occupancy_counter = self.occupancy_counter.fork()
+        branch.statistics = copy.deepcopy(self.statistics)
+        branch.type_locks = {room_type: threading.Lock() for room_type in self.type_locks}
+        branch.room_index_lock = threading.Lock()
+        for hotel in (self, branch):
+            hotel.copy_on_write = True
+            hotel.owned_room_ids = set()
+            hotel.owns_room_index = False
+        return branch
+
+    def copy_room(self, room: Room) -> Room:
+        """
+        Replaces a room shared with another hotel by a private copy, before it is checked in.
+        The first copy also makes private copies of the room lists and the ID index.
+
+        :param room: The shared Room.
+        :return: The private copy, which has taken the shared room's place in this hotel.
+        """
+        private = self.create_room(room.id, room.type, self.days)
+        private.occupancy = room.occupancy
+        with self.room_index_lock:
+            if not self.owns_room_index:
+                self.rooms = list(self.rooms)
+                self.rooms_by_type = {room_type: list(rooms) for room_type, rooms in self.rooms_by_type.items()}
+                self.rooms_by_id = dict(self.rooms_by_id)
+                self.owns_room_index = True
+
+            # Room IDs are consecutive within a type, which gives the room's position in both lists.
+            rooms_of_type = self.rooms_by_type[room.type]
+            index = room.id - rooms_of_type[0].id
+            rooms_of_type[index] = private
+            self.rooms[self.type_offsets[room.type] + index] = private
+            self.rooms_by_id[room.id] = private
+            self.owned_room_ids.add(room.id)
+        return private
+
+    def export_occupancy(self) -> bytes:
+        """
+        Returns the occupancy schedules of all rooms (in self.rooms order) together with the occupancy counters,
+        e.g. to save them in a checkpoint. Each room's bitmask is stored as a little-endian row of
+        ceil(days / 8) bytes, followed by the counters' per-type daily counts.
+
+        :return: The raw occupancy data; 'import_occupancy' restores it.
+        """
+        row_bytes = (self.days + 7) // 8
+        return b"".join(room.occupancy.to_bytes(row_bytes, "little") for room in self.rooms) \
+            + self.occupancy_counter.export_counts()
+
+    def import_occupancy(self, data: bytes) -> None:
+        """
+        Restores the occupancy returned by 'export_occupancy' of a hotel with the same rooms and days.
+
+        :param data: The raw occupancy data.
+        """
+        row_bytes = (self.days + 7) // 8
+        from_bytes = int.from_bytes
+        offset = 0
+        for room in self.rooms:
+            room.occupancy = from_bytes(data[offset:offset + row_bytes], "little")
+            offset += row_bytes
+        self.occupancy_counter.import_counts(data[offset:])
+
+    def get_room(self, room_id: int) -> Room:
+        """
+        Returns the room with the given ID.
+
+        :param room_id: The unique identifier of the room.
+        :return: The Room with that ID.
+        """
+        return self.rooms_by_id[room_id]
+
     def check_availability(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> Tuple[int, Room]:
         """
         Checks if there is an available room matching the requested room type and date range.
         If no room of the exact type is available, an upgrade to a higher room type is attempted.
+        Room types whose rooms are all occupied on some day of the range are skipped without probing their rooms.
 
         :param room_type: The requested RoomType.
         :param check_in_date: The check-in day index (inclusive).
         :param check_out_date: The check-out day index (non-inclusive).
         :return: A tuple (cost, Room) where cost is the price for the stay if available,
-                 or (-1, dummy Room) if no room is available.
+                 or the shared Hotel.REJECTED (-1, Room.DUMMY) if no room is available.
         """
+        # Days on which every room of a type is occupied; a type that is full on any day of the range has no free room.
+        full_days = self.occupancy_counter.full_days_by_type
+        mask = Room.range_mask(check_in_date, min(check_out_date, self.days))
+
         # First, try to find a room of the exact requested type.
-        for room in self.rooms:
-            if room.get_type() == room_type and room.is_available(check_in_date, check_out_date):
+        if not full_days.get(room_type, 0) & mask:
+            room = self.find_free_room(self.rooms_by_type.get(room_type, ()), check_in_date, check_out_date)
+            if room is not None:
                 return (room.get_price(check_in_date, check_out_date), room)
         
         # If no room of the requested type is available, attempt to find an upgraded room type.
-        for room in self.rooms:
-            if room.get_type() > room_type and room.is_available(check_in_date, check_out_date):
+        for upgrade_type in self.upgrade_order[room_type]:
+            if full_days.get(upgrade_type, 0) & mask:
+                continue
+            room = self.find_free_room(self.rooms_by_type[upgrade_type], check_in_date, check_out_date)
+            if room is not None:
                 # Apply a 30% discount if the room is upgraded.
                 return (int(room.get_price(check_in_date, check_out_date) * 0.7), room)
         
         # No available room found.
-        return (-1, Room(-1, RoomType.NOT_A_ROOM, -1))
+        return Hotel.REJECTED
         
+    def count_free_rooms(self, room_type: RoomType, check_in_date: int, check_out_date: int,
+                         include_upgrades: bool = False) -> int:
+        """
+        Counts the rooms of a type (and, optionally, of every higher type) that are free for every day of a range.
+        The count is exact. The occupancy counters' bound (see 'free_rooms_upper_bound') is used as a shortcut:
+        types whose bound is 0 are skipped, and for single-day ranges the bound is the count itself,
+        so those cases take O(log days) per type. Otherwise the rooms of the type are checked one by one,
+        so an exact multi-day count stays linear in the number of rooms of the counted types: the per-day counters
+        do not tell which rooms are free, and an index of the free rooms per day would have to be updated
+        on every booking. Use 'free_rooms_upper_bound' where a bound is enough.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :param include_upgrades: If True, rooms of the higher types are counted as well.
+        :return: The number of free rooms.
+        """
+        single_day = min(check_out_date, self.days) - check_in_date <= 1
+        free = 0
+        for free_type in [room_type] + (self.upgrade_order[room_type] if include_upgrades else []):
+            bound = self.free_rooms_upper_bound(free_type, check_in_date, check_out_date)
+            if bound > 0 and not single_day:
+                bound = sum(1 for room in self.rooms_by_type[free_type] if room.is_available(check_in_date, check_out_date))
+            free += bound
+        return free
+
+    def free_rooms_upper_bound(self, room_type: RoomType, check_in_date: int, check_out_date: int,
+                               include_upgrades: bool = False) -> int:
+        """
+        Returns an upper bound on the number of rooms of a type (and, optionally, of every higher type)
+        that are free for every day of a range, read from the occupancy counters' segment trees
+        in O(log days) per type: the number of rooms minus the occupancy of the busiest day of the range.
+        The bound is exact for single-day ranges and whenever it is 0; for longer ranges a room may be free
+        on each day's count without being free for the whole stay. Use 'count_free_rooms' for the exact count.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :param include_upgrades: If True, rooms of the higher types are counted as well.
+        :return: The upper bound on the number of free rooms.
+        """
+        free = 0
+        for free_type in [room_type] + (self.upgrade_order[room_type] if include_upgrades else []):
+            free += len(self.rooms_by_type.get(free_type, ())) \
+                - self.occupancy_counter.get_peak_type_occupancy(free_type, check_in_date, check_out_date)
+        return free
+
+    def find_free_room(self, rooms: Iterable[Room], check_in_date: int, check_out_date: int) -> Optional[Room]:
+        """
+        Returns the first room in 'rooms' that is free for every day in the specified range.
+        The range mask is built once and tested against each room's occupancy bitmask,
+        which gives the same answer as calling Room.is_available on each room in turn.
+
+        :param rooms: The candidate rooms, in allocation order.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: The first free room, or None if every candidate is occupied on some day of the range.
+        """
+        mask = Room.range_mask(check_in_date, min(check_out_date, self.days))
+        for room in rooms:
+            if not room.occupancy & mask:
+                return room
+        return None
+
     def get_room_numbers(self) -> int:
         """
         Returns the total number of Room objects in the hotel.
@@ -107,7 +523,22 @@ class Hotel:
     
     def get_current_occupancy(self, today: int) -> int:
         """
-        Counts the number of rooms that are occupied on a specific day.
+        Returns the number of rooms that are occupied on a specific day from the occupancy counters.
+        In debug mode the result is cross-checked against a full scan of the rooms.
+
+        :param today: The day index for checking occupancy.
+        :return: The number of occupied rooms.
+        """
+        current_occupancy = self.occupancy_counter.get_occupancy(today)
+        if self.debug:
+            scanned = self.scan_current_occupancy(today)
+            if current_occupancy != scanned:
+                raise RuntimeError(f"Occupancy counter mismatch on day {today}: counted {current_occupancy}, scanned {scanned}")
+        return current_occupancy
+
+    def scan_current_occupancy(self, today: int) -> int:
+        """
+        Counts the number of rooms that are occupied on a specific day by checking every room.
 
         :param today: The day index for checking occupancy.
         :return: The number of occupied rooms.
@@ -120,7 +551,23 @@ class Hotel:
     
     def get_today_occupancy(self, today: int) -> DefaultDict[RoomType, int]:
         """
-        Returns a dictionary mapping each RoomType to the number of occupied rooms for that type on the given day.
+        Returns a dictionary mapping each RoomType to the number of occupied rooms for that type on the given day,
+        read from the occupancy counters. In debug mode the result is cross-checked against a full scan of the rooms.
+
+        :param today: The day index to check occupancy.
+        :return: A defaultdict mapping RoomType to the count of occupied rooms.
+        """
+        occupancy = self.occupancy_counter.get_type_occupancy(today)
+        if self.debug:
+            scanned = self.scan_today_occupancy(today)
+            if occupancy != scanned:
+                raise RuntimeError(f"Occupancy counter mismatch on day {today}: counted {dict(occupancy)}, scanned {dict(scanned)}")
+        return occupancy
+
+    def scan_today_occupancy(self, today: int) -> DefaultDict[RoomType, int]:
+        """
+        Returns a dictionary mapping each RoomType to the number of occupied rooms for that type on the given day
+        by checking every room.
 
         :param today: The day index to check occupancy.
         :return: A defaultdict mapping RoomType to the count of occupied rooms.
@@ -0,0 +1,206 @@
+from Model.Hotel import Hotel
+from Model.Room import Room
+from Model.RoomType import RoomType
+from Model.OccupancyCounter import OccupancyCounter
+
+import copy
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple, DefaultDict, Iterable, Optional, Self
+
+class MatrixRoom(Room):
+    """
+    A Room whose occupancy schedule is one row of the (rooms x days) occupancy matrix owned by a MatrixHotel.
+    The room itself stores no schedule; it only knows where its row starts in the shared matrix.
+    """
+
+    __slots__ = ("matrix", "row", "offset")
+
+    def __init__(self, id: int, room_type: RoomType, days: int, matrix: bytearray, row: int,
+                 counter: Optional[OccupancyCounter] = None) -> None:
+        """
+        Initializes a MatrixRoom as a view over one row of the occupancy matrix.
+
+        :param id: A unique identifier for the room.
+        :param room_type: An instance of RoomType specifying the type of the room.
+        :param days: The total number of days tracked for this room (the row length).
+        :param matrix: The shared occupancy matrix, stored row by row (one byte per room per day).
+        :param row: The index of this room's row in the matrix.
+        :param counter: The hotel's OccupancyCounter to update on check-in, if any.
+        """
+        self.id = id                          # Unique identifier for the room.
+        self.type = room_type                 # The room's type.
+        self.counter = counter                # Daily occupancy counters shared by the hotel's rooms.
+        self.price = Room.prices[room_type]
+        self.days = days
+        self.matrix = matrix                  # Shared occupancy matrix (1 if occupied, 0 if free).
+        self.row = row                        # Row index of this room in the matrix.
+        self.offset = row * days              # Position of this room's first day in the matrix.
+
+    # SETTERS
+    def check_in(self, check_in_date: int, check_out_date: int) -> Self:
+        """
+        Marks the room as occupied from check_in_date up to (but not including) check_out_date
+        by filling the matching slice of its matrix row.
+
+        :param check_in_date: The starting day index for the stay.
+        :param check_out_date: The ending day index (non-inclusive) for the stay.
+        :return: The current Room instance (allows for method chaining if desired).
+        """
+        start, end = self.offset + check_in_date, self.offset + check_out_date
+        self.matrix[start:end] = b"\x01" * (end - start)
+        # Keep the hotel's daily occupancy counters in step with the booking.
+        if self.counter is not None:
+            self.counter.book(self.type, check_in_date, check_out_date)
+        return self
+
+    # GETTERS
+    def is_available(self, check_in_date: int, check_out_date: int) -> bool:
+        """
+        Checks if the room is free for every day in the specified range with a single search over its row slice.
+
+        :param check_in_date: The starting day index (inclusive).
+        :param check_out_date: The ending day index (non-inclusive).
+        :return: True if none of the days in the range are occupied; otherwise, False.
+        """
+        return self.matrix.find(1, self.offset + check_in_date, self.offset + min(check_out_date, self.days)) == -1
+
+    def is_occupied(self, today: int) -> bool:
+        """
+        Checks if the room is occupied on a given day.
+
+        :param today: The day index to check occupancy.
+        :return: True if the room is occupied on that day; otherwise, False.
+        """
+        return self.matrix[self.offset + today] == 1
+
+    @property
+    def occupancy_duration(self) -> List[bool]:
+        """
+        Returns the room's matrix row as a list of booleans, one per tracked day (True if occupied).
+
+        :return: A list of booleans indicating the occupancy status for each day.
+        """
+        return [value == 1 for value in self.matrix[self.offset:self.offset + self.days]]
+
+
+class MatrixHotel(Hotel):
+    """
+    A Hotel that keeps the occupancy of all rooms in one (rooms x days) matrix instead of per-room schedules.
+    The matrix is a flat bytearray stored row by row, so whole-hotel and per-type occupancy queries
+    are a single strided slice and count over one column of the matrix.
+    """
+
+    def __init__(self, rooms_info: Dict[RoomType, int], days: int, debug: bool = False) -> None:
+        """
+        Allocates the occupancy matrix and initializes the Hotel with MatrixRoom views over its rows.
+
+        :param rooms_info: A dictionary mapping each RoomType to the count of rooms of that type.
+        :param days: The total number of days for which occupancy data is maintained.
+        :param debug: If True, occupancy counters are cross-checked against a full scan on every query.
+        """
+        # One byte per (room, day): 1 if the room is occupied on that day, 0 otherwise.
+        self.occupancy_matrix: bytearray = bytearray(sum(rooms_info.values()) * days)
+        super().__init__(rooms_info, days, debug)
+
+        # Rooms of one type occupy consecutive rows, so each type maps to a [first_row, last_row) range.
+        self.type_rows: Dict[RoomType, Tuple[int, int]] = {}
+        for room_type, rooms in self.rooms_by_type.items():
+            if rooms:
+                self.type_rows[room_type] = (rooms[0].row, rooms[-1].row + 1)
+
+    def create_room(self, id: int, room_type: RoomType, days: int) -> Room:
+        """
+        Creates a MatrixRoom backed by the next free row of the occupancy matrix.
+
+        :param id: The unique identifier for the room.
+        :param room_type: The RoomType of the room.
+        :param days: The total number of days to track occupancy for the room.
+        :return: The newly created MatrixRoom.
+        """
+        return MatrixRoom(id, room_type, days, self.occupancy_matrix, len(self.rooms), self.occupancy_counter)
+
+    def fork(self) -> Self:
+        """
+        Creates a branch of the hotel that starts from its current occupancy and statistics.
+        The rooms of a MatrixHotel are views into one shared matrix, so they cannot be copied one by one;
+        the branch gets its own copy of the matrix and new room views over it, which costs O(rooms).
+
+        :return: The new MatrixHotel.
+        """
+        branch = copy.copy(self)
+        branch.occupancy_matrix = bytearray(self.occupancy_matrix)
+        branch.occupancy_counter = self.occupancy_counter.fork()
+        branch.statistics = copy.deepcopy(self.statistics)
+        branch.type_locks = {room_type: threading.Lock() for room_type in self.type_locks}
+        branch.room_index_lock = threading.Lock()
+        branch.rooms = [
+            MatrixRoom(room.id, room.type, self.days, branch.occupancy_matrix, room.row, branch.occupancy_counter)
+            for room in self.rooms
+        ]
+        branch.rooms_by_id = {room.id: room for room in branch.rooms}
+        branch.rooms_by_type = {
+            room_type: [branch.rooms_by_id[room.id] for room in rooms] for room_type, rooms in self.rooms_by_type.items()
+        }
+        return branch
+
+    def export_occupancy(self) -> bytes:
+        """
+        Returns the occupancy matrix followed by the occupancy counters' per-type daily counts.
+
+        :return: The raw occupancy data; 'import_occupancy' restores it.
+        """
+        return bytes(self.occupancy_matrix) + self.occupancy_counter.export_counts()
+
+    def import_occupancy(self, data: bytes) -> None:
+        """
+        Restores the occupancy returned by 'export_occupancy' of a MatrixHotel with the same rooms and days.
+        The matrix is overwritten in place, since every MatrixRoom refers to it.
+
+        :param data: The raw occupancy data.
+        """
+        size = len(self.occupancy_matrix)
+        self.occupancy_matrix[:] = data[:size]
+        self.occupancy_counter.import_counts(data[size:])
+
+    def find_free_room(self, rooms: Iterable[Room], check_in_date: int, check_out_date: int) -> Optional[Room]:
+        """
+        Returns the first room in 'rooms' that is free for every day in the specified range,
+        searching each candidate's row slice of the occupancy matrix.
+
+        :param rooms: The candidate rooms, in allocation order.
+        :param check_in_date: The check-in day index (inclusive).
+        :param check_out_date: The check-out day index (non-inclusive).
+        :return: The first free room, or None if every candidate is occupied on some day of the range.
+        """
+        find = self.occupancy_matrix.find
+        check_out_date = min(check_out_date, self.days)
+        for room in rooms:
+            if find(1, room.offset + check_in_date, room.offset + check_out_date) == -1:
+                return room
+        return None
+
+    def scan_current_occupancy(self, today: int) -> int:
+        """
+        Counts the number of rooms that are occupied on a specific day by reducing one matrix column.
+
+        :param today: The day index for checking occupancy.
+        :return: The number of occupied rooms.
+        """
+        return self.occupancy_matrix[today::self.days].count(1)
+
+    def scan_today_occupancy(self, today: int) -> DefaultDict[RoomType, int]:
+        """
+        Returns a dictionary mapping each RoomType to the number of occupied rooms for that type on the given day.
+        Each count is a reduction over the part of the day's column that belongs to the type's rows.
+
+        :param today: The day index to check occupancy.
+        :return: A defaultdict mapping RoomType to the count of occupied rooms.
+        """
+        occupancy: DefaultDict[RoomType, int] = defaultdict(int)
+
+        for room_type, (first_row, last_row) in self.type_rows.items():
+            column = self.occupancy_matrix[first_row * self.days + today:last_row * self.days:self.days]
+            occupancy[room_type] = column.count(1)
+
+        return occupancy
@@ -0,0 +1,255 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import zipfile
+from array import array
+
+from typing import Dict, List, Tuple
+
+class MetricsTimeSeries:
+    """
+    Records one row of metrics per simulation step into columnar buffers.
+    Each column is a preallocated array of 64-bit integers or floats; when the buffers are full
+    their capacity is doubled, so appending a row never reallocates on every step.
+    The recorded trajectory can be exported as CSV, as a NumPy .npz archive, or as a raw binary file
+    with a JSON header that NumPy (np.memmap) or pandas can map without parsing.
+    """
+
+    # Column names and array type codes, in export order ("q": int64, "d": float64).
+    COLUMNS: List[Tuple[str, str]] = [
+        ("step", "q"),             # Index of the step since the start of the experiment.
+        ("occupancy", "q"),        # Number of occupied rooms sampled after the step.
+        ("occupancy_rate", "d"),   # Occupancy in percent, rounded to 2 decimals as Statistics does.
+        ("profit", "d"),           # Total profit accumulated so far.
+        ("success_rate", "d"),     # Success rate of all requests so far, in percent.
+        ("total_requests", "q"),   # Number of requests processed so far.
+        ("success_count", "q")     # Number of successful reservations so far.
+    ]
+    # NumPy dtype strings of the array type codes (always little-endian on disk).
+    DTYPES: Dict[str, str] = {"q": "<i8", "d": "<f8"}
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Initializes empty column buffers.
+
+        :param capacity: The number of rows to preallocate, e.g. the expected number of steps.
+        """
+        self.capacity: int = max(capacity, 1)
+        self.length: int = 0
+        self.columns: Dict[str, array] = {
+            name: array(typecode, bytes(array(typecode).itemsize * self.capacity))
+            for name, typecode in MetricsTimeSeries.COLUMNS
+        }
+
+    def __len__(self) -> int:
+        """
+        Returns the number of recorded rows.
+
+        :return: The number of rows.
+        """
+        return self.length
+
+    def reserve(self, rows: int) -> None:
+        """
+        Makes room for at least 'rows' rows, doubling the capacity as often as needed.
+
+        :param rows: The number of rows the buffers must be able to hold.
+        """
+        if rows <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < rows:
+            capacity *= 2
+        for column in self.columns.values():
+            column.frombytes(bytes(column.itemsize * (capacity - self.capacity)))
+        self.capacity = capacity
+
+    def append(self, step: int, occupancy: int, occupancy_rate: float, profit: float, success_rate: float,
+               total_requests: int, success_count: int, repeat: int = 1) -> None:
+        """
+        Appends the rows of 'repeat' consecutive steps that share the same metrics (e.g. steps without requests).
+        The step column counts up from 'step'.
+
+        :param step: The index of the first step.
+        :param occupancy: The number of occupied rooms.
+        :param occupancy_rate: The occupancy in percent.
+        :param profit: The total profit so far.
+        :param success_rate: The success rate so far, in percent.
+        :param total_requests: The number of requests processed so far.
+        :param success_count: The number of successful reservations so far.
+        :param repeat: The number of rows to append.
+        """
+        start, end = self.length, self.length + repeat
+        self.reserve(end)
+        columns = self.columns
+        if repeat == 1:
+            # A single row is written element by element, without building temporary arrays.
+            columns["step"][start] = step
+            columns["occupancy"][start] = occupancy
+            columns["occupancy_rate"][start] = occupancy_rate
+            columns["profit"][start] = profit
+            columns["success_rate"][start] = success_rate
+            columns["total_requests"][start] = total_requests
+            columns["success_count"][start] = success_count
+        else:
+            columns["step"][start:end] = array("q", range(step, step + repeat))
+            for name, value in (("occupancy", occupancy), ("occupancy_rate", occupancy_rate), ("profit", profit),
+                                ("success_rate", success_rate), ("total_requests", total_requests),
+                                ("success_count", success_count)):
+                column = columns[name]
+                column[start:end] = array(column.typecode, [value]) * repeat
+        self.length = end
+
+    def column(self, name: str) -> array:
+        """
+        Returns the recorded values of one column.
+
+        :param name: The column name (see COLUMNS).
+        :return: A copy of the column holding exactly the recorded rows.
+        """
+        return self.columns[name][:self.length]
+
+    def column_bytes(self, name: str) -> bytes:
+        """
+        Returns the recorded values of one column as little-endian bytes.
+
+        :param name: The column name (see COLUMNS).
+        :return: The raw column data.
+        """
+        values = self.column(name)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the recorded rows as the little-endian columns back to back, in COLUMNS order.
+
+        :return: The raw data; 'from_bytes' restores the time series from it and the row count.
+        """
+        return b"".join(self.column_bytes(name) for name, _ in MetricsTimeSeries.COLUMNS)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, length: int) -> "MetricsTimeSeries":
+        """
+        Restores a time series from the data returned by 'to_bytes'.
+
+        :param data: The raw column data.
+        :param length: The number of rows the data holds.
+        :return: A MetricsTimeSeries holding the stored rows.
+        """
+        time_series = cls(length)
+        offset = 0
+        for name, typecode in MetricsTimeSeries.COLUMNS:
+            values = array(typecode)
+            values.frombytes(data[offset:offset + values.itemsize * length])
+            if sys.byteorder == "big":
+                values.byteswap()
+            time_series.columns[name][:length] = values
+            offset += values.itemsize * length
+        time_series.length = length
+        return time_series
+
+    def to_csv(self, path: str) -> None:
+        """
+        Writes the time series as a CSV file with a header row.
+
+        :param path: The path of the CSV file.
+        """
+        names = [name for name, _ in MetricsTimeSeries.COLUMNS]
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(names)
+            writer.writerows(zip(*(self.column(name) for name in names)))
+
+    def to_npz(self, path: str) -> None:
+        """
+        Writes the time series as a NumPy .npz archive with one array per column (np.load(path)[name]).
+        The .npy members are built directly from the column buffers, so NumPy is not needed to write them.
+
+        :param path: The path of the .npz file.
+        """
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+            for name, typecode in MetricsTimeSeries.COLUMNS:
+                archive.writestr(f"{name}.npy", MetricsTimeSeries.npy_header(MetricsTimeSeries.DTYPES[typecode], self.length)
+                                 + self.column_bytes(name))
+
+    @staticmethod
+    def npy_header(dtype: str, length: int) -> bytes:
+        """
+        Builds the header of a one-dimensional .npy file (format version 1.0).
+
+        :param dtype: The NumPy dtype string of the data, e.g. "<f8".
+        :param length: The number of elements.
+        :return: The magic string, version, header length and header, padded to a multiple of 64 bytes.
+        """
+        header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': ({length},), }}"
+        # Magic (6 bytes) + version (2) + header length (2) + header + newline must be a multiple of 64.
+        padding = -(10 + len(header) + 1) % 64
+        header = (header + " " * padding + "\n").encode("latin1")
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header
+
+    def to_binary(self, path: str) -> None:
+        """
+        Writes the columns back to back into a raw binary file, each starting at a 64-byte aligned offset,
+        and describes them in a JSON header at 'path' + ".json". A column can then be mapped without parsing,
+        e.g. np.memmap(path, dtype=column["dtype"], mode="r", offset=column["offset"], shape=(header["length"],)).
+
+        :param path: The path of the binary file.
+        """
+        layout = []
+        offset = 0
+        with open(path, "wb") as file:
+            for name, typecode in MetricsTimeSeries.COLUMNS:
+                data = self.column_bytes(name)
+                file.write(bytes(offset - file.tell()))
+                file.write(data)
+                layout.append({"name": name, "dtype": MetricsTimeSeries.DTYPES[typecode], "offset": offset})
+                # Align the next column to 64 bytes.
+                offset += len(data) + (-len(data) % 64)
+        with open(path + ".json", "w", encoding="utf-8") as file:
+            json.dump({"length": self.length, "columns": layout}, file, indent=2)
+
+    @classmethod
+    def from_binary(cls, path: str) -> "MetricsTimeSeries":
+        """
+        Loads a time series written by 'to_binary' by memory-mapping the file and copying each column out of it.
+
+        :param path: The path of the binary file (its JSON header is read from 'path' + ".json").
+        :return: A MetricsTimeSeries holding the stored rows.
+        """
+        with open(path + ".json", encoding="utf-8") as file:
+            header = json.load(file)
+        length = header["length"]
+        time_series = cls(length)
+        typecodes = dict(MetricsTimeSeries.COLUMNS)
+
+        if length and os.path.getsize(path):
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for column in header["columns"]:
+                    values = array(typecodes[column["name"]])
+                    offset = column["offset"]
+                    values.frombytes(mapped[offset:offset + values.itemsize * length])
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    time_series.columns[column["name"]][:length] = values
+        time_series.length = length
+        return time_series
+
+    def save(self, path: str) -> None:
+        """
+        Writes the time series in the format given by the file extension:
+        ".csv" for CSV, ".npz" for a NumPy archive, anything else for the raw binary format.
+
+        :param path: The path of the output file.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            self.to_csv(path)
+        elif extension == ".npz":
+            self.to_npz(path)
+        else:
+            self.to_binary(path)
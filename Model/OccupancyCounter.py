@@ -0,0 +1,211 @@
+from Model.RoomType import RoomType
+
+import copy
+import sys
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Iterable, DefaultDict, Optional, Any, Self
+
+class OccupancyCounter:
+    """
+    Keeps running counts of occupied rooms per day and per (day, RoomType).
+    The counts are updated whenever a room is checked in, so the occupancy of a day is a lookup
+    instead of a scan over every room of the hotel.
+
+    For every RoomType the per-day counts are also kept in a segment tree of maxima, which answers
+    "how many rooms of this type are occupied on the busiest day of a range" in O(log days).
+    Occupancy only ever grows (there are no cancellations), so a booking updates the tree by walking up
+    from each booked day until an ancestor already holds a larger count.
+    If the number of rooms of each type is known, the days on which a type is fully booked are also kept
+    as a bitmask (bit i set if every room of the type is occupied on day i), so that a range can be ruled out
+    with a single AND against a range mask.
+
+    The daily totals are shared by all room types, so they are updated under a lock; the per-type counts,
+    trees and masks are only written by bookings of that type, which Hotel.reserve_concurrent serializes
+    with a lock per room type.
+    """
+
+    def __init__(self, days: int, room_types: Iterable[RoomType], capacities: Optional[Dict[RoomType, int]] = None) -> None:
+        """
+        Initializes all counters to zero.
+
+        :param days: The total number of days for which occupancy is counted.
+        :param room_types: The room types present in the hotel.
+        :param capacities: The number of rooms of each type, if the fully booked days should be tracked.
+        """
+        self.days: int = days
+        # Number of occupied rooms on each day.
+        self.daily: List[int] = [0] * days
+        # Number of occupied rooms of each type on each day.
+        self.daily_by_type: Dict[RoomType, List[int]] = {room_type: [0] * days for room_type in room_types}
+        # Number of leaves of the segment trees: the smallest power of two not below 'days'.
+        self.tree_size: int = 1 << max(days - 1, 0).bit_length()
+        # Segment tree of the per-day counts of each type: node 1 is the root, node i has children 2i and 2i + 1,
+        # leaf tree_size + day holds the count of that day, and every inner node holds the maximum of its children.
+        self.peak_tree_by_type: Dict[RoomType, List[int]] = {
+            room_type: [0] * (2 * self.tree_size) for room_type in self.daily_by_type
+        }
+        # Guards the daily totals against concurrent bookings of different room types.
+        self.lock = threading.Lock()
+        # Number of rooms of each type (empty if not tracked).
+        self.capacities: Dict[RoomType, int] = dict(capacities or {})
+        # Bitmask of the days on which every room of each type is occupied.
+        self.full_days_by_type: Dict[RoomType, int] = {room_type: 0 for room_type in self.daily_by_type}
+
+    def book(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> None:
+        """
+        Records a booking of one room of the given type from check_in_date up to (but not including) check_out_date.
+
+        :param room_type: The RoomType of the booked room.
+        :param check_in_date: The starting day index for the stay.
+        :param check_out_date: The ending day index (non-inclusive) for the stay.
+        """
+        daily_of_type = self.daily_by_type[room_type]
+        tree = self.peak_tree_by_type[room_type]
+        capacity = self.capacities.get(room_type)
+        leaf = self.tree_size + check_in_date
+        with self.lock:
+            daily = self.daily
+            for day in range(check_in_date, check_out_date):
+                daily[day] += 1
+        for day in range(check_in_date, check_out_date):
+            daily_of_type[day] += 1
+            count = daily_of_type[day]
+            if count == capacity:
+                self.full_days_by_type[room_type] |= 1 << day
+            tree[leaf] = count
+            # Raise the maxima on the path to the root; stop where an ancestor is already at least as large.
+            node = leaf >> 1
+            while node and tree[node] < count:
+                tree[node] = count
+                node >>= 1
+            leaf += 1
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Returns the counters for copying or pickling, without the lock.
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores copied or unpickled counters with a new lock.
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def fork(self) -> Self:
+        """
+        Returns an independent copy of the counters, e.g. for a forked hotel.
+
+        :return: The new OccupancyCounter.
+        """
+        counter = copy.copy(self)
+        counter.daily = list(self.daily)
+        counter.daily_by_type = {room_type: list(daily) for room_type, daily in self.daily_by_type.items()}
+        counter.peak_tree_by_type = {room_type: list(tree) for room_type, tree in self.peak_tree_by_type.items()}
+        counter.full_days_by_type = dict(self.full_days_by_type)
+        return counter
+
+    def export_counts(self) -> bytes:
+        """
+        Returns the per-(day, RoomType) counts as little-endian int64 rows, one row per type in counter order.
+        The other counts are derived from them, see 'import_counts'.
+
+        :return: The raw counts.
+        """
+        counts = array("q")
+        for daily_of_type in self.daily_by_type.values():
+            counts.extend(daily_of_type)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return counts.tobytes()
+
+    def import_counts(self, data: bytes) -> None:
+        """
+        Replaces all counts by the ones returned by 'export_counts' of a counter with the same days and room types,
+        and rebuilds the daily totals, segment trees and fully booked days from them.
+
+        :param data: The raw counts.
+        """
+        counts = array("q")
+        counts.frombytes(data)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        days, size = self.days, self.tree_size
+        self.daily = [0] * days
+        for index, room_type in enumerate(self.daily_by_type):
+            daily_of_type = counts[index * days:(index + 1) * days].tolist()
+            self.daily_by_type[room_type] = daily_of_type
+            self.daily = [total + count for total, count in zip(self.daily, daily_of_type)]
+
+            # Fill the leaves, then every inner node from its children, bottom-up.
+            tree = [0] * (2 * size)
+            tree[size:size + days] = daily_of_type
+            for node in range(size - 1, 0, -1):
+                tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            self.peak_tree_by_type[room_type] = tree
+
+            capacity = self.capacities.get(room_type)
+            self.full_days_by_type[room_type] = sum(
+                1 << day for day, count in enumerate(daily_of_type) if count == capacity
+            )
+
+    def get_occupancy(self, today: int) -> int:
+        """
+        Returns the number of rooms occupied on the given day.
+
+        :param today: The day index to look up.
+        :return: The number of occupied rooms, or 0 if the day is outside the tracked period.
+        """
+        if 0 <= today < self.days:
+            return self.daily[today]
+        return 0
+
+    def get_type_occupancy(self, today: int) -> DefaultDict[RoomType, int]:
+        """
+        Returns the number of rooms of each type occupied on the given day.
+
+        :param today: The day index to look up.
+        :return: A defaultdict mapping RoomType to the count of occupied rooms.
+        """
+        occupancy: DefaultDict[RoomType, int] = defaultdict(int)
+        in_range = 0 <= today < self.days
+
+        for room_type, daily_of_type in self.daily_by_type.items():
+            occupancy[room_type] = daily_of_type[today] if in_range else 0
+
+        return occupancy
+
+    def get_peak_type_occupancy(self, room_type: RoomType, check_in_date: int, check_out_date: int) -> int:
+        """
+        Returns the largest number of rooms of the given type occupied on any day of a range, in O(log days).
+        The range is clipped to the tracked period.
+
+        :param room_type: The RoomType to look up.
+        :param check_in_date: The starting day index (inclusive).
+        :param check_out_date: The ending day index (non-inclusive).
+        :return: The peak count of occupied rooms of that type, or 0 for an empty range or an untracked type.
+        """
+        tree = self.peak_tree_by_type.get(room_type)
+        if tree is None:
+            return 0
+        peak = 0
+        left = self.tree_size + max(check_in_date, 0)
+        right = self.tree_size + min(check_out_date, self.days)
+        # Standard bottom-up range query over the half-open leaf range [left, right).
+        while left < right:
+            if left & 1:
+                if tree[left] > peak:
+                    peak = tree[left]
+                left += 1
+            if right & 1:
+                right -= 1
+                if tree[right] > peak:
+                    peak = tree[right]
+            left >>= 1
+            right >>= 1
+        return peak
@@ -0,0 +1,129 @@
+import math
+
+from typing import Dict, List, Any, Self
+
+class QuantileSketch:
+    """
+    A streaming quantile sketch with bounded relative error (in the style of DDSketch).
+    Non-negative samples are counted in logarithmically sized buckets, so any quantile is estimated
+    within 'relative_accuracy' of the true value while memory depends only on the range of the values,
+    not on the number of samples. Sketches with the same accuracy can be merged.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        """
+        Initializes an empty sketch.
+
+        :param relative_accuracy: The maximum relative error of a quantile estimate.
+        :param max_buckets: The maximum number of buckets; beyond it the lowest buckets are collapsed,
+                            which only loses accuracy for the smallest values.
+        """
+        self.relative_accuracy: float = relative_accuracy
+        self.gamma: float = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma: float = math.log(self.gamma)
+        self.max_buckets: int = max_buckets
+        # Sample counts per bucket index; bucket i holds values in (gamma^(i-1), gamma^i].
+        self.buckets: Dict[int, int] = {}
+        # Number of zero samples, which have no logarithmic bucket.
+        self.zero_count: int = 0
+        # Total number of samples.
+        self.count: int = 0
+
+    def add(self, value: float, repeat: int = 1) -> None:
+        """
+        Adds a non-negative sample 'repeat' times.
+
+        :param value: The sample value.
+        :param repeat: The number of samples with this value.
+        """
+        self.count += repeat
+        if value <= 0:
+            self.zero_count += repeat
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + repeat
+        if len(self.buckets) > self.max_buckets:
+            self.collapse()
+
+    def collapse(self) -> None:
+        """
+        Merges the two lowest buckets so that the sketch stays within 'max_buckets' buckets.
+        """
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def merge(self, other: Self) -> None:
+        """
+        Adds all samples of another sketch with the same relative accuracy to this one.
+
+        :param other: The QuantileSketch to merge in.
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("only sketches with the same relative accuracy can be merged")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        while len(self.buckets) > self.max_buckets:
+            self.collapse()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the q-quantile of the samples.
+
+        :param q: The quantile to estimate, between 0 and 1 (e.g. 0.95 for the 95th percentile).
+        :return: The estimated value, or 0.0 if the sketch is empty.
+        """
+        if self.count == 0:
+            return 0.0
+        # Index (0-based) of the sample whose value is estimated.
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # The value in the middle of the bucket (in relative terms) is within the relative accuracy.
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def summary(self, quantiles: List[float] = (0.5, 0.95, 0.99)) -> Dict[str, float]:
+        """
+        Returns the estimates of several quantiles as a dictionary.
+
+        :param quantiles: The quantiles to estimate.
+        :return: A dictionary mapping 'p50', 'p95', ... to the estimated values, plus 'count'.
+        """
+        result: Dict[str, float] = {"count": self.count}
+        for q in quantiles:
+            result[f"p{round(q * 100):g}"] = self.quantile(q)
+        return result
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns the internal state of the sketch, e.g. to save it in a checkpoint.
+
+        :return: A JSON-serializable dictionary with the accuracy, bucket limit, buckets and counts.
+        """
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            # Bucket indices as [index, count] pairs, since JSON object keys are strings.
+            "buckets": [[key, count] for key, count in self.buckets.items()],
+            "zero_count": self.zero_count,
+            "count": self.count
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> Self:
+        """
+        Rebuilds a sketch from the state returned by 'get_state'.
+
+        :param state: The saved state.
+        :return: A QuantileSketch with exactly the saved buckets.
+        """
+        sketch = cls(state["relative_accuracy"], state["max_buckets"])
+        sketch.buckets = {key: count for key, count in state["buckets"]}
+        sketch.zero_count, sketch.count = state["zero_count"], state["count"]
+        return sketch
@@ -0,0 +1,12 @@
+from enum import Enum
+
+class RejectionReason(Enum):
+    """
+    An enumeration of the reasons why a room request could not be booked.
+    """
+    # No room of the requested type was free, and the type has no higher types to upgrade to.
+    NO_EXACT_MATCH = 1
+    # Neither a room of the requested type nor a room of any higher type was free.
+    NO_UPGRADE = 2
+    # The request does not fall within the simulated days (e.g. a dummy NOT_A_ROOM request).
+    OUT_OF_HORIZON = 3
@@ -1,11 +1,17 @@
 from Model.RoomType import RoomType
-from typing import Tuple, Any
+from typing import Tuple, Any, ClassVar
 
 class Request:
     """
     Represents a request for a hotel room, including the desired room type and the check-in/check-out dates.
     """
 
+    # Requests are created for every simulation step, so they keep fixed slots instead of a __dict__.
+    __slots__ = ("room_type", "check_in_date", "check_out_date")
+
+    # The shared dummy request (NOT_A_ROOM, -1, -1); assigned below the class.
+    DUMMY: ClassVar["Request"]
+
     # A mapping from RoomType values to their human-readable display strings.
     names_to_display = {
         RoomType.LUX: "LUX",
@@ -67,3 +73,34 @@ class Request:
         :return: A RoomType object representing the type of the requested room.
         """
         return self.room_type
+
+
+class DummyRequest(Request):
+    """
+    The type of the shared dummy request, Request.DUMMY. Its fields are set once when it is created;
+    assigning or deleting any of them afterwards raises an AttributeError.
+    Copying or unpickling it yields the shared instance itself.
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """
+        Creates the dummy request (NOT_A_ROOM, -1, -1).
+        """
+        object.__setattr__(self, "room_type", RoomType.NOT_A_ROOM)
+        object.__setattr__(self, "check_in_date", -1)
+        object.__setattr__(self, "check_out_date", -1)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"the shared dummy request cannot be modified (tried to set '{name}')")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"the shared dummy request cannot be modified (tried to delete '{name}')")
+
+    def __reduce__(self) -> str:
+        return "Request.DUMMY"
+
+
+# The shared dummy request used for requests that fall outside the simulated days; it cannot be modified.
+Request.DUMMY = DummyRequest()
@@ -0,0 +1,133 @@
+import struct
+import sys
+from array import array
+
+from Model.RoomType import RoomType
+from Model.Request import Request
+from typing import List, Iterable, Iterator, Tuple
+
+class RequestBatch:
+    """
+    A columnar (struct-of-arrays) batch of room requests and their booking results.
+    One batch holds all requests of a simulation step: the requested room types, check-in and check-out dates,
+    and, once the hotel has processed the batch, the assigned room IDs, costs and room types.
+    Storing columns instead of one Request and one (cost, Room) tuple per request avoids
+    per-request allocations on the simulation's hot path.
+    """
+
+    def __init__(self, room_types: List[RoomType], check_in_dates: Iterable[int], check_out_dates: Iterable[int]) -> None:
+        """
+        Initializes a batch from its request columns. The result columns start out as "not booked".
+
+        :param room_types: The requested RoomType of each request (NOT_A_ROOM for dummy requests).
+        :param check_in_dates: The check-in day index (inclusive) of each request.
+        :param check_out_dates: The check-out day index (non-inclusive) of each request.
+        """
+        self.room_types: List[RoomType] = room_types
+        self.check_in_dates: array = array("q", check_in_dates)
+        self.check_out_dates: array = array("q", check_out_dates)
+        # ID of the room assigned to each request, or -1 if no room was booked.
+        self.room_ids: array = array("q", [-1]) * len(room_types)
+        # Cost of each booking, or -1 if no room was booked.
+        self.costs: array = array("q", [-1]) * len(room_types)
+        # RoomType of the room assigned to each request (differs from the requested type for upgrades),
+        # or NOT_A_ROOM if no room was booked.
+        self.reserved_types: List[RoomType] = [RoomType.NOT_A_ROOM] * len(room_types)
+
+    @classmethod
+    def from_requests(cls, requests: List[Request]) -> "RequestBatch":
+        """
+        Builds a batch from a list of Request objects.
+
+        :param requests: The requests to put into the batch, in order.
+        :return: A new RequestBatch holding the same requests.
+        """
+        return cls(
+            [request.room_type for request in requests],
+            [request.check_in_date for request in requests],
+            [request.check_out_date for request in requests]
+        )
+
+    def __len__(self) -> int:
+        """
+        Returns the number of requests in the batch.
+
+        :return: The number of requests.
+        """
+        return len(self.room_types)
+
+    def rows(self) -> Iterator[Tuple[RoomType, int, int]]:
+        """
+        Iterates over the requests of the batch as (room_type, check_in_date, check_out_date) tuples.
+
+        :return: An iterator over the request fields, in order.
+        """
+        return zip(self.room_types, self.check_in_dates, self.check_out_dates)
+
+    def is_booked(self, index: int) -> bool:
+        """
+        Determines whether the request at 'index' has been assigned a room.
+
+        :param index: The position of the request in the batch.
+        :return: True if a room was booked for the request; otherwise, False.
+        """
+        return self.room_ids[index] >= 0
+
+    def success_count(self) -> int:
+        """
+        Counts the requests of the batch that have been assigned a room.
+
+        :return: The number of successful bookings.
+        """
+        return len(self.room_ids) - self.room_ids.count(-1)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the batch, results included: the request count (uint32), one byte per requested and per
+        reserved room type (RoomType value), then the int64 check-in dates, check-out dates, room IDs and costs,
+        all little-endian.
+
+        :return: The serialized batch; 'from_bytes' restores it.
+        """
+        columns = [array("q", column) for column in (self.check_in_dates, self.check_out_dates, self.room_ids, self.costs)]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        return b"".join([
+            struct.pack("<I", len(self)),
+            bytes(room_type.value for room_type in self.room_types),
+            bytes(room_type.value for room_type in self.reserved_types)
+        ] + [column.tobytes() for column in columns])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RequestBatch":
+        """
+        Restores a batch serialized by 'to_bytes'.
+
+        :param data: The serialized batch.
+        :return: A RequestBatch with the same requests and results.
+        """
+        (count,) = struct.unpack_from("<I", data)
+        offset = 4
+        room_types = [RoomType(value) for value in data[offset:offset + count]]
+        reserved_types = [RoomType(value) for value in data[offset + count:offset + 2 * count]]
+        offset += 2 * count
+        columns = []
+        for _ in range(4):
+            column = array("q")
+            column.frombytes(data[offset:offset + column.itemsize * count])
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+            offset += column.itemsize * count
+        batch = cls(room_types, columns[0], columns[1])
+        batch.room_ids, batch.costs, batch.reserved_types = columns[2], columns[3], reserved_types
+        return batch
+
+    def to_requests(self) -> List[Request]:
+        """
+        Converts the batch back into a list of Request objects.
+
+        :return: One Request per row of the batch, in order.
+        """
+        return [Request(*fields) for fields in self.rows()]
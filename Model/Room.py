@@ -1,4 +1,5 @@
 from Model.RoomType import RoomType
+from Model.OccupancyCounter import OccupancyCounter
 from typing import *
 
 class Room:
@@ -6,6 +7,12 @@ class Room:
     Represents a hotel room with a specific room type, price, and occupancy schedule.
     """
 
+    # Rooms are created by the tens of thousands in large hotels, so they keep fixed slots instead of a __dict__.
+    __slots__ = ("id", "type", "counter", "price", "days", "occupancy")
+
+    # The shared dummy room (NOT_A_ROOM) that stands for "no room"; assigned below the class.
+    DUMMY: ClassVar["Room"]
+
     # Class-level dictionaries for room prices and display names, keyed by RoomType.
     prices = {
         RoomType.LUX: 120,
@@ -23,21 +30,39 @@ class Room:
         RoomType.DOUBLE_WITH_SOFA: "DOUBLE-SOFA"
     }
 
-    def __init__(self, id: int, room_type: RoomType, days: int) -> None:
+    def __init__(self, id: int, room_type: RoomType, days: int, counter: Optional[OccupancyCounter] = None) -> None:
         """
         Initializes a Room instance.
 
         :param id: A unique identifier for the room.
         :param room_type: An instance of RoomType specifying the type of the room.
         :param days: The total number of days to track occupancy for this room.
+        :param counter: The hotel's OccupancyCounter to update on check-in, if any.
         """
         self.id = id                          # Unique identifier for the room.
         self.type = room_type                 # The room's type.
+        self.counter = counter                # Daily occupancy counters shared by the hotel's rooms.
         # If the room is valid (i.e., not marked as NOT_A_ROOM), set its price and initialize its occupancy schedule.
         if self.type != RoomType.NOT_A_ROOM:
             self.price = Room.prices[room_type]
-            # occupancy_duration is a list of booleans indicating occupancy status for each day (True if occupied, False if free).
-            self.occupancy_duration = [False] * days
+            # Number of days tracked by the occupancy schedule.
+            self.days = days
+            # occupancy is an integer bitmask of the schedule: bit i is set if the room is occupied on day i.
+            # Range checks and bookings become a single AND/OR with a mask instead of a per-day loop.
+            self.occupancy = 0
+
+    @staticmethod
+    def range_mask(check_in_date: int, check_out_date: int) -> int:
+        """
+        Builds a bitmask with the bits for days check_in_date up to (but not including) check_out_date set.
+
+        :param check_in_date: The starting day index (inclusive).
+        :param check_out_date: The ending day index (non-inclusive).
+        :return: The bitmask covering the range, or 0 for an empty range.
+        """
+        if check_out_date <= check_in_date:
+            return 0
+        return ((1 << (check_out_date - check_in_date)) - 1) << check_in_date
 
     # SETTERS
     def check_in(self, check_in_date: int, check_out_date: int) -> Self:
@@ -48,8 +73,10 @@ class Room:
         :param check_out_date: The ending day index (non-inclusive) for the stay.
         :return: The current Room instance (allows for method chaining if desired).
         """
-        for i in range(check_in_date, check_out_date):
-            self.occupancy_duration[i] = True
+        self.occupancy |= Room.range_mask(check_in_date, check_out_date)
+        # Keep the hotel's daily occupancy counters in step with the booking.
+        if self.counter is not None:
+            self.counter.book(self.type, check_in_date, check_out_date)
         return self
 
     # GETTERS
@@ -61,8 +88,8 @@ class Room:
         :param check_out_date: The ending day index (non-inclusive).
         :return: True if the room is valid and none of the days in the range are occupied; otherwise, False.
         """
-        return (self.type != RoomType.NOT_A_ROOM and 
-                not any(self.occupancy_duration[check_in_date:check_out_date]))
+        return (self.type != RoomType.NOT_A_ROOM and
+                not self.occupancy & Room.range_mask(check_in_date, min(check_out_date, self.days)))
 
     def is_room(self) -> bool:
         """
@@ -79,8 +106,16 @@ class Room:
         :param today: The day index to check occupancy.
         :return: True if the room is occupied on that day; otherwise, False.
         """
-        # Debugging code (commented out): print([("0" if b else "_") for b in self.occupancy_duration])
-        return self.occupancy_duration[today]
+        return bool(self.occupancy >> today & 1)
+
+    @property
+    def occupancy_duration(self) -> List[bool]:
+        """
+        Expands the occupancy bitmask into a list of booleans, one per tracked day (True if occupied).
+
+        :return: A list of booleans indicating the occupancy status for each day.
+        """
+        return [bool(self.occupancy >> day & 1) for day in range(self.days)]
 
     def get_type(self) -> RoomType:
         """
@@ -115,3 +150,35 @@ class Room:
         :return: A string representing the room's type.
         """
         return Room.names_to_display[self.type]
+
+
+class DummyRoom(Room):
+    """
+    The type of the shared dummy room, Room.DUMMY. Its attributes are set once when it is created;
+    assigning or deleting any of them afterwards raises an AttributeError, so that code writing to a returned
+    dummy cannot corrupt every later rejection. Copying or unpickling it yields the shared instance itself.
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """
+        Creates the dummy room (ID -1, NOT_A_ROOM, no occupancy counter and no occupancy schedule).
+        """
+        object.__setattr__(self, "id", -1)
+        object.__setattr__(self, "type", RoomType.NOT_A_ROOM)
+        object.__setattr__(self, "counter", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"the shared dummy room cannot be modified (tried to set '{name}')")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"the shared dummy room cannot be modified (tried to delete '{name}')")
+
+    def __reduce__(self) -> str:
+        return "Room.DUMMY"
+
+
+# The shared dummy room returned for requests that could not be booked. It has no occupancy schedule and
+# cannot be checked in or modified; compare with 'is_room()' (or identity) rather than creating new dummies.
+Room.DUMMY = DummyRoom()
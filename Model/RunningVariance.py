@@ -0,0 +1,87 @@
+import math
+
+from typing import Dict, Any, Self
+
+class RunningVariance:
+    """
+    Streaming mean and variance of a sequence of samples (Welford's algorithm) in constant memory.
+    Runs of equal samples can be added in one call, and two estimators can be merged
+    (Chan et al.'s parallel update), e.g. to combine replications.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty estimator.
+        """
+        # Number of samples seen so far.
+        self.count: int = 0
+        # Mean of the samples.
+        self.mean: float = 0.0
+        # Sum of squared differences from the mean.
+        self.m2: float = 0.0
+
+    def add(self, value: float, repeat: int = 1) -> None:
+        """
+        Adds a sample 'repeat' times in a row.
+        The samples are added one by one, so the estimates are bit-for-bit the same however
+        a run of equal samples is split into calls.
+
+        :param value: The sample value.
+        :param repeat: The number of consecutive samples with this value.
+        """
+        for _ in range(repeat):
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: Self) -> None:
+        """
+        Adds all samples of another estimator to this one.
+
+        :param other: The RunningVariance to merge in.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    def variance(self) -> float:
+        """
+        Returns the sample variance (with Bessel's correction).
+
+        :return: The variance, or 0.0 for fewer than two samples.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns the estimates as a dictionary.
+
+        :return: A dictionary with keys 'count', 'mean', 'variance' and 'stdev'.
+        """
+        variance = self.variance()
+        return {"count": self.count, "mean": self.mean, "variance": variance, "stdev": math.sqrt(variance)}
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns the internal state of the estimator, e.g. to save it in a checkpoint.
+
+        :return: A JSON-serializable dictionary with keys 'count', 'mean' and 'm2'.
+        """
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> Self:
+        """
+        Rebuilds an estimator from the state returned by 'get_state'.
+
+        :param state: The saved state.
+        :return: A RunningVariance with exactly the saved estimates.
+        """
+        estimator = cls()
+        estimator.count, estimator.mean, estimator.m2 = state["count"], state["mean"], state["m2"]
+        return estimator
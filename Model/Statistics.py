@@ -1,5 +1,12 @@
 from Model.RoomType import RoomType
-from typing import List, Dict, Tuple, DefaultDict
+from Model.RequestBatch import RequestBatch
+from Model.MetricsTimeSeries import MetricsTimeSeries
+from Model.RunningVariance import RunningVariance
+from Model.QuantileSketch import QuantileSketch
+import itertools
+import threading
+from collections import Counter, defaultdict
+from typing import List, Dict, Tuple, DefaultDict, Union, Optional, Any
 
 class Statistics:
     def __init__(self, total_room_count: int) -> None:
@@ -25,37 +32,177 @@ class Statistics:
         self.occupancy_count: int = 1
         # Total profit accumulated from successful reservations.
         self.profit: float = 0.0
+        # Streaming estimators, updated in constant memory:
+        # mean and variance of the occupancy percentage sampled after each step,
+        self.occupancy_variance: RunningVariance = RunningVariance()
+        # quantile sketches of the stay length (in days) and the value of successful bookings,
+        self.stay_length_sketch: QuantileSketch = QuantileSketch()
+        self.booking_value_sketch: QuantileSketch = QuantileSketch()
+        # revenue per reserved RoomType, and upgrades and rejections per requested RoomType (dummy NOT_A_ROOM requests excluded).
+        self.revenue_by_type: DefaultDict[RoomType, float] = defaultdict(float)
+        self.upgrades_by_type: DefaultDict[RoomType, int] = defaultdict(int)
+        self.rejections_by_type: DefaultDict[RoomType, int] = defaultdict(int)
+        # Optional per-step time series of the metrics; None disables recording.
+        self.time_series: Optional[MetricsTimeSeries] = None
+        # Serializes 'record_result' calls from concurrent bookings (see Hotel.reserve_concurrent).
+        self.lock = threading.Lock()
 
-    def update(self, request_results: List[Tuple[int, any]], current_occupancy: int) -> None:
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Returns the statistics for copying or pickling, without the lock.
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores copied or unpickled statistics with a new lock.
+        """
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def update(self, request_results: Union[List[Tuple[int, any]], RequestBatch], current_occupancy: int) -> None:
         """
         Updates the statistics based on the latest batch of room requests and their results.
-        Each element in request_results is a tuple containing (cost, room).
+        request_results is either a processed RequestBatch or a list of tuples (cost, room).
 
-        :param request_results: A list of tuples (cost, room) returned after processing requests.
+        :param request_results: A processed RequestBatch, or a list of tuples (cost, room) returned after processing requests.
         :param current_occupancy: The current number of occupied rooms in the hotel.
         """
+        # Update the total number of processed requests and add up the successful reservations.
+        self.add_results(request_results)
+
+        # Calculate the success rate as the percentage of successful requests (steps may have no requests).
+        if self.total_requests:
+            self.success_rate = (self.succesed_requests / self.total_requests) * 100
+
+        # Add today's occupancy to the running average.
+        self.record_occupancy(current_occupancy)
+
+    def update_steps(self, request_results: RequestBatch, occupancies: List[int]) -> None:
+        """
+        Updates the statistics for several consecutive steps at once, with the same result as calling 'update'
+        with each step's requests and occupancy in turn: the results of all steps are added in order,
+        and each run of steps with the same occupancy is recorded with one 'record_occupancy' call.
+        Only the last step's metrics are known, so this must not be used while a time series is recorded.
+
+        :param request_results: A processed RequestBatch holding the requests of all steps, in order.
+        :param occupancies: The number of occupied rooms after each step.
+        """
+        self.add_results(request_results)
+
+        # The success rate only depends on the totals, so the last step's value is the final one.
+        if self.total_requests:
+            self.success_rate = (self.succesed_requests / self.total_requests) * 100
+
+        for current_occupancy, run in itertools.groupby(occupancies):
+            self.record_occupancy(current_occupancy, sum(1 for _ in run))
+
+    def add_results(self, request_results: Union[List[Tuple[int, any]], RequestBatch]) -> None:
+        """
+        Adds a batch of request results to the request count, success count and profit.
+
+        :param request_results: A processed RequestBatch, or a list of tuples (cost, room).
+        """
         # Update the total number of processed requests.
         self.total_requests += len(request_results)
 
+        if isinstance(request_results, RequestBatch):
+            batch = request_results
+            room_types = batch.room_types
+            # Every request that did not get a room is a rejection; count the requested types first
+            # and take the booked ones off below, so that only the booked rows are visited one by one.
+            rejections = Counter(room_types)
+            # A room ID of -1 marks a request for which no room was booked.
+            for i in [i for i, room_id in enumerate(batch.room_ids) if room_id >= 0]:
+                room_type, cost, reserved_type = room_types[i], batch.costs[i], batch.reserved_types[i]
+                self.succesed_requests += 1
+                self.profit += cost
+                self.record_booking(cost, reserved_type)
+                self.stay_length_sketch.add(batch.check_out_dates[i] - batch.check_in_dates[i])
+                if reserved_type != room_type:
+                    self.upgrades_by_type[room_type] += 1
+                rejections[room_type] -= 1
+            # Dummy requests are not real requests for a room, so they are not counted as rejections.
+            rejections.pop(RoomType.NOT_A_ROOM, None)
+            for room_type, count in rejections.items():
+                if count > 0:
+                    self.rejections_by_type[room_type] += count
+            return
+
         # Process each tuple (cost, room) from the request results.
+        # The requested type and dates are not part of the tuples, so stay lengths, upgrades and rejections
+        # are only recorded for batches.
         for cost, request_result in request_results:
             # If the room is valid (i.e., the reservation was successful),
             # increment the count of successful reservations and add the cost to the profit.
             if request_result.is_room():
                 self.succesed_requests += 1
                 self.profit += cost
+                self.record_booking(cost, request_result.get_type())
+
+    def record_result(self, room_type: RoomType, check_in_date: int, check_out_date: int,
+                      cost: int, reserved_type: RoomType) -> None:
+        """
+        Adds the result of a single request, like one row of a processed RequestBatch in 'add_results',
+        and refreshes the success rate. Safe to call from several threads at once.
+
+        :param room_type: The requested RoomType.
+        :param check_in_date: The check-in day index.
+        :param check_out_date: The check-out day index.
+        :param cost: The cost of the booking, or -1 if no room was booked.
+        :param reserved_type: The RoomType of the booked room, or NOT_A_ROOM if no room was booked.
+        """
+        with self.lock:
+            self.total_requests += 1
+            if cost > -1:
+                self.succesed_requests += 1
+                self.profit += cost
+                self.record_booking(cost, reserved_type)
+                self.stay_length_sketch.add(check_out_date - check_in_date)
+                if reserved_type != room_type:
+                    self.upgrades_by_type[room_type] += 1
+            elif room_type != RoomType.NOT_A_ROOM:
+                self.rejections_by_type[room_type] += 1
+            self.success_rate = (self.succesed_requests / self.total_requests) * 100
 
-        # Calculate the success rate as the percentage of successful requests.
-        self.success_rate = (self.succesed_requests / self.total_requests) * 100
+    def record_booking(self, cost: int, reserved_type: RoomType) -> None:
+        """
+        Adds a successful booking to the booking value sketch and to the revenue of its room type.
 
-        # Compute today's occupancy percentage.
-        occupancy_today = (current_occupancy / self.total_room_count) * 100
-        # Add the current occupancy percentage (rounded to 2 decimals) to the cumulative sum.
-        self.sum_occupancy += round(occupancy_today, 2)
+        :param cost: The cost of the booking.
+        :param reserved_type: The RoomType of the booked room.
+        """
+        self.booking_value_sketch.add(cost)
+        self.revenue_by_type[reserved_type] += cost
+
+    def record_occupancy(self, current_occupancy: int, repeat: int = 1) -> None:
+        """
+        Adds an occupancy sample to the average occupancy, 'repeat' times in a row.
+        Recording a sample k times gives exactly the same result as k updates with no requests,
+        which lets stretches of steps without any bookings be recorded in one call.
+
+        :param current_occupancy: The current number of occupied rooms in the hotel.
+        :param repeat: The number of consecutive samples with this occupancy.
+        """
+        if repeat <= 0:
+            return
+
+        # Compute today's occupancy percentage (rounded to 2 decimals).
+        occupancy_today = round((current_occupancy / self.total_room_count) * 100, 2)
+        self.occupancy_variance.add(occupancy_today, repeat)
+        if self.time_series is not None:
+            # One row per sample; the first sample is step number occupancy_count - 1.
+            self.time_series.append(self.occupancy_count - 1, current_occupancy, occupancy_today, self.profit,
+                                    self.success_rate, self.total_requests, self.succesed_requests, repeat)
+        for _ in range(repeat):
+            # Add the current occupancy percentage to the cumulative sum.
+            self.sum_occupancy += occupancy_today
+            # Increment the count of occupancy updates.
+            self.occupancy_count += 1
         # Calculate the average occupancy across all updates so far.
-        self.avg_occupancy = self.sum_occupancy / self.occupancy_count
-        # Increment the count of occupancy updates.
-        self.occupancy_count += 1
+        self.avg_occupancy = self.sum_occupancy / (self.occupancy_count - 1)
 
     def display_statistics(self) -> Dict[str, float]:
         """
@@ -74,39 +221,73 @@ class Statistics:
             "fail_count": self.total_requests - self.succesed_requests
         }
 
-    def goto_end(self, requests: List[any], request_results: List[Tuple[int, any]], remaining_occupancy: List[int]) -> None:
+    def display_estimators(self) -> Dict[str, Any]:
         """
-        Processes the remaining simulation steps at the end of the experiment.
-        It updates the statistics based on the final batch of room requests and adjusts occupancy statistics.
+        Returns the streaming estimators: mean and variance of the sampled occupancy percentage,
+        p50/p95/p99 estimates of the stay length and booking value, and per-RoomType revenue,
+        upgrade and rejection counts keyed by RoomType name.
 
-        :param requests: A list of Request objects for the remaining simulation steps.
-        :param request_results: A list of tuples (cost, room) corresponding to these requests.
-        :param remaining_occupancy: A list of occupancy numbers (one per remaining step).
+        :return: A dictionary with keys 'occupancy', 'stay_length', 'booking_value', 'revenue_by_type',
+                 'upgrades_by_type' and 'rejections_by_type'.
         """
-        # Update the total number of processed requests by adding the number of new requests.
-        self.total_requests += len(requests)
+        return {
+            "occupancy": self.occupancy_variance.summary(),
+            "stay_length": self.stay_length_sketch.summary(),
+            "booking_value": self.booking_value_sketch.summary(),
+            "revenue_by_type": Statistics.by_type_name(self.revenue_by_type),
+            "upgrades_by_type": Statistics.by_type_name(self.upgrades_by_type),
+            "rejections_by_type": Statistics.by_type_name(self.rejections_by_type)
+        }
 
-        # Process each request and its corresponding result.
-        for request, request_result in zip(requests, request_results):
-            check_in_date, check_out_date = request.get_time_info()
+    @staticmethod
+    def by_type_name(values: Dict[RoomType, float]) -> Dict[str, float]:
+        """
+        Re-keys a per-RoomType dictionary by RoomType name, in RoomType order.
 
-            # If the reservation is successful, update successful request count and profit.
-            if request_result.is_room():
-                self.succesed_requests += 1
-                # Calculate the cost for the stay.
-                cost = request_result.get_price(check_in_date, check_out_date)
-                # Apply a 70% discount if the reserved room type differs from the requested type.
-                if request.get_type() == request_result.get_type():
-                    self.profit += cost
-                else:
-                    self.profit += cost * 0.7
-
-        # Recalculate the success rate based on all processed requests.
-        self.success_rate = (self.succesed_requests / self.total_requests) * 100
-        
-        # Update occupancy statistics for each remaining occupancy value.
-        for oc in remaining_occupancy:
-            occupancy_i = (oc / self.total_room_count) * 100
-            self.sum_occupancy += round(occupancy_i, 2)
-            self.avg_occupancy = self.sum_occupancy / self.occupancy_count
-            self.occupancy_count += 1
+        :param values: A dictionary keyed by RoomType.
+        :return: The same values keyed by RoomType name.
+        """
+        return {room_type.name: values[room_type] for room_type in RoomType if room_type in values}
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns all accumulators, e.g. to save them in a checkpoint. The time series is not included;
+        its columns are saved separately (see MetricsTimeSeries.to_bytes).
+
+        :return: A JSON-serializable dictionary from which 'set_state' restores the statistics exactly.
+        """
+        return {
+            "total_requests": self.total_requests,
+            "succesed_requests": self.succesed_requests,
+            "sum_occupancy": self.sum_occupancy,
+            "avg_occupancy": self.avg_occupancy,
+            "success_rate": self.success_rate,
+            "occupancy_count": self.occupancy_count,
+            "profit": self.profit,
+            "occupancy_variance": self.occupancy_variance.get_state(),
+            "stay_length_sketch": self.stay_length_sketch.get_state(),
+            "booking_value_sketch": self.booking_value_sketch.get_state(),
+            "revenue_by_type": Statistics.by_type_name(self.revenue_by_type),
+            "upgrades_by_type": Statistics.by_type_name(self.upgrades_by_type),
+            "rejections_by_type": Statistics.by_type_name(self.rejections_by_type)
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restores the accumulators returned by 'get_state'. The total room count and the time series are kept.
+
+        :param state: The saved state.
+        """
+        self.total_requests = state["total_requests"]
+        self.succesed_requests = state["succesed_requests"]
+        self.sum_occupancy = state["sum_occupancy"]
+        self.avg_occupancy = state["avg_occupancy"]
+        self.success_rate = state["success_rate"]
+        self.occupancy_count = state["occupancy_count"]
+        self.profit = state["profit"]
+        self.occupancy_variance = RunningVariance.from_state(state["occupancy_variance"])
+        self.stay_length_sketch = QuantileSketch.from_state(state["stay_length_sketch"])
+        self.booking_value_sketch = QuantileSketch.from_state(state["booking_value_sketch"])
+        self.revenue_by_type = defaultdict(float, {RoomType[name]: value for name, value in state["revenue_by_type"].items()})
+        self.upgrades_by_type = defaultdict(int, {RoomType[name]: value for name, value in state["upgrades_by_type"].items()})
+        self.rejections_by_type = defaultdict(int, {RoomType[name]: value for name, value in state["rejections_by_type"].items()})
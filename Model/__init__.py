@@ -1,4 +1,11 @@
+from .BookingResult import BookingResult
 from .Hotel import Hotel
+from .MatrixHotel import MatrixHotel
+from .MetricsTimeSeries import MetricsTimeSeries
+from .QuantileSketch import QuantileSketch
+from .RejectionReason import RejectionReason
 from .Request import Request
+from .RequestBatch import RequestBatch
 from .Room import Room
-from .RoomType import RoomType
\ No newline at end of file
+from .RoomType import RoomType
+from .RunningVariance import RunningVariance
\ No newline at end of file
@@ -1,19 +1,26 @@
+import queue
 import tkinter as tk
 from tkinter import messagebox
-from tkinter import scrolledtext
+from tkinter import ttk
 
 from Model.RoomType import RoomType
 from View.GUI import GUI
+from View.VirtualLogView import VirtualLogView
+from Controller.SimulationWorker import SimulationWorker
 from typing import *
 
 class ObservationWindow(tk.Toplevel, GUI):
-    def __init__(self, parent, controller) -> None:
+    # Delay between two steps in auto-run mode, in seconds (Goto End fast-forwards without stepping).
+    AUTO_RUN_STEP_DELAY = 0.2
+
+    def __init__(self, parent, controller, frame_rate: int = 30) -> None:
         """
         Creates a separate observation window for monitoring the running experiment.
         Inherits from tk.Toplevel to create a new top-level window and from GUI for shared GUI functionalities.
         
         :param parent: The parent window (e.g., an instance of InitWindow).
         :param controller: The ExperimentController instance managing the simulation.
+        :param frame_rate: How many times per second the window refreshes while the simulation runs in the background.
         """
         # Initialize the Toplevel window with the parent window.
         super().__init__(parent)
@@ -22,6 +29,18 @@ class ObservationWindow(tk.Toplevel, GUI):
         self.parent = parent
         self.controller = controller
 
+        # Background simulation (auto-run and Goto End): the worker thread, the queue it posts snapshots to,
+        # and the refresh interval in milliseconds.
+        self.worker: Optional[SimulationWorker] = None
+        self.snapshots: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.frame_ms = max(1, 1000 // frame_rate)
+        # Text currently shown in each single-value field, so that unchanged fields are not redrawn.
+        self.shown_text: Dict[tk.Text, str] = {}
+        # The last snapshot shown from the background run.
+        self.last_snapshot: Optional[Dict[str, Any]] = None
+        # Set once the experiment has run to its end; the next step then ends the experiment.
+        self.finished = False
+
         # Set the window title and geometry.
         self.title("Experiment Observation (Hotel booking and check-in support system)")
         self.geometry("1200x400")
@@ -92,8 +111,8 @@ class ObservationWindow(tk.Toplevel, GUI):
         flow_frame = tk.Frame(right_frame)
         flow_frame.pack(side=tk.TOP, fill=tk.BOTH)
         tk.Label(flow_frame, text="Request Flow", font=("Arial", 10, "underline")).grid(row=0, pady=5)
-        # Create a scrolled text widget to display detailed reservation request flow.
-        self.flow_info = scrolledtext.ScrolledText(flow_frame, height=10, width=100)
+        # Create a virtualized view of the controller's request flow log; it renders only the visible rows.
+        self.flow_info = VirtualLogView(flow_frame, self.controller.flow_log, height=10, width=100)
         self.flow_info.grid(row=1)
 
         # ---- Room Occupancy Information Section ----
@@ -134,23 +153,137 @@ class ObservationWindow(tk.Toplevel, GUI):
         # Button to jump to the final state of the simulation.
         self.btn_goto_end = tk.Button(bottom_frame, text="Goto End", command=self.goto_end, width=7)
         self.btn_goto_end.pack(padx=5)
+        # Button to step the simulation automatically in the background.
+        self.btn_auto_run = tk.Button(bottom_frame, text="Auto run", command=self.auto_run, width=7)
+        self.btn_auto_run.pack(padx=5)
+        # Buttons to pause (or resume) and cancel a background run.
+        self.btn_pause = tk.Button(bottom_frame, text="Pause", command=self.toggle_pause, width=7, state="disabled")
+        self.btn_pause.pack(padx=5)
+        self.btn_cancel = tk.Button(bottom_frame, text="Cancel", command=self.cancel_run, width=7, state="disabled")
+        self.btn_cancel.pack(padx=5)
+        # Progress of the experiment.
+        self.progress = ttk.Progressbar(bottom_frame, orient=tk.HORIZONTAL, length=200, mode="determinate", maximum=1.0)
+        self.progress.pack(padx=5, pady=5)
 
         # Set the text widgets to be read-only by default.
         self.mode_change_text_box("disabled")
 
     def goto_end(self) -> None:
         """
-        Advances the experiment to its end state by processing all remaining simulation steps,
-        and then updates the GUI with the final results.
+        Advances the experiment to its end state by fast-forwarding through all remaining simulation steps
+        (see ExperimentController.goto_end) in the background, and then updates the GUI with the final results.
+        The window stays responsive while the steps run, but the fast-forward cannot be paused or cancelled.
         """
-        self.controller.goto_end()
-        self.update_screen()
+        self.start_worker(step_delay=0.0, fast_forward=True)
+
+    def auto_run(self) -> None:
+        """
+        Steps the experiment automatically in the background until it ends, is paused or is cancelled.
+        """
+        self.start_worker(step_delay=ObservationWindow.AUTO_RUN_STEP_DELAY)
+
+    def start_worker(self, step_delay: float, fast_forward: bool = False) -> None:
+        """
+        Starts a background run of the experiment and begins polling its snapshots.
+
+        :param step_delay: The time to wait after each step, in seconds.
+        :param fast_forward: If True, the run fast-forwards to the end with ExperimentController.goto_end.
+        """
+        if self.worker is not None or self.finished:
+            return
+        self.worker = SimulationWorker(self.controller, self.snapshots, self.frame_ms / 1000, step_delay, fast_forward)
+        self.last_snapshot = None
+        self.set_running(True, pausable=not fast_forward)
+        self.worker.start()
+        self.after(self.frame_ms, self.poll_snapshots)
+
+    def poll_snapshots(self) -> None:
+        """
+        Shows the newest snapshot posted by the background run. Snapshots that arrived since the last frame
+        are folded into one refresh. Polling continues until the run has stopped and its final snapshot is shown.
+        """
+        latest = None
+        try:
+            while True:
+                latest = self.snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        if latest is not None:
+            # A snapshot taken after an error may not describe the experiment.
+            if "time" in latest:
+                self.update_screen(latest)
+            self.last_snapshot = latest
+
+        # The worker posts its final snapshot just before it stops, so once it has stopped
+        # and the queue is empty, the final snapshot has been shown.
+        if not self.worker.is_alive() and self.snapshots.empty():
+            final = self.last_snapshot or {}
+            self.stop_worker(final.get("finished", False), final.get("error"))
+            return
+        self.after(self.frame_ms, self.poll_snapshots)
+
+    def stop_worker(self, finished: bool, error: Optional[str] = None) -> None:
+        """
+        Cleans up after a background run has stopped, and reports the error that stopped it, if any.
+
+        :param finished: True if the run reached the end of the experiment.
+        :param error: A description of the error that stopped the run, if any.
+        """
+        self.worker = None
+        self.set_running(False)
+        if error is not None:
+            messagebox.showerror("Experiment Error", f"The experiment stopped with an error.\n\n{error}")
+        if finished:
+            # Show the final state as Goto End always has; the next step ends the experiment.
+            self.finished = True
+            self.controller.end_clock()
+            self.update_screen()
+
+    def toggle_pause(self) -> None:
+        """
+        Pauses or resumes the background run.
+        """
+        if self.worker is None:
+            return
+        if self.worker.is_paused():
+            self.worker.resume()
+            self.btn_pause.config(text="Pause")
+        else:
+            self.worker.pause()
+            self.btn_pause.config(text="Resume")
+
+    def cancel_run(self) -> None:
+        """
+        Cancels the background run after its current step; the experiment can then be continued step by step.
+        """
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def set_running(self, running: bool, pausable: bool = True) -> None:
+        """
+        Enables the controls that apply while a background run is (or is not) in progress.
+
+        :param running: True while a background run is in progress.
+        :param pausable: False if the run cannot be paused or cancelled (Goto End).
+        """
+        idle_state, running_state = ("disabled", "normal") if running else ("normal", "disabled")
+        if not pausable:
+            running_state = "disabled"
+        self.btn_step.config(state=idle_state)
+        self.btn_goto_end.config(state=idle_state)
+        self.btn_auto_run.config(state=idle_state)
+        self.btn_pause.config(state=running_state, text="Pause")
+        self.btn_cancel.config(state=running_state)
 
     def terminate(self) -> None:
         """
         Terminates the observation window and its parent window, effectively ending the experiment.
         A message box is displayed before closing.
         """
+        if self.worker is not None:
+            # Stop the background run before the windows go away.
+            self.worker.cancel()
+            self.worker.join(timeout=1.0)
         messagebox.showinfo("Termination", "The Experiment has been terminated.")
         self.destroy()
         self.parent.destroy()
@@ -159,7 +292,9 @@ class ObservationWindow(tk.Toplevel, GUI):
         """
         Clears all text fields in the GUI to remove old data before updating them with new simulation results.
         """
-        self.flow_info.delete(1.0, tk.END)
+        self.shown_text.clear()
+        self.flow_info.clear()
+        self.mode_change_text_box("normal")
         self.time_today.delete(1.0, tk.END)
         self.time_now.delete(1.0, tk.END)
         self.avg_occupancy.delete(1.0, tk.END)
@@ -173,6 +308,7 @@ class ObservationWindow(tk.Toplevel, GUI):
         self.total_request.delete(1.0, tk.END)
         self.success_count.delete(1.0, tk.END)
         self.fail_count.delete(1.0, tk.END)
+        self.mode_change_text_box("disabled")
 
     def end_experiment(self) -> None:
         """
@@ -191,7 +327,6 @@ class ObservationWindow(tk.Toplevel, GUI):
         
         :param mode: The state to set for all text widgets.
         """
-        self.flow_info.config(state=mode)
         self.time_today.config(state=mode)
         self.time_now.config(state=mode)
         self.avg_occupancy.config(state=mode)
@@ -206,60 +341,82 @@ class ObservationWindow(tk.Toplevel, GUI):
         self.success_count.config(state=mode)
         self.fail_count.config(state=mode)
 
-    def update_screen(self) -> None:
+    def set_field(self, widget: tk.Text, value: Any) -> None:
         """
-        Updates the entire observation window with the latest simulation data:
-          - Reservation flow information.
+        Shows a value in a single-value text field, touching the widget only if the shown text changes.
+
+        :param widget: The read-only text widget.
+        :param value: The value to show.
+        """
+        text = str(value)
+        if self.shown_text.get(widget) == text:
+            return
+        widget.config(state="normal")
+        widget.delete(1.0, tk.END)
+        widget.insert(tk.END, text)
+        widget.config(state="disabled")
+        self.shown_text[widget] = text
+
+    def update_screen(self, snapshot: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Updates the observation window with the latest simulation data:
+          - Reservation flow information (the visible rows of the request flow log).
           - Current simulation time.
           - Statistics (average occupancy, profit, success rate, and request counts).
           - Occupancy details per room type.
+          - Progress of the experiment.
+        Only fields whose text changes are redrawn, and the request flow view renders only its visible rows,
+        so the cost of a refresh depends neither on the length of the run nor on the number of requests per step.
+
+        :param snapshot: A snapshot posted by a background run (see ExperimentController.snapshot);
+                         if None, the data is read from the controller.
         """
-        # Enable text widgets for editing.
-        self.mode_change_text_box("normal")
-        # Clear previous data.
-        self.delete()
+        if snapshot is None:
+            snapshot = self.controller.snapshot()
+
+        # Retrieve current simulation time and statistics from the snapshot.
+        day, hour = snapshot["time"]
+        statistics = snapshot["statistics"]
+
+        # Show the newest rows of the request flow log (or keep the scrolled-to rows).
+        self.flow_info.refresh()
 
-        # Retrieve current simulation time and statistics from the controller.
-        day, hour = self.controller.get_time_info()
-        statistics = self.controller.display_statistics()
-        
-        # Update the reservation flow information.
-        self.flow_info.insert(tk.END, self.controller.display_reservation_info())
-        
         # Update time-related fields.
-        self.time_today.insert(tk.END, day)
-        self.time_now.insert(tk.END, hour)
+        self.set_field(self.time_today, day)
+        self.set_field(self.time_now, hour)
 
         # Update statistics fields.
-        self.avg_occupancy.insert(tk.END, statistics["avg_occupancy"])
-        self.profit.insert(tk.END, statistics["profit"])
-        self.success_rate.insert(tk.END, statistics["success_rate"])
-        self.total_request.insert(tk.END, statistics["total_request"])
-        self.success_count.insert(tk.END, statistics["success_count"])
-        self.fail_count.insert(tk.END, statistics["fail_count"])
-
-        # Update room occupancy information using data from the controller.
-        room_occupancy = self.controller.display_today_occupancy()
-        self.occupancy_single.insert(tk.END, room_occupancy[RoomType.SINGLE])
-        self.occupancy_double.insert(tk.END, room_occupancy[RoomType.SIMPLE_DOUBLE])
-        self.occupancy_double_sofa.insert(tk.END, room_occupancy[RoomType.DOUBLE_WITH_SOFA])
-        self.occupancy_half_lux.insert(tk.END, room_occupancy[RoomType.HALF_LUX])
-        self.occupancy_lux.insert(tk.END, room_occupancy[RoomType.LUX])
-
-        # Disable text widgets to prevent user editing.
-        self.mode_change_text_box("disabled")
+        self.set_field(self.avg_occupancy, statistics["avg_occupancy"])
+        self.set_field(self.profit, statistics["profit"])
+        self.set_field(self.success_rate, statistics["success_rate"])
+        self.set_field(self.total_request, statistics["total_request"])
+        self.set_field(self.success_count, statistics["success_count"])
+        self.set_field(self.fail_count, statistics["fail_count"])
+
+        # Update room occupancy information using data from the snapshot.
+        room_occupancy = snapshot["today_occupancy"]
+        self.set_field(self.occupancy_single, room_occupancy[RoomType.SINGLE])
+        self.set_field(self.occupancy_double, room_occupancy[RoomType.SIMPLE_DOUBLE])
+        self.set_field(self.occupancy_double_sofa, room_occupancy[RoomType.DOUBLE_WITH_SOFA])
+        self.set_field(self.occupancy_half_lux, room_occupancy[RoomType.HALF_LUX])
+        self.set_field(self.occupancy_lux, room_occupancy[RoomType.LUX])
+
+        # Update the progress bar.
+        if self.progress["value"] != snapshot["progress"]:
+            self.progress["value"] = snapshot["progress"]
 
     def next_stage(self) -> None:
         """
         Executes the next step in the simulation:
-          - Clears the current display.
           - Runs one simulation step via the controller.
           - If the experiment has ended, displays final statistics and terminates.
           - Otherwise, updates the GUI with new simulation data.
         """
-        # Clear previous data from the screen.
-        self.delete()
-        
+        # After the experiment has run to its end in the background, the next step ends it.
+        if self.finished:
+            self.end_experiment()
+            return
+
         # Run one simulation step; if step() returns False, the simulation has ended.
         is_running = self.controller.step()
 
@@ -0,0 +1,102 @@
+import tkinter as tk
+
+from Controller.RequestFlowLog import RequestFlowLog
+from typing import *
+
+class VirtualLogView(tk.Frame):
+    """
+    A read-only, scrollable view of a RequestFlowLog that only renders the rows currently visible.
+    The text widget never holds more than 'height' lines: scrolling asks the log for the rows at the new
+    position, and the scrollbar is positioned by hand from the row numbers. The cost of a refresh therefore
+    does not depend on how many rows the log holds. While the view is scrolled to the bottom, it follows
+    new rows as they are appended.
+    """
+
+    def __init__(self, parent, log: RequestFlowLog, height: int = 10, width: int = 100) -> None:
+        """
+        Creates the view.
+
+        :param parent: The parent widget.
+        :param log: The RequestFlowLog to show.
+        :param height: The number of visible rows.
+        :param width: The width of the view, in characters.
+        """
+        super().__init__(parent)
+        self.log = log
+        self.height = height
+
+        self.text = tk.Text(self, height=height, width=width, wrap=tk.NONE, state="disabled")
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Mouse wheel scrolling (Windows/macOS deliver <MouseWheel>, X11 delivers buttons 4 and 5).
+        self.text.bind("<MouseWheel>", lambda event: self.scroll_rows(-3 if event.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+        # Row number of the first visible row.
+        self.top_row = 0
+        # True while the view shows the last rows of the log and should follow new ones.
+        self.follow_tail = True
+        # The lines currently rendered, so that an unchanged view is not redrawn.
+        self.shown_lines: List[str] = []
+
+    def refresh(self) -> None:
+        """
+        Renders the rows at the current position (the last rows while following the tail)
+        and updates the scrollbar. The text widget is only touched if the visible rows changed.
+        """
+        first, end = self.log.first_row, self.log.end_row
+        if self.follow_tail:
+            self.top_row = end - self.height
+        self.top_row = max(first, min(self.top_row, end - self.height))
+
+        lines = self.log.get_lines(self.top_row, self.height)
+        if lines != self.shown_lines:
+            self.text.config(state="normal")
+            self.text.delete(1.0, tk.END)
+            self.text.insert(tk.END, "\n".join(lines))
+            self.text.config(state="disabled")
+            self.shown_lines = lines
+
+        total = max(end - first, 1)
+        self.scrollbar.set((self.top_row - first) / total, min(1.0, (self.top_row - first + self.height) / total))
+
+    def scroll_rows(self, rows: int) -> None:
+        """
+        Scrolls the view by a number of rows.
+
+        :param rows: The number of rows to scroll; negative values scroll up.
+        """
+        self.scroll_to(self.top_row + rows)
+
+    def scroll_to(self, row: int) -> None:
+        """
+        Shows the rows starting at a row number; scrolling to the bottom resumes following new rows.
+
+        :param row: The row number of the new first visible row.
+        """
+        first, end = self.log.first_row, self.log.end_row
+        self.top_row = max(first, min(row, end - self.height))
+        self.follow_tail = self.top_row >= end - self.height
+        self.refresh()
+
+    def on_scroll(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        """
+        Handles the scrollbar commands ("moveto", fraction) and ("scroll", count, "units" | "pages").
+        """
+        if action == "moveto":
+            first, end = self.log.first_row, self.log.end_row
+            self.scroll_to(first + int(float(amount) * (end - first)))
+        elif action == "scroll":
+            self.scroll_rows(int(amount) * (self.height if unit == "pages" else 1))
+
+    def clear(self) -> None:
+        """
+        Clears the rendered rows; the next refresh renders them again from the log.
+        """
+        self.text.config(state="normal")
+        self.text.delete(1.0, tk.END)
+        self.text.config(state="disabled")
+        self.shown_lines = []
@@ -1,5 +1,12 @@
-from View import InitWindow
+import sys
 
 if __name__ == "__main__":
+    # "python main.py --headless [options]" runs the experiment without tkinter (see Controller/HeadlessRunner.py).
+    if "--headless" in sys.argv[1:]:
+        from Controller.HeadlessRunner import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
+    from View import InitWindow
+
     app = InitWindow()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,19 @@
+import pytest
+
+from Benchmark.BookingStressTest import BookingStressTest, BACKENDS
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("seed", [0, 1])
+def test_concurrent_bookings_never_overlap(backend: str, seed: int) -> None:
+    """
+    A bounded run of the booking stress test: 8 threads book through Hotel.reserve_concurrent,
+    and no room may be booked twice for the same day, nor may any other invariant be violated.
+    """
+    test = BookingStressTest(BACKENDS[backend], rooms_per_type=10, days=20, threads=8,
+                             requests_per_thread=300, seed=seed)
+    test.run()
+
+    assert test.find_double_bookings() == []
+    assert test.check() == []
+    assert test.hotel.statistics.succesed_requests == test.count_booked() > 0
@@ -0,0 +1,107 @@
+import pytest
+
+from Controller.ExperimentController import ExperimentController
+from Controller.EventSimulator import EventSimulator
+from Model.RoomType import RoomType
+from Model.Hotel import Hotel
+from Model.MatrixHotel import MatrixHotel
+
+from typing import *
+
+# Hotel storage backends whose results must agree.
+BACKENDS: List[Type[Hotel]] = [Hotel, MatrixHotel]
+
+# (days, hours per step, (min_requests, max_requests)) of the compared experiments;
+# the second one has steps without requests.
+EXPERIMENTS: List[Tuple[int, int, Tuple[int, int]]] = [(20, 3, (3, 5)), (25, 2, (0, 2))]
+
+
+def new_controller(experiment: Tuple[int, int, Tuple[int, int]], hotel_class: Type[Hotel], seed: int) -> ExperimentController:
+    """
+    Creates an initialized experiment with four rooms of each room type.
+    """
+    days, steps, request_num = experiment
+    controller = ExperimentController()
+    controller.initialize_experiment(days, steps, {room_type: 4 for room_type in list(RoomType)[:5]}, request_num,
+                                     hotel_class=hotel_class, seed=seed)
+    return controller
+
+
+def run_steps(controller: ExperimentController, steps: Optional[int] = None) -> None:
+    """
+    Calls 'step' the given number of times, or until the experiment has ended.
+    """
+    while (steps is None or steps > 0) and controller.step():
+        steps = None if steps is None else steps - 1
+
+
+def results(controller: ExperimentController) -> Tuple[Dict[str, float], Dict[str, Any], List[List[bool]]]:
+    """
+    Returns what the compared runs must agree on: the statistics, the estimators and the occupancy of every room.
+    """
+    hotel = controller.hotel
+    occupancy = [[room.is_occupied(day) for day in range(hotel.days)] for room in hotel.rooms]
+    return controller.display_statistics(), hotel.statistics.display_estimators(), occupancy
+
+
+@pytest.mark.parametrize("experiment", EXPERIMENTS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_backends_agree(experiment: Tuple[int, int, Tuple[int, int]], seed: int) -> None:
+    """
+    Hotel and MatrixHotel book the same rooms for the same requests.
+    """
+    room_hotel = new_controller(experiment, Hotel, seed)
+    matrix_hotel = new_controller(experiment, MatrixHotel, seed)
+    run_steps(room_hotel)
+    run_steps(matrix_hotel)
+
+    assert results(room_hotel) == results(matrix_hotel)
+    assert room_hotel.hotel.statistics.total_requests > 0
+
+
+@pytest.mark.parametrize("hotel_class", BACKENDS)
+@pytest.mark.parametrize("experiment", EXPERIMENTS)
+@pytest.mark.parametrize("seed", [0, 1])
+def test_goto_end_and_event_engine_match_stepping(hotel_class: Type[Hotel], experiment: Tuple[int, int, Tuple[int, int]],
+                                                  seed: int) -> None:
+    """
+    Fast-forwarding with goto_end and running the discrete-event engine, from the start and from the middle
+    of an experiment, give the same results as calling 'step' until the end.
+    """
+    stepped = new_controller(experiment, hotel_class, seed)
+    run_steps(stepped)
+
+    for warm_up_steps in (0, 37):
+        fast_forwarded = new_controller(experiment, hotel_class, seed)
+        run_steps(fast_forwarded, warm_up_steps)
+        fast_forwarded.goto_end()
+
+        events = new_controller(experiment, hotel_class, seed)
+        run_steps(events, warm_up_steps)
+        EventSimulator(events).run()
+
+        assert results(fast_forwarded) == results(stepped)
+        assert results(events) == results(stepped)
+        assert fast_forwarded.step_count == events.step_count == stepped.step_count
+
+
+@pytest.mark.parametrize("hotel_class", BACKENDS)
+@pytest.mark.parametrize("experiment", EXPERIMENTS)
+def test_checkpoint_resume_matches_uninterrupted_run(hotel_class: Type[Hotel], experiment: Tuple[int, int, Tuple[int, int]],
+                                                     tmp_path: Any) -> None:
+    """
+    An experiment saved to a checkpoint and resumed in a new controller ends exactly like one run without interruption.
+    """
+    uninterrupted = new_controller(experiment, hotel_class, seed=3)
+    run_steps(uninterrupted)
+
+    interrupted = new_controller(experiment, hotel_class, seed=3)
+    run_steps(interrupted, 50)
+    path = str(tmp_path / "run.chk")
+    interrupted.save_checkpoint(path)
+    resumed = ExperimentController()
+    resumed.load_checkpoint(path)
+    run_steps(resumed)
+
+    assert results(resumed) == results(uninterrupted)
+    assert type(resumed.hotel) is hotel_class